@@ -0,0 +1,182 @@
+"""
+AgentHostNode
+  - Runs many NotIt agents inside one process, sharing a single LCM connection and receive thread.
+  - Reports every hosted agent ready in one batch, resent with backoff until the game begins.
+  - Moves all unfrozen agents at once each tick with a vectorized random step, published as one moved_batch_t.
+  - Decodes each FREEZE / STOP_GAME once for the whole host rather than once per agent process.
+  - Checks all its agents against each sync digest at once and reports only the ones the game node has wrong.
+"""
+import time
+from logging import getLogger
+
+import numpy as np
+
+from batch_simulator import random_steps
+from channels import Channels
+from clock import WallClock
+from backoff import Backoff
+from messages import begin_t, freeze_t, report_ready_batch_t, report_status_t, tick_ack_t, tick_t
+from move_batcher import MoveBatcher
+from node import Node
+from syncdigest import digest_frozen, read_digest
+from notitnode import GAME_START_POLL_FREQUENCY, READY_RETRY_DELAY, READY_RETRY_MAX, decode_begin
+
+
+logger = getLogger()
+
+
+class AgentHostNode(Node):
+    def __init__(
+            self,
+            agents: list[tuple[int, tuple[int, int]]],
+            board_shape: tuple[int, int],
+            move_frequency: float,
+            move_batch_window: float = 0.0,
+            seed: int | None = None,
+            clock=None,
+    ):
+        """`agents` is a list of (node_id, start_position) for every hider this host runs.
+        `clock` is a WallClock (the default) or a VirtualClock for lockstep games; see clock.py."""
+        super().__init__()
+        assert len(agents) > 0
+        self.node_ids = np.array([node_id for node_id, _ in agents], dtype=np.int32)
+        self.positions = np.array([position for _, position in agents], dtype=np.int32)
+        self.frozen = np.zeros(len(agents), dtype=bool)
+        self.id_to_index = {node_id: idx for idx, (node_id, _) in enumerate(agents)}
+        self.board_shape = board_shape
+        self.bounds = np.array(board_shape, dtype=np.int32)
+        self.move_frequency = move_frequency
+        self.move_batch_window = move_batch_window
+        self.seed = seed
+        self.clock = clock or WallClock()
+        self.moves_sent = 0
+        self.game_started = False
+        self.game_over = False
+        self.next_tick = None  # Absolute time of the next tick, once the game is on.
+        self.ready_backoff = Backoff(READY_RETRY_DELAY, READY_RETRY_MAX)
+
+    def on_start(self):
+        # Numpy generators and batchers don't survive a fork cleanly, so build them in the child.
+        # Seeded per host, so each worker walks its own agents differently but the same way on every run.
+        self.rng = np.random.default_rng(None if self.seed is None else [self.seed, int(self.node_ids[0])])
+        self.move_batcher = MoveBatcher(self.publish, self.move_batch_window)
+        self.subscribe(Channels.BEGIN_GAME, self.handle_begin)
+        self.subscribe(Channels.FREEZE, self.handle_freeze)
+        self.subscribe(Channels.STOP_GAME, self.handle_gameover)
+        self.subscribe(Channels.SYNC_DIGEST, self.handle_digest)
+        if self.clock.virtual:
+            self.clock.on_tick_done = self.send_tick_ack
+            self.subscribe(Channels.TICK, self.handle_tick)
+
+        self.send_ready()
+        self.ready_backoff.start(time.monotonic())
+        logger.info(f"Host online with {len(self.node_ids)} agents: {self.node_ids.min()}..{self.node_ids.max()}")
+
+    def send_ready(self):
+        """One report for every agent we host, instead of a burst of one per agent."""
+        msg = report_ready_batch_t()
+        msg.schema_version = report_ready_batch_t.SCHEMA_VERSION
+        msg.ids = self.node_ids.tolist()
+        msg.positions = self.positions.tolist()
+        msg.count = len(msg.ids)
+        self.publish(Channels.REPORT_READY_BATCH, msg)
+
+    def run(self):
+        delay = GAME_START_POLL_FREQUENCY
+        while delay is not None:
+            self.clock.sleep(delay)
+            delay = self.step()
+
+    def step(self) -> float | None:
+        if self.game_over:
+            return None
+        if self.next_tick is None:
+            if not self.game_started:
+                # Resent until the game starts, as NotItNode does.
+                if self.ready_backoff.due(time.monotonic()):
+                    self.send_ready()
+                return GAME_START_POLL_FREQUENCY
+            self.next_tick = self.clock.now() + self.move_frequency
+        else:
+            # Tick on an absolute schedule so the time spent moving hundreds of agents doesn't add up as drift.
+            self.next_tick += self.move_frequency
+            self.tick()
+            if self.game_over:
+                return None
+        return max(0.0, self.next_tick - self.clock.now())
+
+    def tick(self):
+        """Move every unfrozen agent one random step and publish the moves as a batch."""
+        movers = np.flatnonzero(~self.frozen)
+        if len(movers) == 0:
+            return
+        stepped = random_steps(self.positions[movers], self.bounds, self.rng)
+        self.positions[movers] = stepped
+        self.moves_sent += len(movers)
+        for node_id, position in zip(self.node_ids[movers].tolist(), stepped.tolist()):
+            self.move_batcher.add(node_id, tuple(position))
+        self.move_batcher.maybe_flush(lookahead=self.move_frequency)
+
+    def on_stop(self):
+        self.move_batcher.flush()
+
+    def handle_begin(self, channel, data):
+        if decode_begin(data) is None:
+            logger.error(f"Host got a start message from a game node on a different message schema. "
+                         f"Expected version {begin_t.SCHEMA_VERSION}. Shutting down.")
+            self.game_over = True
+        self.game_started = True
+
+    def handle_gameover(self, channel, data):
+        self.game_over = True
+        self.clock.stop()
+
+    def handle_tick(self, channel, data):
+        msg = tick_t.decode(data)
+        if msg.phase == self.clock.phase:
+            self.game_started = True
+            self.clock.handle_tick(msg.tick, msg.moves_total)
+
+    def send_tick_ack(self, tick: int):
+        """One acknowledgement covers every agent on this host."""
+        self.move_batcher.flush()
+        msg = tick_ack_t()
+        msg.tick = tick
+        msg.phase = self.clock.phase
+        msg.moves_sent = self.moves_sent
+        msg.ids = self.node_ids.tolist()
+        msg.count = len(msg.ids)
+        self.publish(Channels.TICK_ACK, msg)
+
+    def handle_freeze(self, channel, data):
+        received_time_ns = time.monotonic_ns()
+        msg = freeze_t.decode(data)
+        idx = self.id_to_index.get(msg.id)
+        if idx is not None:
+            self.acknowledge(channel, msg.seq, [msg.id])
+            if not self.received.first_time(channel, msg.seq, msg.id):
+                return
+            self.frozen[idx] = True
+            self.send_status(idx, echo=msg, received_time_ns=received_time_ns)
+
+    def handle_digest(self, channel, data):
+        """Check every agent we host against the digest at once, and report only those the game node has wrong."""
+        msg = read_digest(data)
+        if msg is None:
+            return
+        self.game_started = True
+        for idx in np.flatnonzero(digest_frozen(msg, self.node_ids) != self.frozen).tolist():
+            self.send_status(idx)
+
+    def send_status(self, idx: int, echo: freeze_t | None = None, received_time_ns: int = 0):
+        """Report one agent's state, echoing a freeze's timestamps if given, as NotItNode.send_status does."""
+        msg = report_status_t()
+        msg.id = int(self.node_ids[idx])
+        msg.position = self.positions[idx].tolist()
+        msg.frozen = bool(self.frozen[idx])
+        msg.game_started = self.game_started
+        if echo is not None:
+            msg.echo_send_time_ns = echo.send_time_ns
+            msg.echo_cause_time_ns = echo.cause_time_ns
+            msg.received_time_ns = received_time_ns
+        self.publish(Channels.REPORT_STATUS, msg)
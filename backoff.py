@@ -0,0 +1,37 @@
+"""
+Exponential backoff with jitter for messages that are resent until something answers them.
+
+Each resend doubles the wait, up to a cap. The jitter spreads out a thousand nodes that started together, so their
+retries don't arrive as one burst and overflow the receiver's socket buffer all over again.
+"""
+
+import random
+
+
+class Backoff:
+    def __init__(self, initial: float, maximum: float, jitter: float = 0.5):
+        """Waits start at `initial` seconds and double up to `maximum`. Each is stretched by up to `jitter` of itself."""
+        assert 0 < initial <= maximum
+        self.initial = initial
+        self.maximum = maximum
+        self.jitter = jitter
+        self.delay = initial
+        self.next_time = None
+        # Its own generator, so retries never disturb a seeded game's moves.
+        self.rng = random.Random()
+
+    def start(self, now: float):
+        """Something was just sent. Schedule the first resend."""
+        self.delay = self.initial
+        self.next_time = now + self._jittered(self.delay)
+
+    def due(self, now: float) -> bool:
+        """True once it's time to resend. Schedules the next resend, further out."""
+        if self.next_time is None or now < self.next_time:
+            return False
+        self.delay = min(self.delay * 2, self.maximum)
+        self.next_time = now + self._jittered(self.delay)
+        return True
+
+    def _jittered(self, delay: float) -> float:
+        return delay * (1.0 + self.jitter * self.rng.random())
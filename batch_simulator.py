@@ -0,0 +1,182 @@
+"""
+Vectorized batch simulator for Monte-Carlo runs.
+Plays B games with up to P hiders each at once. All state lives in NumPy arrays and every tick is a handful of
+array operations instead of Python loops over nodes.
+
+Follows the same rules and tick layout as the headless engine in `simulation.py`:
+ - Hiders take a uniformly random in-bound step every `hider_period` ticks (NotItNode.choose_move).
+ - The 'it' steps toward the Manhattan-nearest untagged hider along a randomly chosen axis (ItNode.choose_move with
+   the "greedy" pursuit).
+ - A hider in the same cell as the 'it' is frozen (GameNode.process_freezing).
+
+Games can have different board sizes and hider counts. Pad unused hider slots and mark them off in `hider_mask`.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from simulation import DEFAULT_HIDER_PERIOD, DEFAULT_MAX_TICKS
+
+
+# Same order as NotItNode.choose_move.
+STEPS = np.array([(-1, 0), (0, -1), (1, 0), (0, 1)], dtype=np.int32)
+
+
+@dataclass
+class BatchResult:
+    ticks: np.ndarray  # (B,) ticks until each game ended, or max_ticks if it never did.
+    completed: np.ndarray  # (B,) bool.
+
+
+def random_steps(positions: np.ndarray, bounds: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Pick one uniformly random in-bound neighbor for every position.
+    `positions` is (..., 2) and `bounds` broadcasts against it. Positions with no legal move stay put."""
+    candidates = positions[..., np.newaxis, :] + STEPS  # (..., 4, 2)
+    upper = bounds[..., np.newaxis, :]
+    legal = ((candidates >= 0) & (candidates < upper)).all(axis=-1)  # (..., 4)
+    legal_count = legal.sum(axis=-1)
+    # Pick the k-th legal candidate where k is uniform over the number of legal ones.
+    pick = (rng.random(legal_count.shape) * legal_count).astype(np.int32)
+    chosen = (np.cumsum(legal, axis=-1) == (pick + 1)[..., np.newaxis]) & legal
+    step = (chosen[..., np.newaxis] * STEPS).sum(axis=-2)
+    return positions + step
+
+
+def greedy_steps(seekers: np.ndarray, targets: np.ndarray, target_mask: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Step each seeker (B, 2) one cell toward its nearest masked target in (B, P, 2).
+    Seekers with no target stay put. This is the vectorized form of ItNode.choose_move."""
+    distance = np.abs(targets - seekers[:, np.newaxis, :]).sum(axis=-1)
+    distance = np.where(target_mask, distance, np.iinfo(np.int32).max)
+    nearest = targets[np.arange(len(seekers)), distance.argmin(axis=1)]
+    delta = np.sign(nearest - seekers)
+    # Move along x or y with even odds, zeroing the other axis.
+    use_x = rng.random(len(seekers)) > 0.5
+    delta[:, 1] = np.where(use_x, 0, delta[:, 1])
+    delta[:, 0] = np.where(use_x, delta[:, 0], 0)
+    delta[~target_mask.any(axis=1)] = 0
+    return seekers + delta
+
+
+class BatchSimulator:
+    def __init__(
+            self,
+            board_shapes: np.ndarray,
+            hider_positions: np.ndarray,
+            it_positions: np.ndarray,
+            hider_mask: np.ndarray | None = None,
+            hider_period: int = DEFAULT_HIDER_PERIOD,
+            seed: int | None = None,
+    ):
+        """
+        board_shapes: (B, 2) width and height per game, or a single (2,) shape shared by all.
+        hider_positions: (B, P, 2) starting hider positions.
+        it_positions: (B, 2) starting 'it' positions.
+        hider_mask: (B, P) True for hider slots that are in use. Defaults to all of them.
+        """
+        assert hider_period > 0
+        self.hider_positions = np.array(hider_positions, dtype=np.int32)
+        self.it_positions = np.array(it_positions, dtype=np.int32)
+        batch_size, hider_count, _ = self.hider_positions.shape
+        self.bounds = np.broadcast_to(np.asarray(board_shapes, dtype=np.int32), (batch_size, 2))
+        if hider_mask is None:
+            hider_mask = np.ones((batch_size, hider_count), dtype=bool)
+        # Unused slots count as frozen so they never move, never get chased, and never block game over.
+        self.frozen = ~np.asarray(hider_mask, dtype=bool)
+        self.hider_period = hider_period
+        self.rng = np.random.default_rng(seed)
+        self.tick_count = 0
+        self.ticks = np.zeros(batch_size, dtype=np.int64)
+        self.complete = np.zeros(batch_size, dtype=bool)
+        # Finished games get dropped from the working arrays so the long tail doesn't pay for the whole batch.
+        # `game_index` maps working rows back to the caller's game order.
+        self.game_index = np.arange(batch_size)
+        self.final_ticks = np.zeros(batch_size, dtype=np.int64)
+        self.final_complete = np.zeros(batch_size, dtype=bool)
+
+        # A hider may have been placed on top of the 'it'.
+        self._process_freezing()
+        self._check_gameover(ticks_elapsed=0)
+
+    def step(self):
+        """Advance every unfinished game by one tick."""
+        running = ~self.complete
+        if self.tick_count % self.hider_period == 0:
+            movers = running[:, np.newaxis] & ~self.frozen
+            stepped = random_steps(self.hider_positions, self.bounds[:, np.newaxis, :], self.rng)
+            self.hider_positions = np.where(movers[..., np.newaxis], stepped, self.hider_positions)
+            self._process_freezing()
+            self._check_gameover(ticks_elapsed=self.tick_count + 1)
+            running = ~self.complete
+
+        stepped = greedy_steps(self.it_positions, self.hider_positions, ~self.frozen, self.rng)
+        self.it_positions = np.where(running[:, np.newaxis], stepped, self.it_positions)
+        self._process_freezing()
+        self.tick_count += 1
+        self._check_gameover(ticks_elapsed=self.tick_count)
+
+    def run(self, max_ticks: int = DEFAULT_MAX_TICKS) -> BatchResult:
+        while not self.complete.all() and self.tick_count < max_ticks:
+            self.step()
+            if self.complete.sum() * 2 > len(self.complete):
+                self._compact()
+        self._compact()
+        ticks = np.where(self.final_complete, self.final_ticks, self.tick_count)
+        return BatchResult(ticks=ticks, completed=self.final_complete.copy())
+
+    def _compact(self):
+        """Record finished games and drop them from the working arrays."""
+        done = self.game_index[self.complete]
+        self.final_ticks[done] = self.ticks[self.complete]
+        self.final_complete[done] = True
+        keep = ~self.complete
+        self.game_index = self.game_index[keep]
+        self.hider_positions = self.hider_positions[keep]
+        self.it_positions = self.it_positions[keep]
+        self.bounds = self.bounds[keep]
+        self.frozen = self.frozen[keep]
+        self.ticks = self.ticks[keep]
+        self.complete = self.complete[keep]
+
+    def _process_freezing(self):
+        tagged = (self.hider_positions == self.it_positions[:, np.newaxis, :]).all(axis=-1)
+        self.frozen |= tagged & ~self.complete[:, np.newaxis]
+
+    def _check_gameover(self, ticks_elapsed: int):
+        newly_complete = self.frozen.all(axis=1) & ~self.complete
+        self.ticks[newly_complete] = ticks_elapsed
+        self.complete |= newly_complete
+
+
+def simulate_batch(
+        board_shapes: np.ndarray,
+        hider_positions: np.ndarray,
+        it_positions: np.ndarray,
+        hider_mask: np.ndarray | None = None,
+        max_ticks: int = DEFAULT_MAX_TICKS,
+        hider_period: int = DEFAULT_HIDER_PERIOD,
+        seed: int | None = None,
+) -> BatchResult:
+    """Play a batch of games to completion and return ticks and completion flags per game."""
+    simulator = BatchSimulator(
+        board_shapes=board_shapes,
+        hider_positions=hider_positions,
+        it_positions=it_positions,
+        hider_mask=hider_mask,
+        hider_period=hider_period,
+        seed=seed,
+    )
+    return simulator.run(max_ticks=max_ticks)
+
+
+def random_start_positions(
+        batch_size: int,
+        hider_count: int,
+        board_shape: tuple[int, int],
+        rng: np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Uniformly random (hider_positions, it_positions) for a batch of games on one board size."""
+    upper = np.asarray(board_shape, dtype=np.int32)
+    hiders = rng.integers(0, upper, size=(batch_size, hider_count, 2), dtype=np.int32)
+    its = rng.integers(0, upper, size=(batch_size, 2), dtype=np.int32)
+    return hiders, its
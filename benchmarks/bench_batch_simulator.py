@@ -0,0 +1,64 @@
+"""
+Games per second: vectorized BatchSimulator vs the per-object headless engine.
+
+Run with `python -m benchmarks.bench_batch_simulator`
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from batch_simulator import random_start_positions, simulate_batch
+from simulation import simulate
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--width", type=int, default=10)
+parser.add_argument("--height", type=int, default=10)
+parser.add_argument("--num-not-it", type=int, default=4)
+parser.add_argument("--batch-size", type=int, default=10_000)
+parser.add_argument("--object-games", type=int, default=500)
+parser.add_argument("--seed", type=int, default=0)
+
+
+def bench_per_object(board_shape, hiders, its) -> tuple[float, float]:
+    start = time.perf_counter()
+    ticks = list()
+    for game_idx in range(len(its)):
+        result = simulate(
+            board_shape,
+            [tuple(p) for p in hiders[game_idx].tolist()],
+            tuple(its[game_idx].tolist()),
+            seed=game_idx,
+            record_trajectories=False,
+            pursuit="greedy",  # What the batch simulator models.
+        )
+        ticks.append(result.ticks)
+    elapsed = time.perf_counter() - start
+    return len(its) / elapsed, float(np.mean(ticks))
+
+
+def bench_batch(board_shape, hiders, its, seed) -> tuple[float, float]:
+    start = time.perf_counter()
+    result = simulate_batch(board_shape, hiders, its, seed=seed)
+    elapsed = time.perf_counter() - start
+    return len(its) / elapsed, float(result.ticks.mean())
+
+
+def main():
+    args = parser.parse_args()
+    board_shape = (args.width, args.height)
+    rng = np.random.default_rng(args.seed)
+    hiders, its = random_start_positions(args.batch_size, args.num_not_it, board_shape, rng)
+
+    object_rate, object_ticks = bench_per_object(board_shape, hiders[:args.object_games], its[:args.object_games])
+    batch_rate, batch_ticks = bench_batch(board_shape, hiders, its, args.seed)
+    print(f"Board {board_shape}, {args.num_not_it} hiders")
+    print(f"  per-object: {object_rate:10.1f} games/s  mean ticks {object_ticks:.1f}  ({args.object_games} games)")
+    print(f"  batch:      {batch_rate:10.1f} games/s  mean ticks {batch_ticks:.1f}  ({args.batch_size} games)")
+    print(f"  speedup:    {batch_rate / object_rate:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
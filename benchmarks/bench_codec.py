@@ -0,0 +1,77 @@
+"""
+Encode/decode throughput: generated LCM classes vs fast_codec.
+
+Run with `python -m benchmarks.bench_codec`
+"""
+
+import argparse
+import time
+
+from fast_codec import FastCodec, decode_moved_batch, encode_moved_batch
+from messages import freeze_t, moved_batch_t, moved_t, report_status_t
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--iterations", type=int, default=200_000)
+parser.add_argument("--batch-size", type=int, default=1000)
+
+
+def ops_per_second(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def sample_messages():
+    moved = moved_t()
+    moved.id = 1234
+    moved.new_position = (10, 20)
+    status = report_status_t()
+    status.id = 1234
+    status.position = (10, 20)
+    status.game_started = True
+    freeze = freeze_t()
+    freeze.id = 1234
+    return [moved, status, freeze]
+
+
+def main():
+    args = parser.parse_args()
+    print(f"{'type':<16}{'op':<8}{'generated':>14}{'fast':>14}{'speedup':>10}")
+    for msg in sample_messages():
+        msg_type = type(msg)
+        codec = FastCodec(msg_type)
+        data = msg.encode()
+        reusable = msg_type()
+        rows = [
+            ("encode", lambda: msg.encode(), lambda: codec.encode(msg)),
+            ("decode", lambda: msg_type.decode(data), lambda: codec.decode(data)),
+            ("into", lambda: msg_type.decode(data), lambda: codec.decode_into(data, reusable)),
+        ]
+        for op, generated, fast in rows:
+            slow_rate = ops_per_second(generated, args.iterations)
+            fast_rate = ops_per_second(fast, args.iterations)
+            print(f"{msg_type.__name__:<16}{op:<8}{slow_rate:>12,.0f}/s{fast_rate:>12,.0f}/s{fast_rate / slow_rate:>9.1f}x")
+
+    # Batches are dominated by per-entry work, so fewer iterations.
+    ids = list(range(args.batch_size))
+    flat_positions = [v for node_id in ids for v in (node_id % 97, node_id % 89)]
+    batch = moved_batch_t()
+    batch.count = args.batch_size
+    batch.ids = ids
+    batch.new_positions = list(zip(flat_positions[0::2], flat_positions[1::2]))
+    data = batch.encode()
+    iterations = max(1, args.iterations // args.batch_size)
+    name = f"moved_batch_t[{args.batch_size}]"
+    for op, generated, fast in [
+        ("encode", lambda: batch.encode(), lambda: encode_moved_batch(ids, flat_positions)),
+        ("decode", lambda: moved_batch_t.decode(data), lambda: decode_moved_batch(data)),
+    ]:
+        slow_rate = ops_per_second(generated, iterations)
+        fast_rate = ops_per_second(fast, iterations)
+        print(f"{name:<16}{op:<8}{slow_rate:>12,.0f}/s{fast_rate:>12,.0f}/s{fast_rate / slow_rate:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
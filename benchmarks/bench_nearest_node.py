@@ -0,0 +1,70 @@
+"""
+ItNode.find_nearest_node: spatial index vs the original linear scan over every untagged id.
+
+Run with `python -m benchmarks.bench_nearest_node`
+"""
+
+import argparse
+import random
+import time
+
+from itnode import ItNode
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--hiders", type=int, nargs="*", default=[10, 1_000, 100_000])
+parser.add_argument("--width", type=int, default=1000)
+parser.add_argument("--height", type=int, default=1000)
+parser.add_argument("--queries", type=int, default=200)
+parser.add_argument("--seed", type=int, default=0)
+
+
+def linear_scan(node: ItNode) -> tuple[int, int] | None:
+    """The pre-index implementation of ItNode.find_nearest_node, kept here as the baseline."""
+    nearest_distance = node.board_shape[0] + node.board_shape[1] + 1
+    nearest_position = None
+    for node_id in node.untagged_nodes:
+        node_pos = node.movement_monitor.get_node_position(node_id)
+        dist = abs(node_pos[0] - node.current_position[0]) + abs(node_pos[1] - node.current_position[1])
+        if dist < nearest_distance and node.position_in_bound(node_pos):
+            nearest_distance = dist
+            nearest_position = node_pos
+    return nearest_position
+
+
+def bench(hider_count: int, board_shape: tuple[int, int], queries: int, rng: random.Random):
+    it_id = hider_count + 1
+    node = ItNode(node_id=it_id, start_position=(0, 0), board_shape=board_shape, move_frequency=0)
+    for node_id in range(hider_count):
+        node.movement_monitor.set_node_position(node_id, (rng.randrange(board_shape[0]), rng.randrange(board_shape[1])))
+    node.tick()
+
+    query_points = [(rng.randrange(board_shape[0]), rng.randrange(board_shape[1])) for _ in range(queries)]
+    movers = [(rng.randrange(hider_count), (rng.randrange(board_shape[0]), rng.randrange(board_shape[1]))) for _ in range(queries)]
+
+    timings = dict()
+    for name, find in [("linear", lambda: linear_scan(node)), ("index", node.find_nearest_node)]:
+        start = time.perf_counter()
+        for query, (mover, position) in zip(query_points, movers):
+            # One hider moves per query, like a report landing between 'it' steps.
+            node.movement_monitor.set_node_position(mover, position)
+            node.current_position = query
+            find()
+        timings[name] = (time.perf_counter() - start) / queries
+    return timings
+
+
+def main():
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    board_shape = (args.width, args.height)
+    print(f"Board {board_shape}, {args.queries} queries, one hider move per query")
+    for hider_count in args.hiders:
+        timings = bench(hider_count, board_shape, args.queries, rng)
+        linear, index = timings["linear"], timings["index"]
+        print(f"  {hider_count:>7} hiders: linear {linear * 1e6:10.1f} us/query  index {index * 1e6:8.1f} us/query  "
+              f"({linear / index:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Ticks to game over: the "intercept" pursuit against the original "greedy" one, on the headless engine.
+
+Every strategy plays the same seeded games: same start positions, same hider walks. Reports mean and p95 ticks.
+
+Run with `python -m benchmarks.bench_pursuit`
+"""
+
+import argparse
+import random
+import statistics
+
+from pursuit import PURSUIT_STRATEGIES
+from simulation import simulate
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--sizes", type=int, nargs="*", default=[10, 30, 60], help="Board sides to play on.")
+parser.add_argument("--hiders-per-side", type=float, default=1 / 3, help="Hider count as a fraction of the board side.")
+parser.add_argument("--games", type=int, default=100)
+parser.add_argument("--seed", type=int, default=0)
+
+
+def ticks_to_game_over(pursuit: str, size: int, hiders: int, games: int, seed: int) -> list[int]:
+    """Ticks each seeded game took, sorted."""
+    ticks = list()
+    for game_idx in range(games):
+        rng = random.Random(f"{seed}:{size}:{game_idx}")
+        cells = [(rng.randrange(size), rng.randrange(size)) for _ in range(hiders + 1)]
+        result = simulate((size, size), cells[:-1], cells[-1], seed=game_idx, record_trajectories=False, pursuit=pursuit)
+        ticks.append(result.ticks)
+    return sorted(ticks)
+
+
+def p95(sorted_values: list[int]) -> int:
+    return sorted_values[min(len(sorted_values) - 1, int(0.95 * len(sorted_values)))]
+
+
+def main():
+    args = parser.parse_args()
+    for size in args.sizes:
+        hiders = max(1, round(size * args.hiders_per_side))
+        print(f"Board {size}x{size}, {hiders} hiders, {args.games} games")
+        means = dict()
+        for pursuit in PURSUIT_STRATEGIES:
+            ticks = ticks_to_game_over(pursuit, size, hiders, args.games, args.seed)
+            means[pursuit] = statistics.mean(ticks)
+            print(f"  {pursuit:>9}: mean {means[pursuit]:8.1f} ticks  p95 {p95(ticks):6d} ticks")
+        print(f"  intercept takes {means['intercept'] / means['greedy']:.0%} of greedy's ticks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,302 @@
+"""
+Benchmark suite: micro-benchmarks of the hot paths plus full games over LCM, written out as JSON.
+
+Micro-benchmarks time MovementMonitor updates and lookups, message encode/decode, ItNode.find_nearest_node, and the
+TUI frame path. Headless games measure mean and p95 ticks to game over for each pursuit strategy. End-to-end
+scenarios run a seeded `game.py --virtual-clock` in a subprocess, so each run plays the same game, on an LCM URL
+private to this run (its own multicast port, ttl=0 so nothing leaves the host). Each scenario reports wall time,
+moves handled per second, and the game node's latency stats, but a baseline comparison only prints them.
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json  # Flags anything more than 10% worse.
+    python -m benchmarks.suite --quick --only micro
+
+Exits non-zero when a baseline comparison finds a regression.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_pursuit import p95, ticks_to_game_over
+from fast_codec import FastCodec
+from gamenode import GameNode
+from itnode import ItNode
+from messages import freeze_t, moved_t, report_status_t
+from movement_monitor import make_movement_monitor
+from pursuit import PURSUIT_STRATEGIES
+from tui import BoardModel, TuiRenderer
+
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--only", choices=["micro", "e2e"], default=None, help="Run one group of benchmarks.")
+parser.add_argument("--quick", action="store_true", help="Smaller sizes and shorter timings, for a fast sanity run.")
+parser.add_argument("--output", type=str, default=None, help="Write results to this JSON file.")
+parser.add_argument("--baseline", type=str, default=None, help="Compare against results saved with --output.")
+parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown that counts as a regression.")
+parser.add_argument("--seed", type=int, default=0)
+
+E2E_SCENARIOS = [
+    # (name, width, height, hiders, extra game.py arguments)
+    ("small", 10, 10, 4, []),
+    ("medium", 30, 30, 20, []),
+    ("hosted", 40, 40, 60, ["--workers", "2"]),
+]
+E2E_TIMEOUT = 120.0
+LCM_GROUP = "239.255.76.67"
+
+
+def ops_per_second(fn, min_time: float) -> float:
+    """Call `fn` in growing batches until at least `min_time` seconds have passed."""
+    calls = 0
+    batch = 1
+    start = time.perf_counter()
+    while True:
+        for _ in range(batch):
+            fn()
+        calls += batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return calls / elapsed
+        batch *= 2
+
+
+def result(value: float, unit: str, higher_is_better: bool = True, gated: bool = True, **extra) -> dict:
+    """`gated=False` reports a metric without letting it fail a baseline comparison."""
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better, "gated": gated, **extra}
+
+
+def bench_movement_monitor(results: dict, quick: bool, rng: random.Random):
+    min_time = 0.2 if quick else 1.0
+    node_count = 1_000 if quick else 100_000
+    board_shape = (1000, 1000)
+    for backend in ["dict", "grid"]:
+        monitor = make_movement_monitor(backend, board_shape)
+        for node_id in range(node_count):
+            monitor.set_node_position(node_id, (rng.randrange(board_shape[0]), rng.randrange(board_shape[1])), clear_previous=False)
+        moves = [(rng.randrange(node_count), (rng.randrange(board_shape[0]), rng.randrange(board_shape[1]))) for _ in range(4096)]
+        cursor = iter(range(1 << 62))
+
+        def move():
+            node_id, position = moves[next(cursor) & 4095]
+            monitor.set_node_position(node_id, position)
+
+        def lookup():
+            monitor.get_nodes_at_position(moves[next(cursor) & 4095][1])
+
+        results[f"micro.monitor.set_node_position[{backend}]"] = result(ops_per_second(move, min_time), "ops/s")
+        results[f"micro.monitor.get_nodes_at_position[{backend}]"] = result(ops_per_second(lookup, min_time), "ops/s")
+
+
+def bench_codec(results: dict, quick: bool):
+    min_time = 0.2 if quick else 1.0
+    moved = moved_t()
+    moved.id = 1234
+    moved.new_position = (10, 20)
+    moved.seq = 99
+    moved.send_time_ns = time.monotonic_ns()
+    status = report_status_t()
+    status.id = 1234
+    status.position = (10, 20)
+    freeze = freeze_t()
+    freeze.id = 1234
+    for msg in [moved, status, freeze]:
+        msg_type = type(msg)
+        codec = FastCodec(msg_type)
+        data = msg.encode()
+        name = msg_type.__name__
+        results[f"micro.codec.{name}.encode[generated]"] = result(ops_per_second(msg.encode, min_time), "ops/s")
+        results[f"micro.codec.{name}.decode[generated]"] = result(ops_per_second(lambda: msg_type.decode(data), min_time), "ops/s")
+        results[f"micro.codec.{name}.encode[fast]"] = result(ops_per_second(lambda: codec.encode(msg), min_time), "ops/s")
+        results[f"micro.codec.{name}.decode[fast]"] = result(ops_per_second(lambda: codec.decode(data), min_time), "ops/s")
+
+
+def bench_nearest_node(results: dict, quick: bool, rng: random.Random):
+    min_time = 0.2 if quick else 1.0
+    board_shape = (1000, 1000)
+    for hider_count in ([100, 1_000] if quick else [100, 10_000, 100_000]):
+        node = ItNode(node_id=hider_count + 1, start_position=(0, 0), board_shape=board_shape, move_frequency=0)
+        for node_id in range(hider_count):
+            node.movement_monitor.set_node_position(node_id, (rng.randrange(board_shape[0]), rng.randrange(board_shape[1])))
+        queries = [(rng.randrange(board_shape[0]), rng.randrange(board_shape[1])) for _ in range(1024)]
+        cursor = iter(range(1 << 62))
+
+        def find():
+            node.current_position = queries[next(cursor) & 1023]
+            node.find_nearest_node()
+
+        results[f"micro.itnode.find_nearest_node[{hider_count}]"] = result(ops_per_second(find, min_time), "ops/s")
+
+
+def bench_render(results: dict, quick: bool, rng: random.Random):
+    """The two halves of a frame: what the game loop pays in render_tui, and what the render thread pays to paint."""
+    min_time = 0.2 if quick else 1.0
+    board_shape = (80, 40)
+    hider_count = 200
+    moves_per_frame = 50
+    moves = [(rng.randrange(hider_count), (rng.randrange(board_shape[0]), rng.randrange(board_shape[1]))) for _ in range(4096)]
+    cursor = iter(range(1 << 62))
+
+    game = GameNode(board_shape=board_shape, node_count=hider_count, it_id=hider_count, verbose=True)
+    game.board_model = BoardModel(board_shape, it_id=hider_count)
+    game.ui_draw_delay = 0
+    with open(os.devnull, "w") as devnull:
+        game.renderer = TuiRenderer(game.board_model.screen_shape, stream=devnull, ansi=True)
+        # Stand in for the render thread so only the game loop's share is timed.
+        game.render_thread = PaintlessRenderThread()
+
+        def game_loop_frame():
+            for _ in range(moves_per_frame):
+                node_id, position = moves[next(cursor) & 4095]
+                game.board_model.track_move(node_id, position)
+            game.render_tui()
+
+        results["micro.gamenode.render_tui"] = result(ops_per_second(game_loop_frame, min_time), "frames/s", moves_per_frame=moves_per_frame)
+
+        model = BoardModel(board_shape, it_id=hider_count)
+        renderer = TuiRenderer(model.screen_shape, stream=devnull, ansi=True)
+        renderer.paint(model.take_snapshot("", full=True))
+
+        def paint_frame():
+            for _ in range(moves_per_frame):
+                node_id, position = moves[next(cursor) & 4095]
+                model.track_move(node_id, position)
+            renderer.paint(model.take_snapshot("status"))
+
+        results["micro.tui.paint"] = result(ops_per_second(paint_frame, min_time), "frames/s", moves_per_frame=moves_per_frame)
+
+
+def bench_pursuit(results: dict, quick: bool, seed: int):
+    games = 10 if quick else 50
+    for size, hiders in ([(10, 3)] if quick else [(10, 3), (30, 10)]):
+        for pursuit in PURSUIT_STRATEGIES:
+            ticks = ticks_to_game_over(pursuit, size, hiders, games, seed)
+            prefix = f"sim.pursuit.{pursuit}[{size}x{size},{hiders}]"
+            results[f"{prefix}.mean_ticks"] = result(sum(ticks) / len(ticks), "ticks", higher_is_better=False)
+            results[f"{prefix}.p95_ticks"] = result(p95(ticks), "ticks", higher_is_better=False)
+
+
+class PaintlessRenderThread:
+    def submit(self, snapshot):
+        pass
+
+
+def isolated_lcm_url() -> str:
+    """A multicast URL no other run is likely to share, with ttl=0 so packets stay on this host."""
+    port = 20000 + (os.getpid() * 7 + int(time.time())) % 20000
+    return f"udpm://{LCM_GROUP}:{port}?ttl=0"
+
+
+def run_game(width: int, height: int, hiders: int, extra_args: list[str], rng: random.Random, seed: int, lcm_url: str) -> dict:
+    positions = [str(rng.randrange(size)) for _ in range(hiders + 1) for size in (width, height)]
+    with tempfile.TemporaryDirectory() as tmp:
+        latency_path = os.path.join(tmp, "latency.json")
+        command = [
+            sys.executable, "game.py", "--width", str(width), "--height", str(height), "--num-not-it", str(hiders),
+            "--positions", *positions, "--no-ui", "--seed", str(seed), "--virtual-clock", "--latency-json", latency_path,
+            *extra_args,
+        ]
+        env = dict(os.environ, LCM_DEFAULT_URL=lcm_url)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        start = time.perf_counter()
+        try:
+            completed = subprocess.run(command, cwd=root, env=env, capture_output=True, text=True, timeout=E2E_TIMEOUT)
+            finished = "Game Complete" in completed.stdout
+        except subprocess.TimeoutExpired:
+            finished = False
+        wall = time.perf_counter() - start
+        latency = None
+        if os.path.exists(latency_path):
+            with open(latency_path) as fin:
+                latency = json.load(fin)
+    return {"completed": finished, "wall": wall, "latency": latency}
+
+
+def bench_end_to_end(results: dict, quick: bool, rng: random.Random, seed: int):
+    """Seeded games on the virtual clock play the same game every run as fast as the nodes can go, so wall time and
+    moves per second measure throughput rather than how long the game happened to last. Process startup and
+    scheduling still move them by tens of percent between runs, so none of these are gated."""
+    lcm_url = isolated_lcm_url()
+    for name, width, height, hiders, extra_args in (E2E_SCENARIOS[:1] if quick else E2E_SCENARIOS):
+        outcome = run_game(width, height, hiders, extra_args, rng, seed, lcm_url)
+        prefix = f"e2e.{name}[{width}x{height},{hiders}]"
+        results[f"{prefix}.wall"] = result(outcome["wall"], "s", higher_is_better=False, gated=False, completed=outcome["completed"])
+        latency = outcome["latency"]
+        if latency is None:
+            continue
+        results[f"{prefix}.moves_per_second"] = result(latency["move"]["count"] / max(latency["elapsed_s"], 1e-9), "moves/s", gated=False)
+        results[f"{prefix}.moves"] = result(latency["move"]["count"], "moves", gated=False)
+        results[f"{prefix}.move_latency_p95"] = result(latency["move"]["p95_ms"], "ms", higher_is_better=False, gated=False)
+        results[f"{prefix}.tag_latency_mean"] = result(latency["tag"]["mean_ms"], "ms", higher_is_better=False, gated=False)
+        results[f"{prefix}.drops"] = result(latency["drops"], "moves", higher_is_better=False, gated=False)
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print each shared metric against the baseline and return the names of the ones that got worse."""
+    regressions = list()
+    print(f"\n{'benchmark':<60}{'baseline':>14}{'now':>14}{'change':>9}")
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        if before["value"] == 0:
+            change = 0.0 if now["value"] == 0 else float("inf")
+        else:
+            change = now["value"] / before["value"] - 1.0
+        worse = -change if now["higher_is_better"] else change
+        flag = ""
+        if not now.get("gated", True):
+            flag = "  (not gated)"
+        elif worse > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<60}{before['value']:>14,.3f}{now['value']:>14,.3f}{change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    results = dict()
+    if args.only in (None, "micro"):
+        bench_movement_monitor(results, args.quick, rng)
+        bench_codec(results, args.quick)
+        bench_nearest_node(results, args.quick, rng)
+        bench_render(results, args.quick, rng)
+        bench_pursuit(results, args.quick, args.seed)
+    if args.only in (None, "e2e"):
+        bench_end_to_end(results, args.quick, rng, args.seed)
+
+    for name, entry in results.items():
+        print(f"{name:<60}{entry['value']:>16,.3f} {entry['unit']}")
+
+    if args.output is not None:
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "quick": args.quick,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as fout:
+            json.dump(report, fout, indent=1)
+
+    if args.baseline is not None:
+        with open(args.baseline) as fin:
+            baseline = json.load(fin)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}.")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
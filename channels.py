@@ -4,10 +4,19 @@ from enum import StrEnum
 class Channels(StrEnum):
     # Workers -> GameNode
     REPORT_READY = "REPORT_READY"
-    REPORT_MOVE = "REPORT_MOVE"
+    REPORT_READY_BATCH = "REPORT_READY_BATCH"
+    REPORT_MOVE = "REPORT_MOVE"  # With move regions, REPORT_MOVE/<tile>. See regions.py.
+    REPORT_MOVE_EXIT = "REPORT_MOVE_EXIT"  # REPORT_MOVE_EXIT/<tile>: moves out of a tile, with move regions.
+    REPORT_MOVE_BATCH = "REPORT_MOVE_BATCH"
     REPORT_STATUS = "REPORT_STATUS"
+    TICK_ACK = "TICK_ACK"
+    CONTROL_ACK = "CONTROL_ACK"  # Acknowledges freezes. See reliable.py.
 
     # GameNode -> Workers
     BEGIN_GAME = "BEGIN_GAME"
     FREEZE = "FREEZE"
+    TICK = "TICK"
+    SYNC_DIGEST = "SYNC_DIGEST"
+    WORLD_SNAPSHOT = "WORLD_SNAPSHOT"
+    WORLD_DELTA = "WORLD_DELTA"
     STOP_GAME = "STOP_GAME"
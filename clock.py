@@ -0,0 +1,114 @@
+"""
+Clocks that pace a node's main loop.
+
+WallClock is plain time: `sleep` sleeps. VirtualClock is lockstep time driven by the GameNode. Each TICK message
+moves virtual time forward by one tick length (the 'it' move period), and a node's `sleep` returns as soon as enough
+ticks have passed, however little wall time that took. The GameNode sends the next tick once every node has
+acknowledged the current one, so a game runs as fast as messages allow and, with seeded RNGs, plays out the same
+way every time.
+
+Each tick has two phases so that everyone moves on the same information: hiders move in phase 0, then the 'it' moves
+in phase 1. The phase 1 tick carries the number of move reports the GameNode had received. The 'it' holds off until
+it has seen that many itself, so it never chases positions that are still in flight.
+"""
+
+import threading
+import time
+
+from picklestate import RebuiltOnUnpickle
+
+
+HIDER_PHASE = 0
+IT_PHASE = 1
+
+
+class WallClock:
+    virtual = False
+
+    def now(self) -> float:
+        return time.monotonic()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+    def stop(self):
+        pass
+
+
+class VirtualClock(RebuiltOnUnpickle):
+    virtual = True
+    REBUILT_ON_UNPICKLE = {"condition": threading.Condition}
+
+    def __init__(self, tick_length: float, phase: int = HIDER_PHASE):
+        assert tick_length > 0
+        self.tick_length = tick_length
+        self.phase = phase
+        self.tick = 0  # Latest tick received for our phase.
+        self.done_tick = 0  # Latest tick we have acknowledged.
+        self.moves_required = 0
+        # Set by the owning node. on_tick_done(tick) sends the acknowledgement. caught_up(moves) says whether the
+        # node has seen that many move reports.
+        self.on_tick_done = None
+        self.caught_up = None
+        self.stopped = False
+        self.condition = threading.Condition()
+
+    def now(self) -> float:
+        return self.tick * self.tick_length
+
+    def handle_tick(self, tick: int, moves_total: int):
+        """Called from the LCM thread for each TICK in our phase."""
+        with self.condition:
+            resent = tick <= self.done_tick
+            if tick > self.tick:
+                self.tick = tick
+                self.moves_required = moves_total
+            self.condition.notify_all()
+        if resent:
+            # Our acknowledgement was lost.
+            self._acknowledge(tick)
+
+    def poke(self):
+        """Something `caught_up` depends on has changed."""
+        with self.condition:
+            self.condition.notify_all()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def sleep(self, seconds: float):
+        """Acknowledge the tick we just worked through, then wait until `seconds` of virtual time have passed.
+        Every tick in between is acknowledged straight away, since there is nothing due in it."""
+        # Ticks are whole numbers, so allow for float error in the delay.
+        target_tick = self.tick + seconds / self.tick_length - 1e-9
+        with self.condition:
+            finished = self._finish_tick()
+        while True:
+            # Acknowledge outside the lock: on an in-process bus the reply can come straight back into handle_tick.
+            if finished is not None:
+                self._acknowledge(finished)
+            with self.condition:
+                self.condition.wait_for(self._tick_ready)
+                if self.stopped or self.tick >= target_tick:
+                    return
+                finished = self._finish_tick()
+
+    def _tick_ready(self) -> bool:
+        if self.stopped:
+            return True
+        if self.tick <= self.done_tick:
+            return False
+        return self.caught_up is None or self.caught_up(self.moves_required)
+
+    def _finish_tick(self) -> int | None:
+        """Mark the current tick done and return it, or None if it already was."""
+        if self.tick > self.done_tick:
+            self.done_tick = self.tick
+            return self.tick
+        return None
+
+    def _acknowledge(self, tick: int):
+        if self.on_tick_done is not None:
+            self.on_tick_done(tick)
@@ -0,0 +1,116 @@
+"""
+Event-loop runtime for nodes, as an alternative to Node.launch_node.
+
+launch_node gives every node a thread that polls `lc.handle_timeout(10)`, which hands over at most one message per
+call while run() works on the same state from the main thread. EventLoopRuntime hosts any number of nodes on one
+asyncio loop and one LCM instance instead:
+  - The loop watches `lc.fileno()` and drains every pending message each time the socket turns readable.
+  - Each node's main loop runs as a timer: the runtime calls `node.step()` and schedules the next call after the
+    delay it returns. A node can call `wake_soon()` from a handler to have step() run as soon as the current batch of
+    messages has been handled.
+  - Handlers and steps share one thread, so they never run at the same time. `async def` handlers become tasks.
+
+    runtime = EventLoopRuntime()
+    runtime.add_node(game_node)
+    runtime.add_node(it_node)
+    runtime.run()  # Returns once every node's step() has returned None.
+
+Anything with a `publish`/`subscribe`/`handle_timeout` interface works as the bus. Buses without a `fileno`, like
+LocalBus, deliver at publish time and need no reader.
+"""
+
+import asyncio
+from logging import getLogger
+
+import lcm
+
+from node import Node
+
+
+logger = getLogger()
+
+
+class EventLoopRuntime:
+    def __init__(self, lc=None):
+        self.lc = lc
+        self.nodes = list()
+        self.timers = dict()  # Node -> handle of its next scheduled step.
+        self.woken = set()  # Nodes with a step queued by wake().
+        self.loop = None
+        self.done = None
+
+    def add_node(self, node: Node):
+        if not callable(getattr(node, "step", None)):
+            raise TypeError(f"{type(node).__name__} has no step(), so it can only run on its own thread (--runtime thread).")
+        self.nodes.append(node)
+
+    def run(self):
+        """Start every node, then run the loop until all of them are finished."""
+        asyncio.run(self._main())
+
+    def wake(self, node: Node):
+        """Run the node's step at the next turn of the loop instead of waiting out its timer."""
+        if node in self.woken or node not in self.timers:
+            return
+        self.timers[node].cancel()
+        self.woken.add(node)
+        self.timers[node] = self.loop.call_soon(self._step, node)
+
+    async def _main(self):
+        self.loop = asyncio.get_running_loop()
+        self.done = self.loop.create_future()
+        if self.lc is None:
+            self.lc = lcm.LCM()
+        fileno = getattr(self.lc, "fileno", None)
+        if fileno is not None:
+            self.loop.add_reader(fileno(), self._drain)
+
+        for node in self.nodes:
+            node.lc = self.lc
+            node.runtime = self
+            node.loop = self.loop
+            node.running = True
+            node.on_start()
+        for node in self.nodes:
+            self.timers[node] = self.loop.call_soon(self._step, node)
+
+        try:
+            if self.nodes:
+                await self.done
+        finally:
+            if fileno is not None:
+                self.loop.remove_reader(fileno())
+
+    def _drain(self):
+        # handle_timeout(0) returns 0 once nothing is left to read.
+        while self.lc.handle_timeout(0) > 0:
+            pass
+
+    def _step(self, node: Node):
+        self.woken.discard(node)
+        try:
+            delay = node.step()
+        except Exception:
+            logger.exception(f"{type(node).__name__} failed in step(). Stopping it.")
+            delay = None
+        if delay is None:
+            self._finish(node)
+        else:
+            self.timers[node] = self.loop.call_later(delay, self._step, node)
+
+    def _finish(self, node: Node):
+        del self.timers[node]
+        node.running = False
+        for subscription in node.subscriptions:
+            self.lc.unsubscribe(subscription)
+        node.subscriptions = list()
+        node.on_stop()
+        if not self.timers and not self.done.done():
+            self.done.set_result(None)
+
+
+def launch_on_event_loop(node: Node):
+    """Run a single node on its own event loop. A drop-in for `node.launch_node` as a process target."""
+    runtime = EventLoopRuntime()
+    runtime.add_node(node)
+    runtime.run()
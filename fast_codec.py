@@ -0,0 +1,128 @@
+"""
+Optional fast encode/decode for the LCM message types, wire-compatible with the generated classes in `messages/`.
+
+The generated code builds a BytesIO and calls struct.pack once per field, then allocates a new object on every
+decode. Here each fixed-size type gets one precompiled struct.Struct covering fingerprint and fields, so a message
+is a single pack/unpack call. Decoding can return a flat tuple, or fill in an instance you keep around.
+
+    MOVED = FastCodec(moved_t)
+    node_id, x, y = MOVED.decode(data)
+
+Benchmark with `python -m benchmarks.bench_codec`
+"""
+
+import struct
+
+from messages import moved_batch_t, moved_t
+
+
+# LCM primitive -> struct format character. Booleans go over the wire as one signed byte.
+TYPE_FORMATS = {
+    "int8_t": "b",
+    "int16_t": "h",
+    "int32_t": "i",
+    "int64_t": "q",
+    "float": "f",
+    "double": "d",
+    "boolean": "b",
+    "byte": "B",
+}
+
+
+class FastCodec:
+    def __init__(self, msg_type):
+        """Build the layout for a generated LCM type. Only fixed-size types are supported."""
+        self.msg_type = msg_type
+        self.fingerprint = msg_type._get_packed_fingerprint()
+        self.fields = list()  # (name, element count or None for scalars, is_boolean)
+        fmt = ">8s"
+        for name, typename, dims in zip(msg_type.__slots__, msg_type.__typenames__, msg_type.__dimensions__):
+            if typename not in TYPE_FORMATS:
+                raise TypeError(f"{msg_type.__name__}.{name}: nested type {typename} is not supported.")
+            count = None
+            if dims is not None:
+                if len(dims) != 1 or not isinstance(dims[0], int):
+                    raise TypeError(f"{msg_type.__name__}.{name}: only fixed one-dimensional arrays are supported.")
+                count = dims[0]
+            fmt += f"{count or ''}{TYPE_FORMATS[typename]}"
+            self.fields.append((name, count, typename == "boolean"))
+        self.struct = struct.Struct(fmt)
+        self.size = self.struct.size
+        self._flatten, self._assign = self._compile_accessors()
+
+    def encode(self, msg) -> bytes:
+        return self.struct.pack(self.fingerprint, *self._flatten(msg))
+
+    def encode_values(self, *values) -> bytes:
+        """Encode already-flat field values, skipping the message object entirely."""
+        return self.struct.pack(self.fingerprint, *values)
+
+    def pack_into(self, buffer, offset: int, msg) -> int:
+        """Write the message into a writable buffer such as a bytearray or memoryview. Returns the new offset."""
+        self.struct.pack_into(buffer, offset, self.fingerprint, *self._flatten(msg))
+        return offset + self.size
+
+    def decode(self, data, offset: int = 0) -> tuple:
+        """Decode to a flat tuple of field values, with arrays spread out in place."""
+        values = self.struct.unpack_from(data, offset)
+        if values[0] != self.fingerprint:
+            raise ValueError("Decode error")
+        return values[1:]
+
+    def decode_into(self, data, instance=None, offset: int = 0):
+        """Decode into `instance`, reusing it instead of allocating. Builds a fresh one if none is given."""
+        if instance is None:
+            instance = self.msg_type()
+        self._assign(instance, self.decode(data, offset))
+        return instance
+
+    def _compile_accessors(self):
+        """Generate straight-line functions that flatten a message into field values and assign them back.
+        The field names come from the generated class's __slots__, so they are plain identifiers."""
+        flatten_terms = list()
+        assign_lines = list()
+        idx = 0
+        for name, count, is_boolean in self.fields:
+            if count is None:
+                flatten_terms.append(f"msg.{name}")
+                value = f"v[{idx}]"
+                assign_lines.append(f"    msg.{name} = {'bool(' + value + ')' if is_boolean else value}")
+                idx += 1
+            else:
+                flatten_terms.append(f"*msg.{name}[:{count}]")
+                value = f"v[{idx}:{idx + count}]"
+                if is_boolean:
+                    value = f"tuple(bool(b) for b in {value})"
+                assign_lines.append(f"    msg.{name} = {value}")
+                idx += count
+        source = "def flatten(msg):\n    return (" + "".join(term + ", " for term in flatten_terms) + ")\n"
+        source += "def assign(msg, v):\n" + "\n".join(assign_lines or ["    pass"]) + "\n"
+        namespace = dict()
+        exec(source, namespace)
+        return namespace["flatten"], namespace["assign"]
+
+
+MOVED_CODEC = FastCodec(moved_t)  # Shared by everything that reads move reports.
+BATCH_HEADER = struct.Struct(">8si")
+
+
+def encode_moved_batch(node_ids, flat_positions) -> bytes:
+    """Encode a moved_batch_t from a sequence of ids and a flat x0, y0, x1, y1, ... sequence of positions."""
+    count = len(node_ids)
+    assert len(flat_positions) == 2 * count
+    return b"".join([
+        BATCH_HEADER.pack(moved_batch_t._get_packed_fingerprint(), count),
+        struct.pack(f">{count}i", *node_ids),
+        struct.pack(f">{2 * count}i", *flat_positions),
+    ])
+
+
+def decode_moved_batch(data) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Decode a moved_batch_t into (ids, flat positions) with two unpack calls and no per-entry objects."""
+    fingerprint, count = BATCH_HEADER.unpack_from(data, 0)
+    if fingerprint != moved_batch_t._get_packed_fingerprint():
+        raise ValueError("Decode error")
+    offset = BATCH_HEADER.size
+    node_ids = struct.unpack_from(f">{count}i", data, offset)
+    flat_positions = struct.unpack_from(f">{2 * count}i", data, offset + 4 * count)
+    return node_ids, flat_positions
@@ -1,17 +1,44 @@
 # game.py
+import math
 import multiprocessing
 import sys
+import time
 from logging import getLogger, DEBUG
 
 import argparse
 
-from gamenode import GameNode
+from agenthost import AgentHostNode
+from clock import HIDER_PHASE, IT_PHASE, VirtualClock
+from eventloop import launch_on_event_loop
+from gamenode import LATENCY_REPORT_PERIOD, UI_REDRAW_DELAY, GameNode
 from itnode import ItNode
+from movement_monitor import MOVEMENT_BACKENDS
+from pursuit import PURSUIT_STRATEGIES
+from node import Node
+from recorder import RecorderNode
+from regions import MoveRegions
+from shardnode import GameShardNode, ShardCoordinatorNode, ShardLayout
 from notitnode import NotItNode
+from simulation import simulate
 
 
 NOT_IT_MOVE_SPEED = 1.0
 IT_MOVE_SPEED = 0.5
+MAX_WIRE_INT = 2**31 - 1
+RUNTIMES = {
+    "thread": Node.launch_node,  # A polling LCM thread per node next to its main loop.
+    "loop": launch_on_event_loop,  # One event loop per process that drains the LCM socket and runs steps as timers.
+}
+# How a process starts its children. "fork" is the Linux default and the quickest; "forkserver" and "spawn" start
+# from a clean interpreter, which is what other platforms do, and pickle each node over.
+START_METHODS = ["fork", "forkserver", "spawn"]
+# Imported once by the fork server, so each node it forks starts with them already loaded.
+PRELOAD_MODULES = ["lcm", "numpy", "messages", "agenthost", "eventloop", "gamenode", "itnode", "notitnode", "recorder", "shardnode"]
+# Past this many hider processes, launcher processes start them in groups of this size, side by side.
+LAUNCH_GROUP_SIZE = 64
+LISTEN_TIMEOUT = 30.0  # Seconds a recorder or shard gets to start listening before we give up on the game.
+LISTEN_POLL = 0.1  # How often to check it's still alive meanwhile.
+HELPER_EXIT_TIMEOUT = 5.0  # Seconds helpers get to stop on their own once the game node is done.
 logger = getLogger()
 
 
@@ -21,6 +48,28 @@ parser.add_argument("--height", type=int, required=True)
 parser.add_argument("--num-not-it", type=int, required=True)
 parser.add_argument("--positions", type=int, nargs="*", required=False)  # Argparse does not allow something to be both named and positional
 parser.add_argument("posits", type=int, nargs="?", default=None)
+parser.add_argument("--num-it", type=int, default=1, help="Number of seekers. The last this many positions are theirs.")
+parser.add_argument("--headless", action="store_true", help="Run the whole game in-process without LCM and print the result.")
+parser.add_argument("--seed", type=int, default=None, help="Random seed for the hiders' and the 'it''s random choices. Seeded --headless and --virtual-clock games replay exactly.")
+parser.add_argument("--move-batch-window", type=float, default=None, help="Seconds agent hosts may hold moves to send them as one batch. Needs --workers or --agents-per-process.")
+hosting = parser.add_mutually_exclusive_group()
+hosting.add_argument("--workers", type=int, default=None, help="Run the hiders in this many host processes instead of one process each.")
+hosting.add_argument("--agents-per-process", type=int, default=None, help="Run the hiders in host processes of at most this many agents each.")
+parser.add_argument("--movement-backend", choices=MOVEMENT_BACKENDS, default="dict", help="Position tracking used by the game and 'it' nodes.")
+parser.add_argument("--pursuit", choices=PURSUIT_STRATEGIES, default="intercept", help="How the 'it' chases. See pursuit.py.")
+parser.add_argument("--shards", type=int, default=None, help="Split the board into this many tiles, each judged by its own game process.")
+parser.add_argument("--move-region-size", type=int, default=None, help="Send single moves on per-tile channels of this many cells a side, so seekers and shards only hear moves near them. See regions.py.")
+parser.add_argument("--speed", type=float, default=1.0, help="Multiply how often every node moves. Benchmarks use this to play full games quickly.")
+parser.add_argument("--virtual-clock", action="store_true", help="Run on lockstep virtual time: every node moves as soon as the game node says the previous tick is done, instead of on a timer.")
+parser.add_argument("--snapshot-period", type=float, default=None, help="Publish world-state snapshots this often in seconds, with deltas in between, for observers that join late. See worldstate.py.")
+parser.add_argument("--record", type=str, default=None, help="Record every channel to this LCM event log. Play it back with replay.py.")
+parser.add_argument("--runtime", choices=list(RUNTIMES), default="thread", help="How each process drives its node.")
+parser.add_argument("--start-method", choices=START_METHODS, default=None, help="How node processes are started. Defaults to the platform's own.")
+parser.add_argument("--no-ui", action="store_true", help="Don't draw the board. Tags and the result are still printed.")
+parser.add_argument("--latency", action="store_true", help="Track move, freeze, and tag latency on the game node and print a summary at the end.")
+parser.add_argument("--latency-json", type=str, default=None, help="Write latency stats, per agent, to this JSON file periodically and at the end. Implies --latency.")
+parser.add_argument("--latency-period", type=float, default=LATENCY_REPORT_PERIOD, help="Seconds between periodic latency stats.")
+parser.add_argument("--ui-fps", type=float, default=1.0 / UI_REDRAW_DELAY, help="Most board redraws per second. Frames the terminal can't keep up with are dropped.")
 
 
 def main():
@@ -40,56 +89,223 @@ def main():
         print("Positions got an odd number of arguments and can't be mapped to (x,y) pairs.")
         sys.exit(-1)
     
-    # If we need more than 254 hiders and 1 seeker we need to change the ID to a multi-byte int.
-    assert num_not_it < 254, "Only 255 total nodes are supported at this time."
+    if args.num_it < 1:
+        print("--num-it must be at least one.")
+        sys.exit(-1)
+
+    # Ids and coordinates go over the wire as int32 (messages.lcm schema version 2).
+    if num_not_it + args.num_it + 1 > MAX_WIRE_INT or width > MAX_WIRE_INT or height > MAX_WIRE_INT:
+        print(f"Node counts and board sides must fit in a signed 32-bit int (at most {MAX_WIRE_INT}).")
+        sys.exit(-1)
+
+    if args.ui_fps <= 0:
+        print("--ui-fps must be greater than zero.")
+        sys.exit(-1)
+
+    if args.speed <= 0:
+        print("--speed must be greater than zero.")
+        sys.exit(-1)
+
+    if args.snapshot_period is not None and args.snapshot_period <= 0:
+        print("--snapshot-period must be greater than zero.")
+        sys.exit(-1)
+
+    if args.shards is not None and (args.shards < 1 or args.virtual_clock or args.headless):
+        print("--shards must be at least one, and can't be combined with --virtual-clock or --headless.")
+        sys.exit(-1)
+
+    if args.move_region_size is not None and (args.move_region_size < 1 or args.virtual_clock or args.headless):
+        print("--move-region-size must be at least one, and can't be combined with --virtual-clock or --headless.")
+        sys.exit(-1)
+
+    if args.move_batch_window is not None and args.workers is None and args.agents_per_process is None:
+        # A single-agent hider has nobody else's moves to batch with.
+        print("--move-batch-window needs --workers or --agents-per-process: only agent hosts batch their moves.")
+        sys.exit(-1)
+
+    if args.virtual_clock and args.runtime != "thread":
+        print("--virtual-clock needs --runtime thread: a node waiting on its clock would block the event loop.")
+        sys.exit(-1)
 
     # Make a list of tuples for positions.
     positions = [p for p in zip(positions[0::2], positions[1::2])]
-    it_position = positions[-1]
-    positions = positions[:-1]
+    it_positions = positions[len(positions) - args.num_it:]
+    positions = positions[:len(positions) - args.num_it]
+    # One seeker keeps the single position it always had, so headless and distributed runs play the same game.
+    it_position = it_positions[0] if args.num_it == 1 else it_positions
 
     if len(positions) != num_not_it:
         print(f"{num_not_it} 'not its' specified, but only got {len(positions)} positions. Perhaps you forgot the last position is the 'it'?")
         sys.exit(-1)
     
     print(f"Running with parameters:\nWidth:{width}\nHeight:{height}\nIt Position:{it_position}\nPositions:{positions}")
-    run(width, height, positions, it_position)
+    if args.headless:
+        run_headless(width, height, positions, it_position, seed=args.seed, movement_backend=args.movement_backend, pursuit=args.pursuit)
+    else:
+        run(width, height, positions, it_position, movement_backend=args.movement_backend, move_batch_window=args.move_batch_window,
+            workers=host_worker_count(num_not_it, args.workers, args.agents_per_process), show_ui=not args.no_ui, ui_fps=args.ui_fps, runtime=args.runtime,
+            track_latency=args.latency, latency_json=args.latency_json, latency_period=args.latency_period, speed=args.speed,
+            record_path=args.record, seed=args.seed, virtual_clock=args.virtual_clock, pursuit=args.pursuit,
+            shards=args.shards, snapshot_period=args.snapshot_period, move_region_size=args.move_region_size,
+            start_method=args.start_method)
+
+
+def host_worker_count(num_not_it: int, workers: int | None, agents_per_process: int | None) -> int | None:
+    """How many host processes to split the hiders over, or None to run one process per hider."""
+    if workers is not None:
+        return max(1, min(workers, num_not_it))
+    if agents_per_process is not None:
+        return max(1, math.ceil(num_not_it / agents_per_process))
+    return None
 
 
-def run(width: int, height: int, not_it_positions: list[tuple[int, int]], it_position:tuple[int, int]):
+def run(width: int, height: int, not_it_positions: list[tuple[int, int]], it_position: tuple[int, int] | list[tuple[int, int]], movement_backend: str = "dict", move_batch_window: float | None = None, workers: int | None = None, show_ui: bool = True, ui_fps: float = 1.0 / UI_REDRAW_DELAY, runtime: str = "thread", track_latency: bool = False, latency_json: str | None = None, latency_period: float = LATENCY_REPORT_PERIOD, speed: float = 1.0, record_path: str | None = None, seed: int | None = None, virtual_clock: bool = False, pursuit: str = "intercept", shards: int | None = None, snapshot_period: float | None = None, move_region_size: int | None = None, start_method: str | None = None):
     """
-    Spin up the main game node first so that it can receive commands.
-    Spin up each of the not-it nodes.
-    Spin up the 'it' node.
+    `start_method` is the multiprocessing start method for every node process, or None for the platform default.
+    With `move_region_size`, single moves go out on per-tile channels; see regions.py.
+    With `virtual_clock`, time is lockstep ticks handed out by the game node and `speed` has no effect.
+    Spin up the main game node first so that it can receive commands. With `shards`, it only coordinates, and that
+    many shard processes, started before anyone else, judge the moves in their own tiles.
+    Spin up each of the not-it nodes, or `workers` host processes that share them out.
+    Spin up the 'it' node, or one per position if `it_position` is a list.
     Wait for the main game node to terminate.
     """
-    it_id = len(not_it_positions)+1
+    it_positions = [it_position] if isinstance(it_position, tuple) else list(it_position)
+    # Hiders are 0..n-1 and the seekers start at n+1, leaving n unused as it always has been.
+    it_ids = [len(not_it_positions) + 1 + idx for idx in range(len(it_positions))]
     processes = list()
+    helpers = list()  # Processes that stop by themselves on STOP_GAME, once the game node is done.
+    launch = RUNTIMES[runtime]
+    context = multiprocessing.get_context(start_method)
+    if start_method == "forkserver":
+        context.set_forkserver_preload(PRELOAD_MODULES)
+    move_regions = MoveRegions((width, height), move_region_size) if move_region_size is not None else None
+    if virtual_clock:
+        speed = 1.0
+
+    def make_clock(phase: int) -> VirtualClock | None:
+        # A virtual tick is one 'it' move; hiders move every other tick.
+        return VirtualClock(IT_MOVE_SPEED, phase) if virtual_clock else None
+
+    if record_path is not None:
+        # Start recording before anyone reports ready, so the log holds the whole game.
+        logger.info("Spawning recorder")
+        subscribed = context.Event()
+        recorder = RecorderNode(record_path, subscribed=subscribed)
+        start_helper(context, launch, recorder, "Recorder", subscribed, helpers)
+
+    if shards is not None:
+        layout = ShardLayout((width, height), shards)
+        logger.info(f"Spawning {len(layout)} game shards in a {layout.columns}x{layout.rows} grid")
+        for idx in range(len(layout)):
+            # Shards must be listening before anyone reports ready.
+            subscribed = context.Event()
+            shard = GameShardNode(board_shape=(width, height), node_count=len(not_it_positions), it_ids=it_ids, tile=layout.tile(idx),
+                                  movement_backend=movement_backend, subscribed=subscribed, move_regions=move_regions)
+            start_helper(context, launch, shard, f"Shard{idx}", subscribed, helpers)
 
     logger.info("Spawning GameNode")
-    game_node = GameNode(board_shape=(width, height), node_count=len(not_it_positions), it_id=it_id)
-    main_node_process = multiprocessing.Process(target=game_node.launch_node, name="GameNode")
+    game_node_type = GameNode if shards is None else ShardCoordinatorNode
+    game_node = game_node_type(board_shape=(width, height), node_count=len(not_it_positions), it_id=it_ids[0], movement_backend=movement_backend, show_ui=show_ui, ui_fps=ui_fps,
+                         track_latency=track_latency, latency_json=latency_json, latency_period=latency_period, lockstep=virtual_clock,
+                         it_ids=it_ids, snapshot_period=snapshot_period)
+    main_node_process = context.Process(target=launch, args=(game_node,), name="GameNode")
     processes.append(main_node_process)
 
-    # Spin up the seeker so it can listen as things report spawning.
-    logger.info("Spawning 'it' node")
-    it_node = ItNode(node_id=it_id, start_position=it_position, board_shape=(width, height), move_frequency=IT_MOVE_SPEED)
-    it_process = multiprocessing.Process(target=it_node.launch_node, name="Seeker")
-    processes.append(it_process)
+    # Spin up the seekers so they can listen as things report spawning.
+    logger.info(f"Spawning {len(it_ids)} 'it' node(s)")
+    for it_id, position in zip(it_ids, it_positions):
+        it_node = ItNode(node_id=it_id, start_position=position, board_shape=(width, height), move_frequency=IT_MOVE_SPEED / speed, movement_backend=movement_backend,
+                         seed=seed, clock=make_clock(IT_PHASE), pursuit=pursuit, seeker_ids=it_ids,
+                         move_regions=move_regions)
+        it_process = context.Process(target=launch, args=(it_node,), name=f"Seeker{it_id}")
+        processes.append(it_process)
 
     # Start up the 'not its'.
-    logger.info("Spawning 'not it' nodes")
-    for idx, pos in enumerate(not_it_positions):
-        not_it_node = NotItNode(node_id=idx, start_position=pos, board_shape=(width, height), move_frequency=NOT_IT_MOVE_SPEED)
-        not_it_process = multiprocessing.Process(target=not_it_node.launch_node, name=f"Hider{idx}")
-        processes.append(not_it_process)
+    hiders = list()  # (process name, node)
+    if workers is None:
+        logger.info("Spawning 'not it' nodes")
+        for idx, pos in enumerate(not_it_positions):
+            not_it_node = NotItNode(node_id=idx, start_position=pos, board_shape=(width, height), move_frequency=NOT_IT_MOVE_SPEED / speed,
+                                    seed=seed, clock=make_clock(HIDER_PHASE), move_regions=move_regions)
+            hiders.append((f"Hider{idx}", not_it_node))
+    else:
+        logger.info(f"Spawning {workers} 'not it' host processes")
+        agents = list(enumerate(not_it_positions))
+        for worker_idx in range(workers):
+            host_node = AgentHostNode(agents=agents[worker_idx::workers], board_shape=(width, height), move_frequency=NOT_IT_MOVE_SPEED / speed, move_batch_window=move_batch_window or 0.0,
+                                      seed=seed, clock=make_clock(HIDER_PHASE))
+            hiders.append((f"Host{worker_idx}", host_node))
 
     logger.info("Starting all processes")
     for p in processes:
         p.start()
+    start_nodes(context, launch, hiders)
 
     logger.info("Awaiting GameNode completion")
     main_node_process.join()
+    stop_helpers(helpers)
+
+
+def start_helper(context, launch, node: Node, name: str, subscribed, helpers: list):
+    """Start a node the rest of the game needs listening first, and wait until it sets `subscribed`.
+    If it dies or takes too long, stop every helper started so far and raise RuntimeError."""
+    process = context.Process(target=launch, args=(node,), name=name)
+    process.start()
+    helpers.append(process)
+    deadline = time.monotonic() + LISTEN_TIMEOUT
+    while not subscribed.wait(LISTEN_POLL):
+        if not process.is_alive() or time.monotonic() >= deadline:
+            problem = f"exited with code {process.exitcode}" if not process.is_alive() else f"wasn't listening after {LISTEN_TIMEOUT} seconds"
+            stop_helpers(helpers, timeout=0.0)
+            raise RuntimeError(f"{name} {problem}, so the game can't start.")
+
+
+def stop_helpers(helpers: list, timeout: float = HELPER_EXIT_TIMEOUT):
+    """Wait up to `timeout` seconds in all for the helpers to exit, then terminate any that haven't."""
+    deadline = time.monotonic() + timeout
+    for process in helpers:
+        process.join(max(0.0, deadline - time.monotonic()))
+        if process.is_alive():
+            logger.warning(f"{process.name} is still running; terminating it")
+            process.terminate()
+            process.join()
+
+
+def start_nodes(context, launch, nodes: list[tuple[str, Node]]):
+    """Start a process for each (name, node). A thousand one after the other take a while, so past
+    LAUNCH_GROUP_SIZE we start a launcher process per group instead and let them start their nodes side by side."""
+    if len(nodes) <= LAUNCH_GROUP_SIZE:
+        for name, node in nodes:
+            context.Process(target=launch, args=(node,), name=name).start()
+        return
+    for group, first in enumerate(range(0, len(nodes), LAUNCH_GROUP_SIZE)):
+        context.Process(target=launch_group, args=(nodes[first:first + LAUNCH_GROUP_SIZE], launch), name=f"Launcher{group}").start()
+
+
+def launch_group(nodes: list[tuple[str, Node]], launch):
+    """Launcher process target. Starts its nodes and waits for them, so none outlive it."""
+    # Fork where we can, whatever started us: everything is imported here already, so that's quickest.
+    method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+    context = multiprocessing.get_context(method)
+    processes = [context.Process(target=launch, args=(node,), name=name) for name, node in nodes]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+
+
+def run_headless(width: int, height: int, not_it_positions: list[tuple[int, int]], it_position: tuple[int, int] | list[tuple[int, int]], seed: int | None = None, movement_backend: str = "dict", pursuit: str = "intercept"):
+    """
+    Play the game in this process on a discrete tick and print a summary.
+    """
+    result = simulate((width, height), not_it_positions, it_position, seed=seed, movement_backend=movement_backend, pursuit=pursuit)
+    if result.completed:
+        print(f"Game Complete after {result.ticks} ticks")
+    else:
+        print(f"Game did not finish within {result.ticks} ticks")
+    for tick, node_id in result.tag_order:
+        print(f"{node_id} was tagged on tick {tick}")
 
 
 if __debug__:
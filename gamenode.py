@@ -6,18 +6,28 @@
   - Keep track of the number of NotIt nodes which have been frozen. If all NotIt nodes are frozen, then end the game. 
 """
 
+import threading
 import time
 from enum import Enum
 from logging import getLogger
 
 from channels import Channels
-from messages import begin_t, freeze_t, gameover_t, report_ready_t, report_status_t
-from movement_monitor import MovementMonitor
+from clock import HIDER_PHASE, IT_PHASE
+from latency import LatencyStats
+from messages import begin_t, freeze_t, gameover_t, report_ready_batch_t, report_ready_t, report_status_t, tick_ack_t, tick_t
+from movement_monitor import make_movement_monitor
 from node import Node
+from syncdigest import SYNC_DIGEST_PERIOD, make_digest
+from tui import BoardModel, RenderThread, TuiRenderer, screen_scale
+from worldstate import WorldStatePublisher
 
 
-MIN_SLEEP_TIME = 0.0001  # Chosen for compatibility. A time of zero doesn't always yield.
-UI_REDRAW_DELAY = 0.1  # Time in seconds between drawing the TUI.
+UI_REDRAW_DELAY = 0.1  # Default time in seconds between drawing the TUI.
+EVENT_WAIT_TIMEOUT = UI_REDRAW_DELAY  # Longest the main loop sleeps without an event, so the TUI still refreshes.
+MAX_LISTED_UNTAGGED = 32  # Past this the TUI prints a count instead of every untagged id.
+LATENCY_REPORT_PERIOD = 5.0  # Seconds between periodic latency stats, when tracking latency.
+TICK_RESEND_TIMEOUT = 0.25  # Seconds to wait for tick acknowledgements before sending the tick again.
+START_RESEND_INTERVAL = 0.1  # Least time between start messages resent for nodes that missed it.
 logger = getLogger()
 
 
@@ -29,41 +39,216 @@ class GameState(Enum):
 
 
 class GameNode(Node):
-    def __init__(self, board_shape: tuple[int, int], node_count: int, it_id: int):
+    REBUILT_ON_UNPICKLE = {"wake_event": threading.Event, "tick_lock": threading.Lock}
+
+    def __init__(
+            self,
+            board_shape: tuple[int, int],
+            node_count: int,
+            it_id: int,
+            verbose: bool = True,
+            movement_backend: str = "dict",
+            show_ui: bool = True,
+            ui_fps: float = 1.0 / UI_REDRAW_DELAY,
+            track_latency: bool = False,
+            latency_json: str | None = None,
+            latency_period: float = LATENCY_REPORT_PERIOD,
+            lockstep: bool = False,
+            it_ids: list[int] | None = None,
+            snapshot_period: float | None = None,
+    ):
+        """With `lockstep` the game runs on virtual time: we broadcast ticks and wait for every node to finish each
+        one before sending the next. The nodes need a VirtualClock; see clock.py.
+        `it_ids` lists every seeker when there is more than one. `it_id` is then the first of them.
+        With `snapshot_period` we publish world-state snapshots that often, and deltas in between; see worldstate.py."""
         super().__init__()
         assert board_shape[0] > 0 and board_shape[1] > 0
         self.board_shape = board_shape
-        self.movement_monitor = MovementMonitor()
-        self.node_count = node_count  # Includes the 'it' node.
+        self.movement_monitor = make_movement_monitor(movement_backend, board_shape)
+        self.movement_monitor.enable_move_journal()  # process_freezing replays exactly what moved.
+        self.node_count = node_count  # Hiders only. The seekers come on top.
         self.node_reports = 0  # Have all the workers chimed in?
-        self.it_id = it_id  # Used to check when "it" has tagged a node.
+        self.ready_ids = set()  # Every node that has reported ready, so resent reports count once.
+        self.it_id = it_id
+        self.it_ids = set(it_ids) if it_ids else {it_id}  # Used to check when an 'it' has tagged a node.
         self.untagged_nodes = set()
-        self.ui_draw_delay = UI_REDRAW_DELAY
+        self.hider_ids = set()  # Every hider that reported ready, tagged or not.
+        assert ui_fps > 0
+        self.ui_draw_delay = 1.0 / ui_fps
         self.last_ui_draw = 0
         self.game_state = GameState.STARTING
+        self.verbose = verbose  # Headless runs turn off the console chatter.
+        # Set by the LCM thread whenever something changes the game state. The main loop sleeps on it.
+        self.wake_event = threading.Event()
+        self.movement_monitor.add_move_listener(self.notify_move)
+        # The board model follows moves as they land. The renderer and its thread are built on first draw, in the
+        # game process, so a slow terminal only ever stalls the render thread.
+        self.board_model = None
+        self.renderer = None
+        self.render_thread = None
+        self.last_event = ""
+        if self.verbose and show_ui:
+            self.board_model = BoardModel(board_shape, it_id, scale=screen_scale(board_shape), it_ids=self.it_ids)
+            self.movement_monitor.add_move_listener(self.board_model.track_move)
+        self.freeze_seq = 0
+        self.begin_seq = 0
+        # Optional latency stats from the sequence numbers and timestamps on moves, freezes and freeze echoes.
+        self.latency_stats = None
+        self.latency_json = latency_json
+        self.latency_period = latency_period
+        self.last_latency_report = time.time()
+        if track_latency or latency_json is not None:
+            self.latency_stats = LatencyStats()
+            self.movement_monitor.add_report_listener(self.latency_stats.record_move)
+        self.lockstep = lockstep
+        self.tick = 0
+        self.tick_phase = HIDER_PHASE
+        self.tick_acks = set()  # Ids that have finished the current tick and phase.
+        self.moves_acked = dict()  # First id of each acknowledging sender -> moves it says it has sent.
+        self.last_tick_sent = 0.0
+        self.tick_lock = threading.Lock()  # Acknowledgements land on the LCM thread while the main loop advances.
+        self.digest_seq = 0
+        self.last_digest = 0.0
+        self.world_state = None
+        if snapshot_period is not None:
+            self.world_state = WorldStatePublisher(board_shape, snapshot_period)
+        # Startup timing: from on_start to the last ready report, and from the start message to the first move.
+        self.started_at = None
+        self.ready_seconds = None
+        self.begin_sent_at = None
+        self.last_begin_sent = 0.0
+        self.first_move_seconds = None
 
     def on_start(self):
+        self.started_at = time.monotonic()
         self.subscribe(Channels.REPORT_READY, self.process_ready_report)
+        self.subscribe(Channels.REPORT_READY_BATCH, self.process_ready_batch)
         self.subscribe(Channels.REPORT_STATUS, self.process_status_update)
-        self.movement_monitor.register_listeners(self.lc)
+        self.enable_reliable_delivery()
+        if self.lockstep:
+            self.subscribe(Channels.TICK_ACK, self.process_tick_ack)
+        self.subscriptions += self.movement_monitor.register_listeners(self.lc)
         self.node_reports = 0
     
     def run(self):
-        while self.game_state == GameState.STARTING:
-            # Wait for nodes to come online:
-            time.sleep(MIN_SLEEP_TIME)
+        # Wait for nodes to come online, then run the game.
+        # Only wakes when a handler changed something, or to refresh the UI.
+        delay = EVENT_WAIT_TIMEOUT
+        while delay is not None:
+            self.wait_for_event(delay)
+            delay = self.step()
 
-        # Main game loop:
-        while self.game_state == GameState.RUNNING:
-            time.sleep(MIN_SLEEP_TIME)
+    def step(self) -> float | None:
+        if self.game_state == GameState.STARTING:
+            return EVENT_WAIT_TIMEOUT
+        if self.game_state == GameState.RUNNING:
             self.process_freezing()
+            if self.lockstep:
+                self.advance_lockstep()
             self.render_tui()
+            self.report_latency()
             self.check_gameover()
-        
-        # On-stop will be called automatically when we exit from the 'run' function.
-        if self.game_state == GameState.COMPLETE:
+            self.publish_world_state()
+            self.publish_sync_digest()
+            if self.game_state == GameState.RUNNING:
+                # Wake up in time for the next retransmit, if one is sooner.
+                retransmit = self.retransmit_due()
+                return EVENT_WAIT_TIMEOUT if retransmit is None else min(EVENT_WAIT_TIMEOUT, retransmit)
+        self.finish()
+        return None
+
+    def finish(self):
+        # On-stop will be called automatically once the main loop is done.
+        self.render_tui(force_draw_now=True)
+        if self.render_thread is not None:
+            self.render_thread.stop()
+        if self.game_state == GameState.COMPLETE and self.lockstep:
+            print(f"Game Complete after {self.tick} ticks")
+        elif self.game_state == GameState.COMPLETE:
             print("Game Complete")
+        elif self.game_state == GameState.ERROR:
+            print("Game Aborted")
+        if self.verbose and self.ready_seconds is not None:
+            print(self.startup_summary())
+        if self.verbose and self.reliable is not None:
+            print(self.reliable.summary())
+        if self.latency_stats is not None:
+            print(self.latency_stats.format_summary())
+            if self.latency_json is not None:
+                self.latency_stats.write_json(self.latency_json, final=True)
     
+    def startup_summary(self) -> str:
+        summary = f"Startup: {self.node_reports} nodes ready {self.ready_seconds:.2f}s after the game node started"
+        if self.first_move_seconds is not None:
+            summary += f", first move {self.first_move_seconds * 1000:.0f}ms after the start message"
+        return summary
+
+    def advance_lockstep(self):
+        """Send the next tick once every node has finished the current one and all their moves are in."""
+        with self.tick_lock:
+            if self.tick == 0:
+                ready = False
+                next_tick = (1, HIDER_PHASE)
+            else:
+                expected = self.hider_ids if self.tick_phase == HIDER_PHASE else self.it_ids
+                moves_sent = sum(self.moves_acked.values())
+                ready = expected <= self.tick_acks and self.movement_monitor.moves_received >= moves_sent
+                if ready:
+                    next_tick = (self.tick, IT_PHASE) if self.tick_phase == HIDER_PHASE else (self.tick + 1, HIDER_PHASE)
+                elif time.monotonic() - self.last_tick_sent > TICK_RESEND_TIMEOUT:
+                    missing = len(expected - self.tick_acks)
+                    logger.warning(f"Tick {self.tick} phase {self.tick_phase}: {missing} nodes haven't acknowledged. Resending.")
+                    next_tick = (self.tick, self.tick_phase)
+                else:
+                    return
+        if ready:
+            # Judge this phase's moves before anyone moves again.
+            self.process_freezing()
+            self.check_gameover()
+            if self.game_state != GameState.RUNNING:
+                return
+        self.send_tick(*next_tick)
+
+    def send_tick(self, tick: int, phase: int):
+        with self.tick_lock:
+            if (tick, phase) != (self.tick, self.tick_phase):
+                self.tick_acks = set()
+            self.tick = tick
+            self.tick_phase = phase
+            self.last_tick_sent = time.monotonic()
+        msg = tick_t()
+        msg.tick = tick
+        msg.phase = phase
+        msg.moves_total = self.movement_monitor.moves_received
+        # Published outside the lock, since on an in-process bus the acknowledgements arrive before this returns.
+        self.publish(Channels.TICK, msg)
+
+    def process_tick_ack(self, channel, data):
+        msg = tick_ack_t.decode(data)
+        with self.tick_lock:
+            if msg.count:
+                sender = msg.ids[0]
+                self.moves_acked[sender] = max(self.moves_acked.get(sender, 0), msg.moves_sent)
+            if (msg.tick, msg.phase) == (self.tick, self.tick_phase):
+                self.tick_acks.update(msg.ids)
+        self.notify()
+
+    def wait_for_event(self, timeout: float = EVENT_WAIT_TIMEOUT):
+        """Block until a handler signals a state change or the timeout passes."""
+        self.wake_event.wait(timeout)
+        # Clear before processing: anything that lands after this point sets the event again for the next pass.
+        self.wake_event.clear()
+
+    def notify(self):
+        self.wake_event.set()
+        self.wake_soon()
+
+    def notify_move(self, node_id: int, position: tuple[int, int]):
+        if self.first_move_seconds is None and self.begin_sent_at is not None:
+            self.first_move_seconds = time.monotonic() - self.begin_sent_at
+        self.wake_event.set()
+        self.wake_soon()
+
     def on_stop(self):
         # We could make this the last step in the run.
         # Do we want to reserve 'on stop' for other kinds of cleanup?
@@ -71,24 +256,113 @@ class GameNode(Node):
         self.publish(Channels.STOP_GAME, msg)
             
     def process_freezing(self):
-        it_position = self.movement_monitor.get_node_position(self.it_id)
-        # Since we wait for 'it' to register itself, position should never be none:
-        assert it_position
-
-        # Find other nodes tagged by it.
-        newly_tagged_nodes = self.movement_monitor.get_nodes_at_position(it_position)
-        for t in newly_tagged_nodes:
-            if t != self.it_id and t in self.untagged_nodes:
-                self.send_freeze(t)
-                self.untagged_nodes.remove(t)
-                print(f"{t} was tagged at {it_position}")
-    
+        """Tag hiders using only the moves since the last call, checking every seeker in the same pass.
+        Moves are replayed in arrival order, so a hider caught for an instant between two calls is still tagged,
+        and a hider that swaps cells with an 'it' is tagged for crossing it on the shared edge."""
+        moves = self.movement_monitor.drain_moves()
+        if self.world_state is not None:
+            self.world_state.record_moves(moves)
+        if not moves:
+            return
+
+        # Position of every mover at the start of this batch. Anyone else sat still the whole time.
+        start_positions = dict()
+        for node_id, old, _ in moves:
+            start_positions.setdefault(node_id, old)
+        replay_positions = {node_id: pos for node_id, pos in start_positions.items() if pos is not None}
+        movers_at = dict()  # Cell -> movers in it at this point of the replay.
+        for node_id, pos in replay_positions.items():
+            movers_at.setdefault(pos, set()).add(node_id)
+
+        it_positions = dict()  # Seeker -> where it is at this point of the replay.
+        for it_id in self.it_ids:
+            position = start_positions[it_id] if it_id in start_positions else self.movement_monitor.get_node_position(it_id)
+            if position is not None:
+                it_positions[it_id] = position
+        it_cells = dict()  # Cell -> seekers in it.
+        for it_id, position in it_positions.items():
+            it_cells.setdefault(position, set()).add(it_id)
+        it_steps = dict()  # Seeker -> its latest (from, to) step in this batch. Only that one can be swapped through.
+
+        for node_id, _, new in moves:
+            old = replay_positions.get(node_id)
+            if old is not None:
+                movers_at[old].discard(node_id)
+            movers_at.setdefault(new, set()).add(node_id)
+            replay_positions[node_id] = new
+
+            if node_id in self.it_ids:
+                it_old = it_positions.get(node_id)
+                if it_old is not None:
+                    it_steps[node_id] = (it_old, new)
+                    it_cells[it_old].discard(node_id)
+                it_positions[node_id] = new
+                it_cells.setdefault(new, set()).add(node_id)
+                for t in self.movement_monitor.get_nodes_at_position(new):
+                    if t not in start_positions:
+                        self.tag(t, new, cause_id=node_id)
+                for t in list(movers_at[new]):
+                    self.tag(t, new, cause_id=node_id)
+            elif it_cells.get(new):
+                # Walked into a seeker. The tag is timed from that seeker's last move, like every other tag.
+                self.tag(node_id, new, cause_id=min(it_cells[new]))
+            elif old is not None:
+                # Swapped places with an 'it' that hasn't moved on since, passing through it on the way.
+                for it_id, step in it_steps.items():
+                    if step == (new, old):
+                        self.tag(node_id, new, cause_id=it_id)
+                        break
+
+    def tag(self, node_id: int, position: tuple[int, int], cause_id: int | None = None):
+        """Freeze a hider. `cause_id` is whoever's move made the tag, for timing the tag end to end."""
+        if node_id not in self.it_ids and node_id in self.untagged_nodes:
+            # Mark it tagged before sending: on an in-process bus the freeze echo comes back inside send_freeze.
+            self.untagged_nodes.remove(node_id)
+            cause_time_ns = 0
+            if cause_id is not None and self.latency_stats is not None:
+                cause_time_ns = self.latency_stats.last_move_time(cause_id)
+            self.send_freeze(node_id, cause_time_ns)
+            if self.world_state is not None:
+                self.world_state.record_freeze(node_id)
+            self.report_event(f"{node_id} was tagged at {position}")
+
+    def publish_world_state(self):
+        """Send the moves and tags since the last delta, and a snapshot when one is due."""
+        if self.world_state is None:
+            return
+        now = time.monotonic()
+        snapshot_due = self.world_state.snapshot_due(now)
+        delta = self.world_state.take_delta(now, force=snapshot_due)
+        if delta is not None:
+            self.publish(Channels.WORLD_DELTA, delta)
+        if snapshot_due:
+            positions = dict()
+            for node_id in self.hider_ids | self.it_ids:
+                position = self.movement_monitor.get_node_position(node_id)
+                if position is not None:
+                    positions[node_id] = position
+            frozen_ids = self.hider_ids - self.untagged_nodes
+            self.publish(Channels.WORLD_SNAPSHOT, self.world_state.take_snapshot(now, positions, frozen_ids))
+
+    def publish_sync_digest(self):
+        """Every SYNC_DIGEST_PERIOD, tell everyone who we have frozen. Only nodes that disagree answer; see syncdigest.py."""
+        now = time.monotonic()
+        if now - self.last_digest < SYNC_DIGEST_PERIOD:
+            return
+        self.last_digest = now
+        self.digest_seq += 1
+        self.publish(Channels.SYNC_DIGEST, make_digest(self.digest_seq, self.node_count, self.hider_ids - self.untagged_nodes))
+
     def render_tui(self, force_draw_now: bool = False):
         """Redraw UI if it has been sufficiently long since the last output.
         Can call many times in quick succession and it will automatically discard attempts to redraw.
         Override and draw now with `force_draw_now = True`.
+        Only the cells that changed since the last frame get repainted.
+        The snapshot is handed to the render thread, so this never waits on the terminal.
         """
-        if len(self.movement_monitor.get_last_movers()) == 0 and not force_draw_now:
+        if self.board_model is None:
+            return
+        if not self.board_model.has_changes() and not force_draw_now:
             return
 
         if time.time() - self.last_ui_draw > self.ui_draw_delay or force_draw_now:
@@ -96,51 +370,116 @@ class GameNode(Node):
         else:
             return
 
-        it_position = self.movement_monitor.get_node_position(self.it_id)
-        if it_position is None:
-            print("Awaiting 'it' to register.")
-            return
+        first_frame = self.render_thread is None
+        if first_frame:
+            self.renderer = TuiRenderer(self.board_model.screen_shape, scale=self.board_model.scale)
+            self.render_thread = RenderThread(self.renderer, fps=1.0 / self.ui_draw_delay)
+            self.render_thread.start()
+        self.render_thread.submit(self.board_model.take_snapshot(self.status_line(), full=first_frame))
 
-        print("-"*20)
-        for y in range(0, self.board_shape[1]):
-            for x in range(0, self.board_shape[0]):
-                if x == it_position[0] and y == it_position[1]:
-                    print("X", end = " ")
-                else:
-                    count = len(self.movement_monitor.get_nodes_at_position((x, y)))
-                    if count == 0:
-                        print("_", end = " ")
-                    else:
-                        print(count, end=" ")
-            print()
-        print("-"*20)
-        print(f"Untagged: {self.untagged_nodes}")
+    def status_line(self) -> str:
+        if len(self.untagged_nodes) <= MAX_LISTED_UNTAGGED:
+            status = f"Untagged: {self.untagged_nodes}"
+        else:
+            status = f"Untagged: {len(self.untagged_nodes)} nodes"
+        if self.board_model.scale > 1:
+            status += f"  (1 char = {self.board_model.scale}x{self.board_model.scale} cells)"
+        if self.last_event:
+            status += f"  | {self.last_event}"
+        return status
+
+    def report_event(self, text: str):
+        """Console notes such as tags. A cursor-addressed board would be scrolled out of place by a print, so
+        there they go on the status line instead."""
+        if not self.verbose:
+            return
+        if self.renderer is not None and self.renderer.ansi:
+            self.last_event = text
+        else:
+            print(text)
 
     # IPC Methods:
 
-    def send_freeze(self, node_id):
+    def report_latency(self):
+        """Log the latency stats, and write them out if asked to, every `latency_period` seconds."""
+        if self.latency_stats is None or time.time() - self.last_latency_report < self.latency_period:
+            return
+        self.last_latency_report = time.time()
+        logger.info(self.latency_stats.format_summary())
+        if self.latency_json is not None:
+            self.latency_stats.write_json(self.latency_json)
+
+    def send_freeze(self, node_id, cause_time_ns: int = 0):
         msg = freeze_t()
         msg.id = node_id
-        self.publish(Channels.FREEZE, msg)
+        self.freeze_seq += 1
+        msg.seq = self.freeze_seq
+        msg.cause_time_ns = cause_time_ns
+        msg.send_time_ns = time.monotonic_ns()
+        self.publish_reliable(Channels.FREEZE, msg.seq, msg, ackers=(node_id,))
 
     def process_ready_report(self, channel, data):
-        msg = report_ready_t.decode(data)
+        try:
+            msg = report_ready_t.decode(data)
+        except ValueError:
+            # Wrong fingerprint: the node was built from a different messages.lcm.
+            self.abort_on_schema_mismatch("a ready report with an unknown fingerprint")
+            return
+        if msg.schema_version != report_ready_t.SCHEMA_VERSION:
+            self.abort_on_schema_mismatch(f"node {msg.id} speaking schema version {msg.schema_version}")
+            return
+        self.node_ready(msg.id, tuple(msg.position))
+        self.check_ready()
+        self.notify()
+
+    def process_ready_batch(self, channel, data):
+        try:
+            msg = report_ready_batch_t.decode(data)
+        except ValueError:
+            self.abort_on_schema_mismatch("a batch of ready reports with an unknown fingerprint")
+            return
+        if msg.schema_version != report_ready_batch_t.SCHEMA_VERSION:
+            self.abort_on_schema_mismatch(f"a host speaking schema version {msg.schema_version}")
+            return
+        for node_id, position in zip(msg.ids, msg.positions):
+            self.node_ready(node_id, tuple(position))
+        self.check_ready()
+        self.notify()
+
+    def node_ready(self, node_id: int, position: tuple[int, int]):
+        if node_id in self.ready_ids:
+            # A resend. Its sender hasn't seen the start, so if the game is on, it missed the message.
+            if self.game_state == GameState.RUNNING:
+                self.resend_start_message()
+            return
+        self.ready_ids.add(node_id)
         self.node_reports += 1
 
         # Track everyone's start positions.
-        self.movement_monitor.set_node_position(msg.id, msg.position, clear_previous=False)
+        self.movement_monitor.set_node_position(node_id, position, clear_previous=False)
         
         # The 'it' doesn't need to be tagged:
-        if msg.id != self.it_id:
-            self.untagged_nodes.add(msg.id)
-        
-        # Check if we're ready.
-        if self.node_reports == self.node_count+1:  # Plus one because we have the 'NotIt' count and the 'It'.
+        if node_id not in self.it_ids:
+            self.untagged_nodes.add(node_id)
+            self.hider_ids.add(node_id)
+
+    def check_ready(self):
+        if self.game_state != GameState.STARTING:
+            return
+        if self.node_reports == self.node_count + len(self.it_ids):  # The 'NotIt' count plus every 'It'.
             self.game_state = GameState.RUNNING
-            logger.info(f"All {self.node_reports} nodes ({self.untagged_nodes}) and the 'it' node have reported -- starting game.")
-            print("Game Start")
-            msg = begin_t()
-            self.publish(Channels.BEGIN_GAME, msg)
+            self.ready_seconds = time.monotonic() - self.started_at
+            logger.info(f"All {self.node_reports} nodes reported {self.ready_seconds:.2f}s after we started -- starting game.")
+            if self.verbose:
+                print("Game Start")
+            self.send_start_message()
+
+    def abort_on_schema_mismatch(self, description: str):
+        # Fail fast. Carrying on would mean misreading ids and positions for the rest of the game.
+        logger.error(f"Got {description}, but this game runs message schema version {report_ready_t.SCHEMA_VERSION}. "
+                     f"Rebuild the messages package with `lcm-gen -p messages.lcm` on every node.")
+        self.game_state = GameState.ERROR
+        self.notify()
 
     def check_gameover(self):
         if len(self.untagged_nodes) == 0 and self.game_state == GameState.RUNNING:
@@ -148,20 +487,43 @@ class GameNode(Node):
 
     def send_start_message(self):
         msg = begin_t()
-        self.publish(Channels.BEGIN_GAME, msg)
+        msg.schema_version = begin_t.SCHEMA_VERSION
+        self.begin_seq += 1
+        msg.seq = self.begin_seq
+        msg.send_time_ns = time.monotonic_ns()
+        self.last_begin_sent = time.monotonic()
+        if self.begin_sent_at is None:
+            self.begin_sent_at = self.last_begin_sent
+        # Not acknowledged: nodes that miss it say so by resending their ready reports. See reliable.py.
+        self.publish_reliable(Channels.BEGIN_GAME, msg.seq, msg)
+
+    def resend_start_message(self):
+        # A thousand nodes that missed the start all say so at once. One resend answers every one of them.
+        if time.monotonic() - self.last_begin_sent < START_RESEND_INTERVAL:
+            return
+        if self.reliable is None:
+            self.send_start_message()
+        else:
+            # The same message, so anyone who did get it sees a duplicate and ignores it.
+            self.last_begin_sent = time.monotonic()
+            self.reliable.resend_latest(Channels.BEGIN_GAME)
 
     def process_status_update(self, channel, data):
         msg = report_status_t.decode(data)
+        if msg.echo_send_time_ns and self.latency_stats is not None:
+            self.latency_stats.record_freeze_echo(msg.id, msg.echo_send_time_ns, msg.echo_cause_time_ns, msg.received_time_ns)
         # Perhaps we missed the message saying the game started:
         if self.game_state == GameState.RUNNING and not msg.game_started:
             logger.warning(f"Node ID {msg.id} missed the game start message.  Rebroadcasting.")
-            self.send_start_message()
+            self.resend_start_message()
         # Or the node didn't get a freeze command:
         if msg.frozen and msg.id in self.untagged_nodes:
             # This should not be possible but we want to monitor for odd message issues.
             logger.warning(f"Node ID {msg.id} incorrectly detected itself as tagged.  Recovering.")
-            self.send_freeze(msg.id)
             self.untagged_nodes.remove(msg.id)
-        elif not msg.frozen and msg.id not in self.untagged_nodes:
+            self.send_freeze(msg.id)
+        elif not msg.frozen and msg.id in self.hider_ids and msg.id not in self.untagged_nodes:
+            # Only hiders we've heard are ready. A status can overtake a ready report that was lost.
             logger.warning(f"Node ID {msg.id} did not receive the freeze message.  Resending.")
             self.send_freeze(msg.id)
+        self.notify()
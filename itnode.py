@@ -5,42 +5,138 @@
   - Choose a move strategically, chasing NotIt nodes using any simple heuristic/algorithm of your choice.
   - Publish move updates to GameNode every 0.5 seconds.
 """
-import random
+import math
+import threading
 from logging import getLogger
 
-from messages import freeze_t
-from movement_monitor import MovementMonitor
+from channels import Channels
+from messages import freeze_t, report_ready_batch_t, report_ready_t
+from movement_monitor import make_movement_monitor
 from notitnode import NotItNode
+from pursuit import ASSIGNMENT_PERIOD, InterceptPlanner, assign_targets, step_toward
+from regions import INTEREST_RADIUS, RegionSubscriptions
+from spatial_index import BucketGrid
 
 
 logger = getLogger()
 
 
 class ItNode(NotItNode):
-    def __init__(self, node_id: int, start_position: tuple[int, int], board_shape: tuple[int, int], move_frequency: float):
+    REBUILT_ON_UNPICKLE = {"index_lock": threading.Lock}
+
+    def __init__(
+            self,
+            node_id: int,
+            start_position: tuple[int, int],
+            board_shape: tuple[int, int],
+            move_frequency: float,
+            movement_backend: str = "dict",
+            seed: int | None = None,
+            clock=None,
+            pursuit: str = "intercept",
+            seeker_ids: list[int] | None = None,
+            move_regions=None,
+    ):
+        """`pursuit` picks how we chase: "greedy" or "intercept". See pursuit.py.
+        `seeker_ids` lists every 'it' in the game, us included, when there is more than one. We then split the
+        hiders between us.
+        With `move_regions` we follow only the move tiles around us, wide enough to take in the nearest hider we
+        know of. Ready reports give us everyone's start, and moves out of our tiles tell us where they went."""
         super().__init__(
             node_id=node_id, 
             start_position=start_position, 
             board_shape=board_shape, 
-            move_frequency=move_frequency
+            move_frequency=move_frequency,
+            seed=seed,
+            clock=clock,
+            move_regions=move_regions,
         )
-        self.movement_monitor = MovementMonitor()
+        self.movement_monitor = make_movement_monitor(movement_backend, board_shape)
         self.tagged_nodes = set()
         self.untagged_nodes = set()
+        # Untagged, in-bound nodes by position. Kept current from move reports and freezes so lookups never rescan.
+        # Moves and freezes land on the LCM thread while lookups happen in run(), hence the lock.
+        self.spatial_index = BucketGrid(board_shape)
+        self.index_lock = threading.Lock()
+        self.planner = InterceptPlanner(board_shape, self.spatial_index) if pursuit == "intercept" else None
+        self.seeker_ids = set(seeker_ids or [node_id])
+        self.seeker_positions = dict()  # The other seekers, as last reported.
+        self.assigned_target = None
+        self.ticks_since_assignment = 0
+        self.movement_monitor.add_move_listener(self.track_move)
+        self.region_subscriptions = None
     
     def on_start(self):
         super().on_start()
-        self.movement_monitor.register_listeners(self.lc)
+        if self.move_regions is None:
+            self.subscriptions += self.movement_monitor.register_listeners(self.lc)
+        else:
+            self.subscribe(Channels.REPORT_READY, self.handle_ready)
+            self.subscribe(Channels.REPORT_READY_BATCH, self.handle_ready_batch)
+            self.subscribe(Channels.REPORT_MOVE_BATCH, self.movement_monitor.process_move_batch)
+            self.region_subscriptions = RegionSubscriptions(self, self.move_regions, self.movement_monitor.process_move_report)
+            self.follow_region()
+        if self.clock.virtual:
+            # Don't chase until every move the game node had seen when it sent our tick has reached us too.
+            # These run after the monitor's handlers, so the count is already up to date.
+            self.clock.caught_up = lambda moves_total: self.movement_monitor.moves_received >= moves_total
+            self.subscribe(Channels.REPORT_MOVE, self.poke_clock)
+            self.subscribe(Channels.REPORT_MOVE_BATCH, self.poke_clock)
+
+    def poke_clock(self, channel, data):
+        self.clock.poke()
     
     def tick(self):
         # Some minor housekeeping: are there any new people we haven't seen?
         for nid in self.movement_monitor.get_last_movers():
-            if nid not in self.tagged_nodes and nid != self.node_id:
+            if nid not in self.tagged_nodes and nid not in self.seeker_ids:
                 self.untagged_nodes.add(nid)
+        if len(self.seeker_ids) > 1:
+            self.update_assignment()
+        if self.region_subscriptions is not None:
+            self.follow_region()
+
+    def follow_region(self):
+        """Follow the tiles around us, out as far as the nearest hider we know of."""
+        with self.index_lock:
+            nearest = self.spatial_index.nearest(self.current_position)
+        if nearest is None:
+            radius = max(self.move_regions.columns, self.move_regions.rows)
+        else:
+            distance = abs(nearest[1][0] - self.current_position[0]) + abs(nearest[1][1] - self.current_position[1])
+            radius = max(INTEREST_RADIUS, math.ceil(distance / self.move_regions.tile_size))
+        self.region_subscriptions.follow(self.move_regions.tiles_near(self.current_position, radius))
+
+    def handle_ready(self, channel, data):
+        msg = report_ready_t.decode(data)
+        self.place(msg.id, tuple(msg.position))
+
+    def handle_ready_batch(self, channel, data):
+        msg = report_ready_batch_t.decode(data)
+        for node_id, position in zip(msg.ids, msg.positions):
+            self.place(node_id, tuple(position))
+
+    def place(self, node_id: int, position: tuple[int, int]):
+        # Resent ready reports carry the start position, which may be stale by now.
+        if self.movement_monitor.get_node_position(node_id) is None:
+            self.movement_monitor.set_node_position(node_id, position)
+
+    def update_assignment(self):
+        """Work out which hider is ours, now and then or as soon as ours is tagged."""
+        self.ticks_since_assignment += 1
+        with self.index_lock:
+            if self.assigned_target in self.spatial_index and self.ticks_since_assignment < ASSIGNMENT_PERIOD:
+                return
+            seekers = dict(self.seeker_positions)
+            seekers[self.node_id] = self.current_position
+            self.assigned_target = assign_targets(seekers, self.spatial_index).get(self.node_id)
+        self.ticks_since_assignment = 0
     
     def choose_move(self) -> tuple[int, int]:
+        if self.planner is not None:
+            return self.choose_intercept_move()
         new_position = self.current_position
-        nearest_node = self.find_nearest_node()
+        nearest_node = self.find_assigned_node() or self.find_nearest_node()
         if nearest_node is None:
             logger.warning("No untagged nodes found to seek. Moving at random.")
             return super().choose_move()
@@ -48,38 +144,67 @@ class ItNode(NotItNode):
         # We have a nearest node. Convert dx and dy to be +1 or -1 each, then pick a direction at random.
         dx = ItNode.sign(nearest_node[0] - self.current_position[0])
         dy = ItNode.sign(nearest_node[1] - self.current_position[1])
-        if random.random() > 0.5:
+        if self.rng.random() > 0.5:
             new_position = (self.current_position[0]+dx, self.current_position[1])
         else:
             new_position = (self.current_position[0], self.current_position[1]+dy)
 
         return new_position
+
+    def choose_intercept_move(self) -> tuple[int, int]:
+        with self.index_lock:
+            aim = self.planner.plan(self.current_position, self.assigned_target)
+        if aim is None:
+            logger.warning("No untagged nodes found to seek. Moving at random.")
+            return super().choose_move()
+        new_position = step_toward(self.current_position, aim, self.rng)
+        if new_position == self.current_position:
+            # We're where the hider should be, but it isn't here. Look around.
+            return super().choose_move()
+        return new_position
     
     def handle_freeze(self, channel, data):
         msg = freeze_t.decode(data)
         self.tagged_nodes.add(msg.id)
         if msg.id in self.untagged_nodes:
             self.untagged_nodes.remove(msg.id)
+        with self.index_lock:
+            self.spatial_index.remove(msg.id)
+            if self.planner is not None:
+                self.planner.forget(msg.id)
+
+    def track_move(self, node_id: int, position: tuple[int, int]):
+        """Movement monitor listener. Keeps the spatial index in step with reported moves."""
+        if node_id in self.seeker_ids:
+            if node_id != self.node_id:
+                with self.index_lock:
+                    self.seeker_positions[node_id] = position
+            return
+        if node_id in self.tagged_nodes:
+            return
+        with self.index_lock:
+            if self.position_in_bound(position):
+                self.spatial_index.update(node_id, position)
+                if self.planner is not None:
+                    self.planner.observe(node_id, position)
+            else:
+                self.spatial_index.remove(node_id)
+
+    def find_assigned_node(self) -> tuple[int, int] | None:
+        """Position of the hider assign_targets gave us, if we have one and it's still untagged."""
+        if self.assigned_target is None:
+            return None
+        with self.index_lock:
+            return self.spatial_index.get(self.assigned_target)
 
     def find_nearest_node(self) -> tuple[int, int] | None:
         """Find the nearest _in bounds_ node to the current position and returns it.
         If there are no untagged IDs, returns None."""
-        if len(self.untagged_nodes) == 0:
+        with self.index_lock:
+            nearest = self.spatial_index.nearest(self.current_position)
+        if nearest is None:
             return None
-        nearest_distance = self.board_shape[0] + self.board_shape[1] + 1  # Max possible distance.
-        nearest_position = (0, 0)
-        for node_id in self.untagged_nodes:
-            node_pos = self.movement_monitor.get_node_position(node_id)
-            if node_pos is None:
-                logger.warning(f"Move monitor doesn't have a position for untagged node {node_id}")
-                continue
-            dx = node_pos[0] - self.current_position[0]
-            dy = node_pos[1] - self.current_position[1]
-            dist = abs(dx) + abs(dy)
-            if dist < nearest_distance and self.position_in_bound(node_pos):
-                nearest_distance = dist
-                nearest_position = node_pos
-        return nearest_position
+        return nearest[1]
 
     @staticmethod
     def sign(delta):
@@ -0,0 +1,170 @@
+"""
+Latency stats kept by the GameNode from the sequence numbers and send timestamps on moved_t, freeze_t and the
+freeze echo in report_status_t.
+
+  - Move latency: one-way time from a mover's send to the GameNode's receipt, per agent and overall.
+  - Freeze latency: one-way time from the GameNode's freeze to the hider's receipt.
+  - Round trip: GameNode freeze -> hider -> echo back to the GameNode, per agent and overall.
+  - Tag latency: send time of the move that caused a tag -> the tagged hider receiving its freeze.
+  - Drops and reorders: gaps and backwards steps in each mover's sequence numbers.
+
+Histograms use power-of-two nanosecond buckets, so recording is O(1) and a histogram that only ever sees a handful of
+distinct magnitudes stays a handful of entries. That keeps per-agent histograms affordable at large agent counts.
+Timestamps come from CLOCK_MONOTONIC, which is shared by every process on a host but not between hosts.
+"""
+
+import json
+import threading
+import time
+
+from picklestate import RebuiltOnUnpickle
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = dict()  # Bucket index -> samples. Bucket i holds latencies in [2**(i-1), 2**i) ns.
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, latency_ns: int):
+        latency_ns = max(latency_ns, 0)  # Clock skew between processes can't make a message arrive early.
+        bucket = latency_ns.bit_length()
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ns += latency_ns
+        if latency_ns > self.max_ns:
+            self.max_ns = latency_ns
+
+    def merge(self, other: "LatencyHistogram"):
+        for bucket, samples in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + samples
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def percentile(self, fraction: float) -> int:
+        """Upper bound of the bucket holding the given fraction of samples, in ns. Accurate to a factor of two."""
+        if self.count == 0:
+            return 0
+        threshold = fraction * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= threshold:
+                return min(1 << bucket, self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> dict:
+        """Milliseconds, for reading and for JSON."""
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ns / self.count / 1e6 if self.count else 0.0,
+            "p50_ms": self.percentile(0.5) / 1e6,
+            "p95_ms": self.percentile(0.95) / 1e6,
+            "p99_ms": self.percentile(0.99) / 1e6,
+            "max_ms": self.max_ns / 1e6,
+        }
+
+
+class LatencyStats(RebuiltOnUnpickle):
+    """Fed from the LCM thread and read from the game loop, hence the lock."""
+    REBUILT_ON_UNPICKLE = {"lock": threading.Lock}
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.move_latency = LatencyHistogram()
+        self.freeze_latency = LatencyHistogram()
+        self.round_trip = LatencyHistogram()
+        self.tag_latency = LatencyHistogram()
+        self.agent_move_latency = dict()  # node_id -> LatencyHistogram
+        self.agent_round_trip = dict()  # node_id -> LatencyHistogram
+        self.last_seq = dict()  # node_id -> highest move seq seen.
+        self.last_send_ns = dict()  # node_id -> send time of its latest move.
+        self.drops = dict()  # node_id -> moves missing from the sequence so far.
+        self.reorders = dict()  # node_id -> moves that arrived after a later one.
+        self.started_ns = time.monotonic_ns()
+
+    def record_move(self, node_id: int, seq: int, send_time_ns: int, now_ns: int | None = None):
+        if send_time_ns == 0:
+            return  # Unstamped sender.
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        with self.lock:
+            latency = now_ns - send_time_ns
+            self.move_latency.record(latency)
+            histogram = self.agent_move_latency.get(node_id)
+            if histogram is None:
+                histogram = self.agent_move_latency[node_id] = LatencyHistogram()
+            histogram.record(latency)
+
+            last = self.last_seq.get(node_id)
+            if last is None or seq > last:
+                if last is not None and seq > last + 1:
+                    self.drops[node_id] = self.drops.get(node_id, 0) + seq - last - 1
+                self.last_seq[node_id] = seq
+                self.last_send_ns[node_id] = send_time_ns
+            else:
+                # Late rather than lost: it was counted as a drop when the gap opened.
+                self.reorders[node_id] = self.reorders.get(node_id, 0) + 1
+                if self.drops.get(node_id, 0) > 0:
+                    self.drops[node_id] -= 1
+
+    def last_move_time(self, node_id: int) -> int:
+        """Send time of the latest move seen from `node_id`, or 0 if none was stamped."""
+        with self.lock:
+            return self.last_send_ns.get(node_id, 0)
+
+    def record_freeze_echo(self, node_id: int, send_time_ns: int, cause_time_ns: int, received_time_ns: int, now_ns: int | None = None):
+        if send_time_ns == 0:
+            return
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        with self.lock:
+            self.round_trip.record(now_ns - send_time_ns)
+            histogram = self.agent_round_trip.get(node_id)
+            if histogram is None:
+                histogram = self.agent_round_trip[node_id] = LatencyHistogram()
+            histogram.record(now_ns - send_time_ns)
+            if received_time_ns:
+                self.freeze_latency.record(received_time_ns - send_time_ns)
+                if cause_time_ns:
+                    self.tag_latency.record(received_time_ns - cause_time_ns)
+
+    def summary(self, per_agent: bool = False) -> dict:
+        with self.lock:
+            result = {
+                "elapsed_s": (time.monotonic_ns() - self.started_ns) / 1e9,
+                "move": self.move_latency.summary(),
+                "freeze": self.freeze_latency.summary(),
+                "round_trip": self.round_trip.summary(),
+                "tag": self.tag_latency.summary(),
+                "drops": sum(self.drops.values()),
+                "reorders": sum(self.reorders.values()),
+            }
+            if per_agent:
+                result["agents"] = {
+                    str(node_id): {
+                        "move": histogram.summary(),
+                        "round_trip": self.agent_round_trip[node_id].summary() if node_id in self.agent_round_trip else None,
+                        "drops": self.drops.get(node_id, 0),
+                        "reorders": self.reorders.get(node_id, 0),
+                    }
+                    for node_id, histogram in self.agent_move_latency.items()
+                }
+            return result
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        lines = [f"Latency over {summary['elapsed_s']:.1f}s (drops: {summary['drops']}, reorders: {summary['reorders']})"]
+        for name in ["move", "freeze", "round_trip", "tag"]:
+            stats = summary[name]
+            lines.append(f"  {name:<10} n={stats['count']:<7} mean={stats['mean_ms']:.3f}ms p50<={stats['p50_ms']:.3f}ms "
+                         f"p95<={stats['p95_ms']:.3f}ms p99<={stats['p99_ms']:.3f}ms max={stats['max_ms']:.3f}ms")
+        return "\n".join(lines)
+
+    def write_json(self, path: str, final: bool = False):
+        summary = self.summary(per_agent=True)
+        summary["final"] = final
+        with open(path, "w") as fout:
+            json.dump(summary, fout, indent=1)
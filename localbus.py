@@ -0,0 +1,50 @@
+"""
+An in-process stand-in for `lcm.LCM` so nodes can be driven without sockets or subprocesses.
+Publishing calls every matching handler synchronously, in subscription order, on the caller's thread.
+
+Used by the headless simulation to reuse the node handlers as-is.
+"""
+
+import re
+
+
+class LocalSubscription:
+    def __init__(self, channel: str, handler):
+        self.channel = channel
+        self.pattern = re.compile(channel)
+        self.handler = handler
+
+
+class LocalBus:
+    def __init__(self):
+        self.subscriptions = list()
+        self._channel_cache = dict()  # Channel name -> list of matching subscriptions.
+
+    def subscribe(self, channel: str, handler) -> LocalSubscription:
+        # LCM treats the channel as a regex that must match the whole name, so we do the same.
+        subscription = LocalSubscription(channel, handler)
+        self.subscriptions.append(subscription)
+        # Extend the cached handler lists in place so subscribing stays cheap with many nodes on one bus.
+        for name, handlers in self._channel_cache.items():
+            if subscription.pattern.fullmatch(name):
+                handlers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: LocalSubscription):
+        self.subscriptions.remove(subscription)
+        for handlers in self._channel_cache.values():
+            if subscription in handlers:
+                handlers.remove(subscription)
+
+    def publish(self, channel: str, data: bytes):
+        handlers = self._channel_cache.get(channel)
+        if handlers is None:
+            handlers = [s for s in self.subscriptions if s.pattern.fullmatch(channel)]
+            self._channel_cache[channel] = handlers
+        # Iterate over a copy in case a handler subscribes or unsubscribes.
+        for subscription in tuple(handlers):
+            subscription.handler(channel, data)
+
+    def handle_timeout(self, timeout_millis: int) -> int:
+        # Everything is delivered at publish time so there is never anything pending.
+        return 0
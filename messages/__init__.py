@@ -11,3 +11,11 @@ from .initialize_t import initialize_t as initialize_t
 from .moved_t import moved_t as moved_t
 from .gameover_t import gameover_t as gameover_t
 from .report_status_t import report_status_t as report_status_t
+from .moved_batch_t import moved_batch_t as moved_batch_t
+from .tick_t import tick_t as tick_t
+from .tick_ack_t import tick_ack_t as tick_ack_t
+from .world_snapshot_t import world_snapshot_t as world_snapshot_t
+from .world_delta_t import world_delta_t as world_delta_t
+from .report_ready_batch_t import report_ready_batch_t as report_ready_batch_t
+from .sync_digest_t import sync_digest_t as sync_digest_t
+from .control_ack_t import control_ack_t as control_ack_t
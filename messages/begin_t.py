@@ -10,14 +10,21 @@ import struct
 class begin_t(object):
     """ Sent to nodes when the game begins. """
 
-    __slots__ = []
+    __slots__ = ["schema_version", "seq", "send_time_ns"]
 
-    __typenames__ = []
+    __typenames__ = ["int8_t", "int32_t", "int64_t"]
 
-    __dimensions__ = []
+    __dimensions__ = [None, None, None]
+
+    SCHEMA_VERSION = 3
 
     def __init__(self):
-        pass
+        self.schema_version = 0
+        """ LCM Type: int8_t """
+        self.seq = 0
+        """ LCM Type: int32_t """
+        self.send_time_ns = 0
+        """ LCM Type: int64_t """
 
     def encode(self):
         buf = BytesIO()
@@ -26,7 +33,7 @@ class begin_t(object):
         return buf.getvalue()
 
     def _encode_one(self, buf):
-        pass
+        buf.write(struct.pack(">biq", self.schema_version, self.seq, self.send_time_ns))
 
     @staticmethod
     def decode(data: bytes):
@@ -41,12 +48,13 @@ class begin_t(object):
     @staticmethod
     def _decode_one(buf):
         self = begin_t()
+        self.schema_version, self.seq, self.send_time_ns = struct.unpack(">biq", buf.read(13))
         return self
 
     @staticmethod
     def _get_hash_recursive(parents):
         if begin_t in parents: return 0
-        tmphash = (0x12345678) & 0xffffffffffffffff
+        tmphash = (0x9285fe3815a44f91) & 0xffffffffffffffff
         tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
         return tmphash
     _packed_fingerprint = None
@@ -0,0 +1,82 @@
+"""LCM type definitions
+This file automatically generated by lcm.
+DO NOT MODIFY BY HAND!!!!
+"""
+
+
+from io import BytesIO
+import struct
+
+class control_ack_t(object):
+    """
+    Acknowledges a control message sent with acknowledged delivery (see reliable.py). `channel` and `seq` name the
+    message, and `ids` are the recipients acknowledging it.
+    """
+
+    __slots__ = ["channel", "seq", "count", "ids"]
+
+    __typenames__ = ["string", "int32_t", "int32_t", "int32_t"]
+
+    __dimensions__ = [None, None, None, ["count"]]
+
+    def __init__(self):
+        self.channel = ""
+        """ LCM Type: string """
+        self.seq = 0
+        """ LCM Type: int32_t """
+        self.count = 0
+        """ LCM Type: int32_t """
+        self.ids = []
+        """ LCM Type: int32_t[count] """
+
+    def encode(self):
+        buf = BytesIO()
+        buf.write(control_ack_t._get_packed_fingerprint())
+        self._encode_one(buf)
+        return buf.getvalue()
+
+    def _encode_one(self, buf):
+        __channel_encoded = self.channel.encode('utf-8')
+        buf.write(struct.pack('>I', len(__channel_encoded)+1))
+        buf.write(__channel_encoded)
+        buf.write(b"\0")
+        buf.write(struct.pack(">ii", self.seq, self.count))
+        buf.write(struct.pack('>%di' % self.count, *self.ids[:self.count]))
+
+    @staticmethod
+    def decode(data: bytes):
+        if hasattr(data, 'read'):
+            buf = data
+        else:
+            buf = BytesIO(data)
+        if buf.read(8) != control_ack_t._get_packed_fingerprint():
+            raise ValueError("Decode error")
+        return control_ack_t._decode_one(buf)
+
+    @staticmethod
+    def _decode_one(buf):
+        self = control_ack_t()
+        __channel_len = struct.unpack('>I', buf.read(4))[0]
+        self.channel = buf.read(__channel_len)[:-1].decode('utf-8', 'replace')
+        self.seq, self.count = struct.unpack(">ii", buf.read(8))
+        self.ids = struct.unpack('>%di' % self.count, buf.read(self.count * 4))
+        return self
+
+    @staticmethod
+    def _get_hash_recursive(parents):
+        if control_ack_t in parents: return 0
+        tmphash = (0xc734bb7ab22387ba) & 0xffffffffffffffff
+        tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
+        return tmphash
+    _packed_fingerprint = None
+
+    @staticmethod
+    def _get_packed_fingerprint():
+        if control_ack_t._packed_fingerprint is None:
+            control_ack_t._packed_fingerprint = struct.pack(">Q", control_ack_t._get_hash_recursive([]))
+        return control_ack_t._packed_fingerprint
+
+    def get_hash(self):
+        """Get the LCM hash of the struct"""
+        return struct.unpack(">Q", control_ack_t._get_packed_fingerprint())[0]
+
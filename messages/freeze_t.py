@@ -11,20 +11,34 @@ class freeze_t(object):
     """
     Build with: lcm-gen -p messages.lcm
     
+    Schema version 2: ids and coordinates are 32-bit so games can go past 254 agents and 32k cells per side.
+    Changing a field type changes the LCM fingerprint, so a v1 node and a v2 node can't silently misdecode each other.
+    The handshake messages (report_ready_t and begin_t) also carry the version so a mismatch is reported by name.
+    
+    Schema version 3: moved_t, freeze_t and begin_t carry a per-sender sequence number and a CLOCK_MONOTONIC send time
+    in nanoseconds, for latency stats. Zero means the sender didn't stamp the message. Timestamps are only comparable
+    between processes on the same host.
+    
     Server -> Clients
     
     Sent to a 'notit' when tagged.
     """
 
-    __slots__ = ["id"]
+    __slots__ = ["id", "seq", "send_time_ns", "cause_time_ns"]
 
-    __typenames__ = ["int8_t"]
+    __typenames__ = ["int32_t", "int32_t", "int64_t", "int64_t"]
 
-    __dimensions__ = [None]
+    __dimensions__ = [None, None, None, None]
 
     def __init__(self):
         self.id = 0
-        """ LCM Type: int8_t """
+        """ LCM Type: int32_t """
+        self.seq = 0
+        """ LCM Type: int32_t """
+        self.send_time_ns = 0
+        """ LCM Type: int64_t """
+        self.cause_time_ns = 0
+        """ LCM Type: int64_t """
 
     def encode(self):
         buf = BytesIO()
@@ -33,7 +47,7 @@ class freeze_t(object):
         return buf.getvalue()
 
     def _encode_one(self, buf):
-        buf.write(struct.pack(">b", self.id))
+        buf.write(struct.pack(">iiqq", self.id, self.seq, self.send_time_ns, self.cause_time_ns))
 
     @staticmethod
     def decode(data: bytes):
@@ -48,13 +62,13 @@ class freeze_t(object):
     @staticmethod
     def _decode_one(buf):
         self = freeze_t()
-        self.id = struct.unpack(">b", buf.read(1))[0]
+        self.id, self.seq, self.send_time_ns, self.cause_time_ns = struct.unpack(">iiqq", buf.read(24))
         return self
 
     @staticmethod
     def _get_hash_recursive(parents):
         if freeze_t in parents: return 0
-        tmphash = (0x68dd721286446c8) & 0xffffffffffffffff
+        tmphash = (0xd6e27e41e9b332f4) & 0xffffffffffffffff
         tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
         return tmphash
     _packed_fingerprint = None
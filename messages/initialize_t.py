@@ -16,17 +16,17 @@ class initialize_t(object):
 
     __slots__ = ["id", "position", "boundary"]
 
-    __typenames__ = ["int8_t", "int16_t", "int16_t"]
+    __typenames__ = ["int32_t", "int32_t", "int32_t"]
 
     __dimensions__ = [None, [2], [2]]
 
     def __init__(self):
         self.id = 0
-        """ LCM Type: int8_t """
+        """ LCM Type: int32_t """
         self.position = [ 0 for dim0 in range(2) ]
-        """ LCM Type: int16_t[2] """
+        """ LCM Type: int32_t[2] """
         self.boundary = [ 0 for dim0 in range(2) ]
-        """ LCM Type: int16_t[2] """
+        """ LCM Type: int32_t[2] """
 
     def encode(self):
         buf = BytesIO()
@@ -35,9 +35,9 @@ class initialize_t(object):
         return buf.getvalue()
 
     def _encode_one(self, buf):
-        buf.write(struct.pack(">b", self.id))
-        buf.write(struct.pack('>2h', *self.position[:2]))
-        buf.write(struct.pack('>2h', *self.boundary[:2]))
+        buf.write(struct.pack(">i", self.id))
+        buf.write(struct.pack('>2i', *self.position[:2]))
+        buf.write(struct.pack('>2i', *self.boundary[:2]))
 
     @staticmethod
     def decode(data: bytes):
@@ -52,15 +52,15 @@ class initialize_t(object):
     @staticmethod
     def _decode_one(buf):
         self = initialize_t()
-        self.id = struct.unpack(">b", buf.read(1))[0]
-        self.position = struct.unpack('>2h', buf.read(4))
-        self.boundary = struct.unpack('>2h', buf.read(4))
+        self.id = struct.unpack(">i", buf.read(4))[0]
+        self.position = struct.unpack('>2i', buf.read(8))
+        self.boundary = struct.unpack('>2i', buf.read(8))
         return self
 
     @staticmethod
     def _get_hash_recursive(parents):
         if initialize_t in parents: return 0
-        tmphash = (0xe7828758a3598502) & 0xffffffffffffffff
+        tmphash = (0xe1e2169fff748dc) & 0xffffffffffffffff
         tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
         return tmphash
     _packed_fingerprint = None
@@ -0,0 +1,76 @@
+"""LCM type definitions
+This file automatically generated by lcm.
+DO NOT MODIFY BY HAND!!!!
+"""
+
+
+from io import BytesIO
+import struct
+
+class moved_batch_t(object):
+    """ Many move reports coalesced into one packet. Entries apply in order and an id may appear more than once. """
+
+    __slots__ = ["count", "ids", "new_positions"]
+
+    __typenames__ = ["int32_t", "int32_t", "int32_t"]
+
+    __dimensions__ = [None, ["count"], ["count", 2]]
+
+    def __init__(self):
+        self.count = 0
+        """ LCM Type: int32_t """
+        self.ids = []
+        """ LCM Type: int32_t[count] """
+        self.new_positions = []
+        """ LCM Type: int32_t[count][2] """
+
+    def encode(self):
+        buf = BytesIO()
+        buf.write(moved_batch_t._get_packed_fingerprint())
+        self._encode_one(buf)
+        return buf.getvalue()
+
+    def _encode_one(self, buf):
+        buf.write(struct.pack(">i", self.count))
+        buf.write(struct.pack('>%di' % self.count, *self.ids[:self.count]))
+        for i0 in range(self.count):
+            buf.write(struct.pack('>2i', *self.new_positions[i0][:2]))
+
+    @staticmethod
+    def decode(data: bytes):
+        if hasattr(data, 'read'):
+            buf = data
+        else:
+            buf = BytesIO(data)
+        if buf.read(8) != moved_batch_t._get_packed_fingerprint():
+            raise ValueError("Decode error")
+        return moved_batch_t._decode_one(buf)
+
+    @staticmethod
+    def _decode_one(buf):
+        self = moved_batch_t()
+        self.count = struct.unpack(">i", buf.read(4))[0]
+        self.ids = struct.unpack('>%di' % self.count, buf.read(self.count * 4))
+        self.new_positions = []
+        for i0 in range(self.count):
+            self.new_positions.append(struct.unpack('>2i', buf.read(8)))
+        return self
+
+    @staticmethod
+    def _get_hash_recursive(parents):
+        if moved_batch_t in parents: return 0
+        tmphash = (0xe0bf7c0a01c6c102) & 0xffffffffffffffff
+        tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
+        return tmphash
+    _packed_fingerprint = None
+
+    @staticmethod
+    def _get_packed_fingerprint():
+        if moved_batch_t._packed_fingerprint is None:
+            moved_batch_t._packed_fingerprint = struct.pack(">Q", moved_batch_t._get_hash_recursive([]))
+        return moved_batch_t._packed_fingerprint
+
+    def get_hash(self):
+        """Get the LCM hash of the struct"""
+        return struct.unpack(">Q", moved_batch_t._get_packed_fingerprint())[0]
+
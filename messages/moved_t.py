@@ -10,17 +10,21 @@ import struct
 class moved_t(object):
     """ Report move operations. This comes with the ID and a new position. """
 
-    __slots__ = ["id", "new_position"]
+    __slots__ = ["id", "new_position", "seq", "send_time_ns"]
 
-    __typenames__ = ["int8_t", "int16_t"]
+    __typenames__ = ["int32_t", "int32_t", "int32_t", "int64_t"]
 
-    __dimensions__ = [None, [2]]
+    __dimensions__ = [None, [2], None, None]
 
     def __init__(self):
         self.id = 0
-        """ LCM Type: int8_t """
+        """ LCM Type: int32_t """
         self.new_position = [ 0 for dim0 in range(2) ]
-        """ LCM Type: int16_t[2] """
+        """ LCM Type: int32_t[2] """
+        self.seq = 0
+        """ LCM Type: int32_t """
+        self.send_time_ns = 0
+        """ LCM Type: int64_t """
 
     def encode(self):
         buf = BytesIO()
@@ -29,8 +33,9 @@ class moved_t(object):
         return buf.getvalue()
 
     def _encode_one(self, buf):
-        buf.write(struct.pack(">b", self.id))
-        buf.write(struct.pack('>2h', *self.new_position[:2]))
+        buf.write(struct.pack(">i", self.id))
+        buf.write(struct.pack('>2i', *self.new_position[:2]))
+        buf.write(struct.pack(">iq", self.seq, self.send_time_ns))
 
     @staticmethod
     def decode(data: bytes):
@@ -45,14 +50,15 @@ class moved_t(object):
     @staticmethod
     def _decode_one(buf):
         self = moved_t()
-        self.id = struct.unpack(">b", buf.read(1))[0]
-        self.new_position = struct.unpack('>2h', buf.read(4))
+        self.id = struct.unpack(">i", buf.read(4))[0]
+        self.new_position = struct.unpack('>2i', buf.read(8))
+        self.seq, self.send_time_ns = struct.unpack(">iq", buf.read(12))
         return self
 
     @staticmethod
     def _get_hash_recursive(parents):
         if moved_t in parents: return 0
-        tmphash = (0xf1ce5210d53f1a26) & 0xffffffffffffffff
+        tmphash = (0xfa31d98542d158b9) & 0xffffffffffffffff
         tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
         return tmphash
     _packed_fingerprint = None
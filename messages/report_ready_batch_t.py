@@ -0,0 +1,80 @@
+"""LCM type definitions
+This file automatically generated by lcm.
+DO NOT MODIFY BY HAND!!!!
+"""
+
+
+from io import BytesIO
+import struct
+
+class report_ready_batch_t(object):
+    """ Ready reports for many agents at once, from an agent host. Same meaning as one report_ready_t per entry. """
+
+    __slots__ = ["schema_version", "count", "ids", "positions"]
+
+    __typenames__ = ["int8_t", "int32_t", "int32_t", "int32_t"]
+
+    __dimensions__ = [None, None, ["count"], ["count", 2]]
+
+    SCHEMA_VERSION = 3
+
+    def __init__(self):
+        self.schema_version = 0
+        """ LCM Type: int8_t """
+        self.count = 0
+        """ LCM Type: int32_t """
+        self.ids = []
+        """ LCM Type: int32_t[count] """
+        self.positions = []
+        """ LCM Type: int32_t[count][2] """
+
+    def encode(self):
+        buf = BytesIO()
+        buf.write(report_ready_batch_t._get_packed_fingerprint())
+        self._encode_one(buf)
+        return buf.getvalue()
+
+    def _encode_one(self, buf):
+        buf.write(struct.pack(">bi", self.schema_version, self.count))
+        buf.write(struct.pack('>%di' % self.count, *self.ids[:self.count]))
+        for i0 in range(self.count):
+            buf.write(struct.pack('>2i', *self.positions[i0][:2]))
+
+    @staticmethod
+    def decode(data: bytes):
+        if hasattr(data, 'read'):
+            buf = data
+        else:
+            buf = BytesIO(data)
+        if buf.read(8) != report_ready_batch_t._get_packed_fingerprint():
+            raise ValueError("Decode error")
+        return report_ready_batch_t._decode_one(buf)
+
+    @staticmethod
+    def _decode_one(buf):
+        self = report_ready_batch_t()
+        self.schema_version, self.count = struct.unpack(">bi", buf.read(5))
+        self.ids = struct.unpack('>%di' % self.count, buf.read(self.count * 4))
+        self.positions = []
+        for i0 in range(self.count):
+            self.positions.append(struct.unpack('>2i', buf.read(8)))
+        return self
+
+    @staticmethod
+    def _get_hash_recursive(parents):
+        if report_ready_batch_t in parents: return 0
+        tmphash = (0xf809d2a447d43ee0) & 0xffffffffffffffff
+        tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
+        return tmphash
+    _packed_fingerprint = None
+
+    @staticmethod
+    def _get_packed_fingerprint():
+        if report_ready_batch_t._packed_fingerprint is None:
+            report_ready_batch_t._packed_fingerprint = struct.pack(">Q", report_ready_batch_t._get_hash_recursive([]))
+        return report_ready_batch_t._packed_fingerprint
+
+    def get_hash(self):
+        """Get the LCM hash of the struct"""
+        return struct.unpack(">Q", report_ready_batch_t._get_packed_fingerprint())[0]
+
@@ -12,20 +12,24 @@ class report_ready_t(object):
     
     Clients -> Server
     
-    Sent _from_ nodes when they've finished initialization.
+    Sent _from_ nodes when they've finished initialization, and resent with backoff until the game starts.
     """
 
-    __slots__ = ["id", "position"]
+    __slots__ = ["schema_version", "id", "position"]
 
-    __typenames__ = ["int8_t", "int16_t"]
+    __typenames__ = ["int8_t", "int32_t", "int32_t"]
 
-    __dimensions__ = [None, [2]]
+    __dimensions__ = [None, None, [2]]
+
+    SCHEMA_VERSION = 3
 
     def __init__(self):
-        self.id = 0
+        self.schema_version = 0
         """ LCM Type: int8_t """
+        self.id = 0
+        """ LCM Type: int32_t """
         self.position = [ 0 for dim0 in range(2) ]
-        """ LCM Type: int16_t[2] """
+        """ LCM Type: int32_t[2] """
 
     def encode(self):
         buf = BytesIO()
@@ -34,8 +38,8 @@ class report_ready_t(object):
         return buf.getvalue()
 
     def _encode_one(self, buf):
-        buf.write(struct.pack(">b", self.id))
-        buf.write(struct.pack('>2h', *self.position[:2]))
+        buf.write(struct.pack(">bi", self.schema_version, self.id))
+        buf.write(struct.pack('>2i', *self.position[:2]))
 
     @staticmethod
     def decode(data: bytes):
@@ -50,14 +54,14 @@ class report_ready_t(object):
     @staticmethod
     def _decode_one(buf):
         self = report_ready_t()
-        self.id = struct.unpack(">b", buf.read(1))[0]
-        self.position = struct.unpack('>2h', buf.read(4))
+        self.schema_version, self.id = struct.unpack(">bi", buf.read(5))
+        self.position = struct.unpack('>2i', buf.read(8))
         return self
 
     @staticmethod
     def _get_hash_recursive(parents):
         if report_ready_t in parents: return 0
-        tmphash = (0xb6de5cfb1fd39e02) & 0xffffffffffffffff
+        tmphash = (0xd3b370ea0bb4b593) & 0xffffffffffffffff
         tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
         return tmphash
     _packed_fingerprint = None
@@ -8,23 +8,32 @@ from io import BytesIO
 import struct
 
 class report_status_t(object):
-    """ Used for intermittent checkin to make sure everyone is on the same page. """
+    """
+    Sent when a node's state disagrees with the game node's sync digest, so the game node can repair it.
+    Also sent straight back on receiving a freeze, echoing its timestamps. The echo fields are zero otherwise.
+    """
 
-    __slots__ = ["id", "position", "game_started", "frozen"]
+    __slots__ = ["id", "position", "game_started", "frozen", "echo_send_time_ns", "echo_cause_time_ns", "received_time_ns"]
 
-    __typenames__ = ["int8_t", "int16_t", "boolean", "boolean"]
+    __typenames__ = ["int32_t", "int32_t", "boolean", "boolean", "int64_t", "int64_t", "int64_t"]
 
-    __dimensions__ = [None, [2], None, None]
+    __dimensions__ = [None, [2], None, None, None, None, None]
 
     def __init__(self):
         self.id = 0
-        """ LCM Type: int8_t """
+        """ LCM Type: int32_t """
         self.position = [ 0 for dim0 in range(2) ]
-        """ LCM Type: int16_t[2] """
+        """ LCM Type: int32_t[2] """
         self.game_started = False
         """ LCM Type: boolean """
         self.frozen = False
         """ LCM Type: boolean """
+        self.echo_send_time_ns = 0
+        """ LCM Type: int64_t """
+        self.echo_cause_time_ns = 0
+        """ LCM Type: int64_t """
+        self.received_time_ns = 0
+        """ LCM Type: int64_t """
 
     def encode(self):
         buf = BytesIO()
@@ -33,9 +42,9 @@ class report_status_t(object):
         return buf.getvalue()
 
     def _encode_one(self, buf):
-        buf.write(struct.pack(">b", self.id))
-        buf.write(struct.pack('>2h', *self.position[:2]))
-        buf.write(struct.pack(">bb", self.game_started, self.frozen))
+        buf.write(struct.pack(">i", self.id))
+        buf.write(struct.pack('>2i', *self.position[:2]))
+        buf.write(struct.pack(">bbqqq", self.game_started, self.frozen, self.echo_send_time_ns, self.echo_cause_time_ns, self.received_time_ns))
 
     @staticmethod
     def decode(data: bytes):
@@ -50,16 +59,17 @@ class report_status_t(object):
     @staticmethod
     def _decode_one(buf):
         self = report_status_t()
-        self.id = struct.unpack(">b", buf.read(1))[0]
-        self.position = struct.unpack('>2h', buf.read(4))
+        self.id = struct.unpack(">i", buf.read(4))[0]
+        self.position = struct.unpack('>2i', buf.read(8))
         self.game_started = bool(struct.unpack('b', buf.read(1))[0])
         self.frozen = bool(struct.unpack('b', buf.read(1))[0])
+        self.echo_send_time_ns, self.echo_cause_time_ns, self.received_time_ns = struct.unpack(">qqq", buf.read(24))
         return self
 
     @staticmethod
     def _get_hash_recursive(parents):
         if report_status_t in parents: return 0
-        tmphash = (0x395e58f303a288b7) & 0xffffffffffffffff
+        tmphash = (0xb1ce2395b57eb2ac) & 0xffffffffffffffff
         tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
         return tmphash
     _packed_fingerprint = None
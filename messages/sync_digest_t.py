@@ -0,0 +1,81 @@
+"""LCM type definitions
+This file automatically generated by lcm.
+DO NOT MODIFY BY HAND!!!!
+"""
+
+
+from io import BytesIO
+import struct
+
+class sync_digest_t(object):
+    """
+    The game node's view of who is frozen, broadcast every SYNC_DIGEST_PERIOD once the game is on. Bit i of `frozen`
+    is hider i, least significant bit first. Nodes compare it with their own state and report only where they differ.
+    `checksum` is the crc32 of `frozen`; a digest that doesn't match it is dropped.
+    """
+
+    __slots__ = ["seq", "node_count", "frozen_size", "frozen", "checksum"]
+
+    __typenames__ = ["int64_t", "int32_t", "int32_t", "byte", "int64_t"]
+
+    __dimensions__ = [None, None, None, ["frozen_size"], None]
+
+    def __init__(self):
+        self.seq = 0
+        """ LCM Type: int64_t """
+        self.node_count = 0
+        """ LCM Type: int32_t """
+        self.frozen_size = 0
+        """ LCM Type: int32_t """
+        self.frozen = b""
+        """ LCM Type: byte[frozen_size] """
+        self.checksum = 0
+        """ LCM Type: int64_t """
+
+    def encode(self):
+        buf = BytesIO()
+        buf.write(sync_digest_t._get_packed_fingerprint())
+        self._encode_one(buf)
+        return buf.getvalue()
+
+    def _encode_one(self, buf):
+        buf.write(struct.pack(">qii", self.seq, self.node_count, self.frozen_size))
+        buf.write(bytearray(self.frozen[:self.frozen_size]))
+        buf.write(struct.pack(">q", self.checksum))
+
+    @staticmethod
+    def decode(data: bytes):
+        if hasattr(data, 'read'):
+            buf = data
+        else:
+            buf = BytesIO(data)
+        if buf.read(8) != sync_digest_t._get_packed_fingerprint():
+            raise ValueError("Decode error")
+        return sync_digest_t._decode_one(buf)
+
+    @staticmethod
+    def _decode_one(buf):
+        self = sync_digest_t()
+        self.seq, self.node_count, self.frozen_size = struct.unpack(">qii", buf.read(16))
+        self.frozen = buf.read(self.frozen_size)
+        self.checksum = struct.unpack(">q", buf.read(8))[0]
+        return self
+
+    @staticmethod
+    def _get_hash_recursive(parents):
+        if sync_digest_t in parents: return 0
+        tmphash = (0x2501bfc3e93314c5) & 0xffffffffffffffff
+        tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
+        return tmphash
+    _packed_fingerprint = None
+
+    @staticmethod
+    def _get_packed_fingerprint():
+        if sync_digest_t._packed_fingerprint is None:
+            sync_digest_t._packed_fingerprint = struct.pack(">Q", sync_digest_t._get_hash_recursive([]))
+        return sync_digest_t._packed_fingerprint
+
+    def get_hash(self):
+        """Get the LCM hash of the struct"""
+        return struct.unpack(">Q", sync_digest_t._get_packed_fingerprint())[0]
+
@@ -0,0 +1,79 @@
+"""LCM type definitions
+This file automatically generated by lcm.
+DO NOT MODIFY BY HAND!!!!
+"""
+
+
+from io import BytesIO
+import struct
+
+class tick_ack_t(object):
+    """ Acknowledges a tick_t once the sender has finished with it. Agent hosts acknowledge for all their agents at once. """
+
+    __slots__ = ["tick", "phase", "moves_sent", "count", "ids"]
+
+    __typenames__ = ["int32_t", "int8_t", "int32_t", "int32_t", "int32_t"]
+
+    __dimensions__ = [None, None, None, None, ["count"]]
+
+    def __init__(self):
+        self.tick = 0
+        """ LCM Type: int32_t """
+        self.phase = 0
+        """ LCM Type: int8_t """
+        self.moves_sent = 0
+        """ LCM Type: int32_t """
+        self.count = 0
+        """
+        Moves the sender has reported over the whole game.
+        LCM Type: int32_t
+        """
+
+        self.ids = []
+        """ LCM Type: int32_t[count] """
+
+    def encode(self):
+        buf = BytesIO()
+        buf.write(tick_ack_t._get_packed_fingerprint())
+        self._encode_one(buf)
+        return buf.getvalue()
+
+    def _encode_one(self, buf):
+        buf.write(struct.pack(">ibii", self.tick, self.phase, self.moves_sent, self.count))
+        buf.write(struct.pack('>%di' % self.count, *self.ids[:self.count]))
+
+    @staticmethod
+    def decode(data: bytes):
+        if hasattr(data, 'read'):
+            buf = data
+        else:
+            buf = BytesIO(data)
+        if buf.read(8) != tick_ack_t._get_packed_fingerprint():
+            raise ValueError("Decode error")
+        return tick_ack_t._decode_one(buf)
+
+    @staticmethod
+    def _decode_one(buf):
+        self = tick_ack_t()
+        self.tick, self.phase, self.moves_sent, self.count = struct.unpack(">ibii", buf.read(13))
+        self.ids = struct.unpack('>%di' % self.count, buf.read(self.count * 4))
+        return self
+
+    @staticmethod
+    def _get_hash_recursive(parents):
+        if tick_ack_t in parents: return 0
+        tmphash = (0x5a8fd74c816e5247) & 0xffffffffffffffff
+        tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
+        return tmphash
+    _packed_fingerprint = None
+
+    @staticmethod
+    def _get_packed_fingerprint():
+        if tick_ack_t._packed_fingerprint is None:
+            tick_ack_t._packed_fingerprint = struct.pack(">Q", tick_ack_t._get_hash_recursive([]))
+        return tick_ack_t._packed_fingerprint
+
+    def get_hash(self):
+        """Get the LCM hash of the struct"""
+        return struct.unpack(">Q", tick_ack_t._get_packed_fingerprint())[0]
+
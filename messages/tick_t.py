@@ -0,0 +1,69 @@
+"""LCM type definitions
+This file automatically generated by lcm.
+DO NOT MODIFY BY HAND!!!!
+"""
+
+
+from io import BytesIO
+import struct
+
+class tick_t(object):
+    """ Lockstep virtual time (game.py --virtual-clock). Hiders move on phase 0 ticks and the 'it' on phase 1 ticks. """
+
+    __slots__ = ["tick", "phase", "moves_total"]
+
+    __typenames__ = ["int32_t", "int8_t", "int32_t"]
+
+    __dimensions__ = [None, None, None]
+
+    def __init__(self):
+        self.tick = 0
+        """ LCM Type: int32_t """
+        self.phase = 0
+        """ LCM Type: int8_t """
+        self.moves_total = 0
+        """ LCM Type: int32_t """
+
+    def encode(self):
+        buf = BytesIO()
+        buf.write(tick_t._get_packed_fingerprint())
+        self._encode_one(buf)
+        return buf.getvalue()
+
+    def _encode_one(self, buf):
+        buf.write(struct.pack(">ibi", self.tick, self.phase, self.moves_total))
+
+    @staticmethod
+    def decode(data: bytes):
+        if hasattr(data, 'read'):
+            buf = data
+        else:
+            buf = BytesIO(data)
+        if buf.read(8) != tick_t._get_packed_fingerprint():
+            raise ValueError("Decode error")
+        return tick_t._decode_one(buf)
+
+    @staticmethod
+    def _decode_one(buf):
+        self = tick_t()
+        self.tick, self.phase, self.moves_total = struct.unpack(">ibi", buf.read(9))
+        return self
+
+    @staticmethod
+    def _get_hash_recursive(parents):
+        if tick_t in parents: return 0
+        tmphash = (0x3a31e92b7048fc66) & 0xffffffffffffffff
+        tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
+        return tmphash
+    _packed_fingerprint = None
+
+    @staticmethod
+    def _get_packed_fingerprint():
+        if tick_t._packed_fingerprint is None:
+            tick_t._packed_fingerprint = struct.pack(">Q", tick_t._get_hash_recursive([]))
+        return tick_t._packed_fingerprint
+
+    def get_hash(self):
+        """Get the LCM hash of the struct"""
+        return struct.unpack(">Q", tick_t._get_packed_fingerprint())[0]
+
@@ -0,0 +1,86 @@
+"""LCM type definitions
+This file automatically generated by lcm.
+DO NOT MODIFY BY HAND!!!!
+"""
+
+
+from io import BytesIO
+import struct
+
+class world_delta_t(object):
+    """
+    Changes since the previous delta: the latest cell of every agent that moved, and the hiders tagged. Sequence
+    numbers run 1, 2, 3... without gaps, so a receiver that sees a jump knows to wait for the next snapshot.
+    """
+
+    __slots__ = ["seq", "count", "ids", "cells", "frozen_count", "frozen_ids"]
+
+    __typenames__ = ["int32_t", "int32_t", "int32_t", "int64_t", "int32_t", "int32_t"]
+
+    __dimensions__ = [None, None, ["count"], ["count"], None, ["frozen_count"]]
+
+    def __init__(self):
+        self.seq = 0
+        """ LCM Type: int32_t """
+        self.count = 0
+        """ LCM Type: int32_t """
+        self.ids = []
+        """ LCM Type: int32_t[count] """
+        self.cells = []
+        """ LCM Type: int64_t[count] """
+        self.frozen_count = 0
+        """ LCM Type: int32_t """
+        self.frozen_ids = []
+        """ LCM Type: int32_t[frozen_count] """
+
+    def encode(self):
+        buf = BytesIO()
+        buf.write(world_delta_t._get_packed_fingerprint())
+        self._encode_one(buf)
+        return buf.getvalue()
+
+    def _encode_one(self, buf):
+        buf.write(struct.pack(">ii", self.seq, self.count))
+        buf.write(struct.pack('>%di' % self.count, *self.ids[:self.count]))
+        buf.write(struct.pack('>%dq' % self.count, *self.cells[:self.count]))
+        buf.write(struct.pack(">i", self.frozen_count))
+        buf.write(struct.pack('>%di' % self.frozen_count, *self.frozen_ids[:self.frozen_count]))
+
+    @staticmethod
+    def decode(data: bytes):
+        if hasattr(data, 'read'):
+            buf = data
+        else:
+            buf = BytesIO(data)
+        if buf.read(8) != world_delta_t._get_packed_fingerprint():
+            raise ValueError("Decode error")
+        return world_delta_t._decode_one(buf)
+
+    @staticmethod
+    def _decode_one(buf):
+        self = world_delta_t()
+        self.seq, self.count = struct.unpack(">ii", buf.read(8))
+        self.ids = struct.unpack('>%di' % self.count, buf.read(self.count * 4))
+        self.cells = struct.unpack('>%dq' % self.count, buf.read(self.count * 8))
+        self.frozen_count = struct.unpack(">i", buf.read(4))[0]
+        self.frozen_ids = struct.unpack('>%di' % self.frozen_count, buf.read(self.frozen_count * 4))
+        return self
+
+    @staticmethod
+    def _get_hash_recursive(parents):
+        if world_delta_t in parents: return 0
+        tmphash = (0x862b60275f4f82ec) & 0xffffffffffffffff
+        tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
+        return tmphash
+    _packed_fingerprint = None
+
+    @staticmethod
+    def _get_packed_fingerprint():
+        if world_delta_t._packed_fingerprint is None:
+            world_delta_t._packed_fingerprint = struct.pack(">Q", world_delta_t._get_hash_recursive([]))
+        return world_delta_t._packed_fingerprint
+
+    def get_hash(self):
+        """Get the LCM hash of the struct"""
+        return struct.unpack(">Q", world_delta_t._get_packed_fingerprint())[0]
+
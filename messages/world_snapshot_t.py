@@ -0,0 +1,94 @@
+"""LCM type definitions
+This file automatically generated by lcm.
+DO NOT MODIFY BY HAND!!!!
+"""
+
+
+from io import BytesIO
+import struct
+
+class world_snapshot_t(object):
+    """
+    World state for observers that join late or lose track (game.py --snapshot-period). Every known agent, sorted by
+    id. Positions are packed into one cell index each, y * board[0] + x, in 64 bits since a board with int32 sides
+    can have more cells than an int32 holds. Bit i of `frozen` (least significant bit first) is set when ids[i] has
+    been tagged. `seq` is the last world_delta_t folded in, so apply deltas after it.
+    """
+
+    __slots__ = ["seq", "board", "count", "ids", "cells", "frozen_size", "frozen"]
+
+    __typenames__ = ["int32_t", "int32_t", "int32_t", "int32_t", "int64_t", "int32_t", "byte"]
+
+    __dimensions__ = [None, [2], None, ["count"], ["count"], None, ["frozen_size"]]
+
+    def __init__(self):
+        self.seq = 0
+        """ LCM Type: int32_t """
+        self.board = [ 0 for dim0 in range(2) ]
+        """ LCM Type: int32_t[2] """
+        self.count = 0
+        """ LCM Type: int32_t """
+        self.ids = []
+        """ LCM Type: int32_t[count] """
+        self.cells = []
+        """ LCM Type: int64_t[count] """
+        self.frozen_size = 0
+        """ LCM Type: int32_t """
+        self.frozen = b""
+        """ LCM Type: byte[frozen_size] """
+
+    def encode(self):
+        buf = BytesIO()
+        buf.write(world_snapshot_t._get_packed_fingerprint())
+        self._encode_one(buf)
+        return buf.getvalue()
+
+    def _encode_one(self, buf):
+        buf.write(struct.pack(">i", self.seq))
+        buf.write(struct.pack('>2i', *self.board[:2]))
+        buf.write(struct.pack(">i", self.count))
+        buf.write(struct.pack('>%di' % self.count, *self.ids[:self.count]))
+        buf.write(struct.pack('>%dq' % self.count, *self.cells[:self.count]))
+        buf.write(struct.pack(">i", self.frozen_size))
+        buf.write(bytearray(self.frozen[:self.frozen_size]))
+
+    @staticmethod
+    def decode(data: bytes):
+        if hasattr(data, 'read'):
+            buf = data
+        else:
+            buf = BytesIO(data)
+        if buf.read(8) != world_snapshot_t._get_packed_fingerprint():
+            raise ValueError("Decode error")
+        return world_snapshot_t._decode_one(buf)
+
+    @staticmethod
+    def _decode_one(buf):
+        self = world_snapshot_t()
+        self.seq = struct.unpack(">i", buf.read(4))[0]
+        self.board = struct.unpack('>2i', buf.read(8))
+        self.count = struct.unpack(">i", buf.read(4))[0]
+        self.ids = struct.unpack('>%di' % self.count, buf.read(self.count * 4))
+        self.cells = struct.unpack('>%dq' % self.count, buf.read(self.count * 8))
+        self.frozen_size = struct.unpack(">i", buf.read(4))[0]
+        self.frozen = buf.read(self.frozen_size)
+        return self
+
+    @staticmethod
+    def _get_hash_recursive(parents):
+        if world_snapshot_t in parents: return 0
+        tmphash = (0x2df696984280f4c9) & 0xffffffffffffffff
+        tmphash  = (((tmphash<<1)&0xffffffffffffffff) + (tmphash>>63)) & 0xffffffffffffffff
+        return tmphash
+    _packed_fingerprint = None
+
+    @staticmethod
+    def _get_packed_fingerprint():
+        if world_snapshot_t._packed_fingerprint is None:
+            world_snapshot_t._packed_fingerprint = struct.pack(">Q", world_snapshot_t._get_hash_recursive([]))
+        return world_snapshot_t._packed_fingerprint
+
+    def get_hash(self):
+        """Get the LCM hash of the struct"""
+        return struct.unpack(">Q", world_snapshot_t._get_packed_fingerprint())[0]
+
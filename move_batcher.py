@@ -0,0 +1,63 @@
+"""
+Coalesces move reports into moved_batch_t packets.
+One datagram and one subscriber callback then cover many moves, instead of one per agent per tick.
+
+Moves are held until the batch window has passed since the first buffered move, or the batch is full.
+"""
+
+import time
+
+from channels import Channels
+from messages import moved_batch_t
+
+
+MAX_BATCH_SIZE = 4096  # 8 bytes of position and 4 of id per entry keeps a full batch around 48kB.
+
+
+class MoveBatcher:
+    def __init__(self, publish, window: float, max_batch_size: int = MAX_BATCH_SIZE):
+        """`publish` is a Node.publish-style callable taking (channel, msg)."""
+        assert max_batch_size > 0
+        self.publish = publish
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.ids = list()
+        self.positions = list()
+        self.first_buffered = None
+        self.batches_sent = 0
+        self.moves_sent = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, node_id: int, position: tuple[int, int]):
+        if self.first_buffered is None:
+            self.first_buffered = time.monotonic()
+        self.ids.append(node_id)
+        self.positions.append(position)
+        if len(self.ids) >= self.max_batch_size:
+            self.flush()
+
+    def maybe_flush(self, now: float | None = None, lookahead: float = 0.0):
+        """Flush if the oldest buffered move has waited out the window, or would have by `now + lookahead`.
+        Callers that only get control back once per tick pass the tick length as the lookahead."""
+        if self.first_buffered is None:
+            return
+        if now is None:
+            now = time.monotonic()
+        if now + lookahead - self.first_buffered >= self.window:
+            self.flush()
+
+    def flush(self):
+        if not self.ids:
+            return
+        msg = moved_batch_t()
+        msg.count = len(self.ids)
+        msg.ids = self.ids
+        msg.new_positions = self.positions
+        self.publish(Channels.REPORT_MOVE_BATCH, msg)
+        self.batches_sent += 1
+        self.moves_sent += msg.count
+        self.ids = list()
+        self.positions = list()
+        self.first_buffered = None
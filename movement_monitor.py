@@ -7,9 +7,17 @@ Test with `python -m unittest tests.test_movement_monitor.TestMovementMonitor`
 """
 
 import copy
+from array import array
+from collections import deque
 
 from channels import Channels
-from messages import moved_t
+from fast_codec import MOVED_CODEC, decode_moved_batch
+from messages import world_delta_t, world_snapshot_t
+from regions import ALL_MOVES
+from worldstate import MAX_HELD_DELTAS, unpack_cells, unpack_flags
+
+
+MOVEMENT_BACKENDS = ("dict", "grid")
 
 
 class MovementMonitor:
@@ -20,10 +28,45 @@ class MovementMonitor:
         self.node_to_position = dict()
         self.position_to_nodes = dict()
         self.last_movers = set()  # Track which ones have given us move operations since the last update.
+        self.move_listeners = list()  # Called with (node_id, position) after every position change.
+        self.report_listeners = list()  # Called with (node_id, seq, send_time_ns) for every moved_t received.
+        self.moves_received = 0  # Moves that arrived over the bus, batched or not. Lockstep play waits on this.
+        self.move_journal = None  # Ordered (node_id, old, new) since the last drain, once enabled.
+        self.move_filter = None  # Optional filter(node_id, position) -> bool. Reported moves it rejects are dropped.
+        # Following the GameNode's world state instead of move reports. See worldstate.py.
+        self.world_seq = None  # Last delta applied, or None until a snapshot bootstraps us.
+        self.world_width = None
+        self.frozen_ids = set()  # Hiders the snapshots and deltas say are tagged.
+        self.held_deltas = deque(maxlen=MAX_HELD_DELTAS)  # Deltas that arrived while we were out of sync.
+        self.world_resyncs = 0  # Times a gap in the deltas sent us back to waiting for a snapshot.
+
+    def enable_move_journal(self):
+        """Start recording every move in order so a consumer can replay them with drain_moves()."""
+        if self.move_journal is None:
+            self.move_journal = deque()
+
+    def drain_moves(self) -> list[tuple[int, tuple[int, int] | None, tuple[int, int]]]:
+        """Return the (node_id, old_position, new_position) moves since the last drain, oldest first.
+        old_position is None for a node's first placement."""
+        moves = list()
+        # popleft and append are atomic, so the LCM thread can keep appending while we drain.
+        while self.move_journal:
+            moves.append(self.move_journal.popleft())
+        return moves
+
+    def add_move_listener(self, listener):
+        """Call `listener(node_id, position)` whenever a node's position is set.
+        Runs on whichever thread applied the move, which is the LCM thread for reported moves."""
+        self.move_listeners.append(listener)
+
+    def add_report_listener(self, listener):
+        """Call `listener(node_id, seq, send_time_ns)` for every moved_t received, before it is applied.
+        Batched moves carry no sequence numbers or timestamps and don't reach these listeners."""
+        self.report_listeners.append(listener)
     
     def set_node_position(self, node_id: int, position: tuple[int, int], clear_previous: bool = True):
+        previous_position = self.node_to_position.get(node_id)
         if clear_previous:
-            previous_position = self.node_to_position.get(node_id)
             if previous_position and previous_position in self.position_to_nodes:
                 self.position_to_nodes[previous_position].remove(node_id)
                 if len(self.position_to_nodes[previous_position]) == 0:
@@ -35,7 +78,27 @@ class MovementMonitor:
         self.position_to_nodes[position].append(node_id)
         # And track that this has moved for reporting purposes:
         self.last_movers.add(node_id)
+        if self.move_journal is not None:
+            self.move_journal.append((node_id, previous_position, position))
+        for listener in self.move_listeners:
+            listener(node_id, position)
     
+    def set_node_positions(self, node_ids, positions):
+        """Apply many moves in order."""
+        for node_id, position in zip(node_ids, positions):
+            self.set_node_position(node_id, position)
+
+    def remove_node(self, node_id: int):
+        """Forget a node entirely, as when it walks out of the region this monitor covers."""
+        position = self.node_to_position.pop(node_id, None)
+        if position is not None:
+            self.position_to_nodes[position].remove(node_id)
+            if not self.position_to_nodes[position]:
+                del self.position_to_nodes[position]
+
+    def known_nodes(self) -> set[int]:
+        return set(self.node_to_position)
+
     def get_nodes_at_position(self, position: tuple[int, int]) -> list[int]:
         if position not in self.position_to_nodes:
             return []
@@ -51,10 +114,233 @@ class MovementMonitor:
         return ret_last_movers
 
     # LC Interface:
-    def register_listeners(self, lc_ref):
-        # Call this in on_start in a node.
-        lc_ref.subscribe(Channels.REPORT_MOVE, self.process_move_report)
+    def register_listeners(self, lc_ref) -> list:
+        # Call this in on_start in a node. Returns the subscriptions so the node can drop them when it stops.
+        # Covers the regional move channels too, so we hear every move whether or not move regions are on.
+        return [
+            lc_ref.subscribe(ALL_MOVES, self.process_move_report),
+            lc_ref.subscribe(Channels.REPORT_MOVE_BATCH, self.process_move_batch),
+        ]
+
+    def register_world_listeners(self, lc_ref) -> list:
+        """Follow the GameNode's snapshots and deltas instead of every move. Use instead of register_listeners."""
+        return [
+            lc_ref.subscribe(Channels.WORLD_SNAPSHOT, self.process_world_snapshot),
+            lc_ref.subscribe(Channels.WORLD_DELTA, self.process_world_delta),
+        ]
+
+    def process_world_snapshot(self, channel, data):
+        self.apply_snapshot(world_snapshot_t.decode(data))
+
+    def process_world_delta(self, channel, data):
+        self.apply_delta(world_delta_t.decode(data))
+
+    def apply_snapshot(self, msg: world_snapshot_t):
+        """Replace what we know with the snapshot, then apply any held deltas that come after it."""
+        if self.world_seq is not None and msg.seq <= self.world_seq:
+            return  # We're already past it.
+        self.world_width = msg.board[0]
+        positions = unpack_cells(msg.cells, self.world_width)
+        for node_id in self.known_nodes() - set(msg.ids):
+            self.remove_node(node_id)
+        for node_id, position in zip(msg.ids, positions):
+            if self.get_node_position(node_id) != position:
+                self.set_node_position(node_id, position)
+        self.frozen_ids = {node_id for node_id, frozen in zip(msg.ids, unpack_flags(msg.frozen, msg.count)) if frozen}
+        self.world_seq = msg.seq
+        held = sorted(self.held_deltas, key=lambda delta: delta.seq)
+        self.held_deltas.clear()
+        for delta in held:
+            self.apply_delta(delta)
+
+    def apply_delta(self, msg: world_delta_t):
+        if self.world_seq is None:
+            self.held_deltas.append(msg)
+            return
+        if msg.seq <= self.world_seq:
+            return  # Already covered by a snapshot, or a duplicate.
+        if msg.seq != self.world_seq + 1:
+            # We missed one. Its moves are lost to us until the next snapshot.
+            self.world_seq = None
+            self.world_resyncs += 1
+            self.held_deltas.append(msg)
+            return
+        self.set_node_positions(msg.ids, unpack_cells(msg.cells, self.world_width))
+        self.frozen_ids.update(msg.frozen_ids)
+        self.world_seq = msg.seq
 
     def process_move_report(self, channel, data):
-        msg = moved_t.decode(data)
-        self.set_node_position(msg.id, msg.new_position)
+        # Every subscriber sees every move, so skip building a moved_t and read the fields straight out.
+        node_id, x, y, seq, send_time_ns = MOVED_CODEC.decode(data)
+        for listener in self.report_listeners:
+            listener(node_id, seq, send_time_ns)
+        if self.move_filter is None or self.move_filter(node_id, (x, y)):
+            self.set_node_position(node_id, (x, y))
+        self.moves_received += 1
+
+    def process_move_batch(self, channel, data):
+        node_ids, flat_positions = decode_moved_batch(data)
+        positions = zip(flat_positions[0::2], flat_positions[1::2])
+        if self.move_filter is None:
+            self.set_node_positions(node_ids, positions)
+        else:
+            move_filter = self.move_filter
+            for node_id, position in zip(node_ids, positions):
+                if move_filter(node_id, position):
+                    self.set_node_position(node_id, position)
+        self.moves_received += len(node_ids)
+
+
+class CellOccupants:
+    """A read-only, zero-copy view of the ids in one cell of a GridMovementMonitor.
+    It is live: it reflects moves made after it was handed out."""
+    __slots__ = ("monitor", "cell")
+
+    def __init__(self, monitor: "GridMovementMonitor", cell: int):
+        self.monitor = monitor
+        self.cell = cell
+
+    def __len__(self) -> int:
+        if self.cell < 0:
+            return 0
+        return self.monitor.cell_count[self.cell]
+
+    def __iter__(self):
+        if self.cell < 0:
+            return
+        monitor = self.monitor
+        node_id = monitor.cell_head[self.cell]
+        while node_id >= 0:
+            # The LCM thread may relink a node while we walk. If we land on one that left this cell, stop rather than
+            # wander into its new neighbors. The mover shows up in last_movers, so the next pass sees it.
+            if monitor.node_cell[node_id] != self.cell:
+                return
+            yield node_id
+            node_id = monitor.node_next[node_id]
+
+    def __contains__(self, node_id: int) -> bool:
+        return self.monitor._cell_of(node_id) == self.cell and self.cell >= 0
+
+    def __eq__(self, other) -> bool:
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"CellOccupants({list(self)})"
+
+
+class GridMovementMonitor(MovementMonitor):
+    """Array-backed MovementMonitor for large boards and agent counts.
+    Each cell keeps an occupant count and the head of an intrusive doubly linked list threaded through id-indexed
+    arrays, so a move is O(1), a cell lookup hands back a view instead of a copy, and memory is a fixed
+    handful of int32s per cell and per id."""
+    def __init__(self, board_shape: tuple[int, int]):
+        assert board_shape[0] > 0 and board_shape[1] > 0
+        super().__init__()
+        # The arrays below replace both maps.
+        del self.node_to_position, self.position_to_nodes
+        self.board_shape = board_shape
+        cells = board_shape[0] * board_shape[1]
+        self.cell_head = array("i", [-1]) * cells
+        self.cell_count = array("i", [0]) * cells
+        # Indexed by node id, grown on demand. A cell of -1 means unknown or off the board.
+        self.node_x = array("i")
+        self.node_y = array("i")
+        self.node_cell = array("i")
+        self.node_next = array("i")
+        self.node_prev = array("i")
+        self.node_known = bytearray()
+
+    def remove_node(self, node_id: int):
+        if node_id >= len(self.node_known) or not self.node_known[node_id]:
+            return
+        self._unlink(node_id)
+        self.node_known[node_id] = 0
+
+    def set_node_position(self, node_id: int, position: tuple[int, int], clear_previous: bool = True):
+        # A node can only be linked into one cell, so the previous entry is always cleared.
+        if node_id >= len(self.node_known):
+            self._ensure_capacity(node_id)
+        previous_position = self.get_node_position(node_id)
+        node_cell = self.node_cell
+        if node_cell[node_id] >= 0:
+            self._unlink(node_id)
+        x, y = position
+        self.node_x[node_id] = x
+        self.node_y[node_id] = y
+        self.node_known[node_id] = 1
+        width, height = self.board_shape
+        if 0 <= x < width and 0 <= y < height:
+            cell = y * width + x
+            head = self.cell_head[cell]
+            self.node_next[node_id] = head
+            self.node_prev[node_id] = -1
+            if head >= 0:
+                self.node_prev[head] = node_id
+            self.cell_head[cell] = node_id
+            self.cell_count[cell] += 1
+            node_cell[node_id] = cell
+        self.last_movers.add(node_id)
+        if self.move_journal is not None:
+            self.move_journal.append((node_id, previous_position, position))
+        for listener in self.move_listeners:
+            listener(node_id, position)
+
+    def known_nodes(self) -> set[int]:
+        return {node_id for node_id, known in enumerate(self.node_known) if known}
+
+    def get_nodes_at_position(self, position: tuple[int, int]) -> CellOccupants:
+        return CellOccupants(self, self._cell_index(position))
+
+    def get_node_position(self, node_id: int) -> tuple[int, int] | None:
+        if node_id < 0 or node_id >= len(self.node_known) or not self.node_known[node_id]:
+            return None
+        return self.node_x[node_id], self.node_y[node_id]
+
+    def _cell_index(self, position: tuple[int, int]) -> int:
+        x, y = position
+        if 0 <= x < self.board_shape[0] and 0 <= y < self.board_shape[1]:
+            return y * self.board_shape[0] + x
+        return -1
+
+    def _cell_of(self, node_id: int) -> int:
+        if node_id < 0 or node_id >= len(self.node_cell):
+            return -1
+        return self.node_cell[node_id]
+
+    def _ensure_capacity(self, node_id: int):
+        missing = node_id + 1 - len(self.node_known)
+        if missing <= 0:
+            return
+        # Grow geometrically so that registering ids one at a time stays linear overall.
+        missing = max(missing, len(self.node_known))
+        self.node_x.extend(array("i", [0]) * missing)
+        self.node_y.extend(array("i", [0]) * missing)
+        self.node_cell.extend(array("i", [-1]) * missing)
+        self.node_next.extend(array("i", [-1]) * missing)
+        self.node_prev.extend(array("i", [-1]) * missing)
+        self.node_known.extend(bytes(missing))
+
+    def _unlink(self, node_id: int):
+        cell = self.node_cell[node_id]
+        if cell < 0:
+            return
+        next_id = self.node_next[node_id]
+        prev_id = self.node_prev[node_id]
+        if prev_id >= 0:
+            self.node_next[prev_id] = next_id
+        else:
+            self.cell_head[cell] = next_id
+        if next_id >= 0:
+            self.node_prev[next_id] = prev_id
+        self.cell_count[cell] -= 1
+        self.node_cell[node_id] = -1
+
+
+def make_movement_monitor(backend: str = "dict", board_shape: tuple[int, int] | None = None) -> MovementMonitor:
+    """Build a MovementMonitor. The 'grid' backend needs the board shape."""
+    if backend == "dict":
+        return MovementMonitor()
+    elif backend == "grid":
+        assert board_shape is not None, "The grid backend needs a board shape."
+        return GridMovementMonitor(board_shape)
+    raise ValueError(f"Unknown movement backend '{backend}'. Expected one of {MOVEMENT_BACKENDS}.")
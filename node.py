@@ -1,19 +1,80 @@
 # node.py
 from abc import abstractmethod
+import asyncio
+import inspect
 import lcm
 import threading
+import time
 
+from channels import Channels
+from messages import control_ack_t
+from picklestate import RebuiltOnUnpickle
+from reliable import DuplicateFilter, ReliableSender
 
-class Node:
+
+class Node(RebuiltOnUnpickle):
     def __init__(self):
         self.running = False
+        # Set by EventLoopRuntime when the node is hosted on an event loop instead of its own LCM thread.
+        self.runtime = None
+        self.loop = None
+        self.subscriptions = list()
+        # Acknowledged delivery for control messages; see reliable.py. The sender side is off until asked for.
+        self.reliable = None
+        self.received = DuplicateFilter()
 
     def subscribe(self, channel, handler):
-        self.lc.subscribe(channel, handler)
+        if inspect.iscoroutinefunction(handler):
+            handler = self._async_dispatcher(handler)
+        subscription = self.lc.subscribe(channel, handler)
+        self.subscriptions.append(subscription)
+        return subscription
 
     def publish(self, channel, msg):
         self.lc.publish(channel, msg.encode())
 
+    def enable_reliable_delivery(self):
+        """Keep what we send with `publish_reliable` until it's acknowledged. Call from on_start."""
+        self.reliable = ReliableSender(self.lc.publish)
+        self.subscribe(Channels.CONTROL_ACK, self.reliable.process_ack)
+
+    def publish_reliable(self, channel, seq, msg, ackers=()):
+        """Publish `msg`, numbered `seq`, and resend it until every id in `ackers` acknowledges it.
+        Without reliable delivery enabled this is a plain publish."""
+        if self.reliable is None:
+            self.publish(channel, msg)
+        else:
+            self.reliable.send(channel, seq, msg.encode(), ackers, time.monotonic())
+
+    def retransmit_due(self) -> float | None:
+        """Resend unacknowledged messages that are due. Returns the seconds until the next one, if any."""
+        if self.reliable is None:
+            return None
+        return self.reliable.resend_due(time.monotonic())
+
+    def acknowledge(self, channel, seq, ids):
+        msg = control_ack_t()
+        msg.channel = channel
+        msg.seq = seq
+        msg.ids = list(ids)
+        msg.count = len(msg.ids)
+        self.publish(Channels.CONTROL_ACK, msg)
+
+    def _async_dispatcher(self, handler):
+        """Wrap an `async def` handler so LCM can call it. On an event loop it becomes a task on that loop.
+        On the threaded runtime it runs to completion on the LCM thread."""
+        def dispatch(channel, data):
+            if self.loop is not None:
+                self.loop.create_task(handler(channel, data))
+            else:
+                asyncio.run(handler(channel, data))
+        return dispatch
+
+    def wake_soon(self):
+        """Ask an event-loop runtime to call step() as soon as the pending messages are handled."""
+        if self.runtime is not None:
+            self.runtime.wake(self)
+
     def _handle_loop(self):
         while self.running:
             self.lc.handle_timeout(10)  # 10ms timeout to check for messages
@@ -52,9 +113,11 @@ class Node:
     def run(self):
         """
             Main code for node. Once this function finishes, the node terminates.
+            Nodes that can also run on an event loop define `step()`, one pass of this loop that returns the seconds
+            until the next pass, or None once the node is done. See eventloop.py.
         """
         pass
-    
+
     @abstractmethod
     def on_stop(self):
         """
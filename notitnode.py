@@ -9,32 +9,61 @@ import time
 from logging import getLogger
 
 from channels import Channels
-from messages import freeze_t, moved_t, report_ready_t, report_status_t
-
+from backoff import Backoff
+from clock import WallClock
+from messages import begin_t, freeze_t, moved_t, report_ready_t, report_status_t, tick_ack_t, tick_t
 from node import Node
+from syncdigest import digest_has_frozen, read_digest
 
 
-NODE_SYNC_FREQUENCY = 5.0  # This does not need to be frequent. It's a sanity check to see if we missed messages.
 GAME_START_POLL_FREQUENCY = 0.1
+READY_RETRY_DELAY = 0.5  # Seconds before the first resend of a ready report nobody has answered with a start.
+READY_RETRY_MAX = 4.0  # Longest wait between ready resends.
 logger = getLogger()
 
 
+def decode_begin(data: bytes) -> begin_t | None:
+    """Decode a BEGIN_GAME payload, or None if it comes from a game node on another message schema version."""
+    try:
+        msg = begin_t.decode(data)
+    except ValueError:
+        return None
+    return msg if msg.schema_version == begin_t.SCHEMA_VERSION else None
+
+
 class NotItNode(Node):
 
-    def __init__(self, node_id: int, start_position: tuple[int, int], board_shape: tuple[int, int], move_frequency: float):
+    def __init__(
+            self,
+            node_id: int,
+            start_position: tuple[int, int],
+            board_shape: tuple[int, int],
+            move_frequency: float,
+            seed: int | None = None,
+            clock=None,
+            move_regions=None,
+    ):
+        """`seed` gives this node its own RNG, seeded from the game seed and our id, so seeded games repeat exactly.
+        Without one we share the global `random` module. `clock` paces the main loop; see clock.py.
+        `move_regions` is a MoveRegions to send each move on its tile's channel instead of the global one."""
         super().__init__()
         self.node_id = node_id
         self.current_position = start_position
         self.board_shape = board_shape
         self.move_frequency = move_frequency
-        self.sync_frequency = NODE_SYNC_FREQUENCY
-        self.last_node_sync = 0
         # It's tempting to put all of these into an enumeration of FSM like we have for the game node.
         # The reason we're not doing that is IT might not get the game start message and we don't want a rebroadcast
         # to flip all of the seekers from frozen to unfrozen, restarting the game.
         self.game_started = False
         self.frozen = False
         self.game_over = False
+        self.playing = False  # Set once step() has seen the start and unfrozen us.
+        self.move_seq = 0  # Stamped on every moved_t so the game node can spot drops and reordering.
+        self.moves_sent = 0  # Lockstep acknowledgements report it.
+        self.rng = random if seed is None else random.Random(f"{seed}:{node_id}")
+        self.clock = clock or WallClock()
+        self.move_regions = move_regions
+        self.ready_backoff = Backoff(READY_RETRY_DELAY, READY_RETRY_MAX)
 
     def position_in_bound(self, pos: tuple[int, int]) -> bool:
         return pos[0] >= 0 and pos[0] < self.board_shape[0] and pos[1] >= 0 and pos[1] < self.board_shape[1]
@@ -45,27 +74,61 @@ class NotItNode(Node):
         self.subscribe(Channels.BEGIN_GAME, self.handle_begin)
         self.subscribe(Channels.FREEZE, self.handle_freeze)
         self.subscribe(Channels.STOP_GAME, self.handle_gameover)
+        self.subscribe(Channels.SYNC_DIGEST, self.handle_digest)
+        if self.clock.virtual:
+            self.clock.on_tick_done = self.send_tick_ack
+            self.subscribe(Channels.TICK, self.handle_tick)
+
+        self.send_ready()
+        self.ready_backoff.start(time.monotonic())
+        logger.info(f"Node {self.node_id} online at {self.current_position}")
+
+    def __getstate__(self):
+        # The shared `random` module doesn't pickle either. See picklestate.py.
+        state = super().__getstate__()
+        if state["rng"] is random:
+            state["rng"] = None
+        return state
 
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        if self.rng is None:
+            self.rng = random
+
+    def send_ready(self):
         msg = report_ready_t()
+        msg.schema_version = report_ready_t.SCHEMA_VERSION
         msg.id = self.node_id
         msg.position = self.current_position
         self.publish(Channels.REPORT_READY, msg)
-        logger.info(f"Node {self.node_id} online at {self.current_position}")
     
     def run(self):
-        while not self.game_started:
-            time.sleep(GAME_START_POLL_FREQUENCY)
-            self.send_sync()
-
-        self.frozen = False  # Unfreeze as we start the game.
-
-        while not self.game_over:
-            time.sleep(self.move_frequency)
-            self.tick()
-            if not self.frozen:
-                new_place = self.choose_move()
-                self.move_to(new_place)
-            self.send_sync()
+        delay = GAME_START_POLL_FREQUENCY
+        while delay is not None:
+            self.clock.sleep(delay)
+            delay = self.step()
+
+    def step(self) -> float | None:
+        """Poll for the game start, or make one move once the game is on.
+        Returns the seconds until the next step, or None once the game is over."""
+        if self.game_over:
+            return None
+        if not self.playing:
+            if not self.game_started:
+                # Our ready report may have been lost in the startup rush. Resend it, less and less often, until
+                # the game starts. It doubles as the status that tells the game node we missed the start.
+                if self.ready_backoff.due(time.monotonic()):
+                    self.send_ready()
+                return GAME_START_POLL_FREQUENCY
+            self.playing = True
+            self.frozen = False  # Unfreeze as we start the game.
+            return self.move_frequency
+
+        self.tick()
+        if not self.frozen:
+            new_place = self.choose_move()
+            self.move_to(new_place)
+        return None if self.game_over else self.move_frequency
     
     def tick(self):
         """Called once per loop inside the run cycle.  Called even if frozen."""
@@ -89,21 +152,42 @@ class NotItNode(Node):
             logger.warning(f"Candidate moves list is empty for node id {self.node_id}! "
                            f"Pos: {self.current_position}  Board shape: {self.board_shape}")
         else:
-            next_position = random.choice(candidate_moves)
+            next_position = self.rng.choice(candidate_moves)
         return next_position
 
     def move_to(self, new_position: tuple[int, int]):
+        self.moves_sent += 1
         msg = moved_t()
         msg.id = self.node_id
         msg.new_position = new_position
-        self.publish(Channels.REPORT_MOVE, msg)
+        self.move_seq += 1
+        msg.seq = self.move_seq
+        msg.send_time_ns = time.monotonic_ns()
+        if self.move_regions is None:
+            self.publish(Channels.REPORT_MOVE, msg)
+        else:
+            tile = self.move_regions.tile_of(new_position)
+            self.publish(self.move_regions.channel(tile), msg)
+            old_tile = self.move_regions.tile_of(self.current_position)
+            if old_tile != tile:
+                self.publish(self.move_regions.exit_channel(old_tile), msg)
         self.current_position = new_position
     
-    def on_stop(self):
-        pass
-
     def handle_begin(self, channel, data):
-        logger.info(f"Got start message: {self.node_id}")
+        msg = decode_begin(data)
+        if msg is None:
+            # Fail fast rather than play on with a game node that reads our ids differently.
+            logger.error(f"Node {self.node_id} got a start message from a game node on a different message schema. "
+                         f"Expected version {begin_t.SCHEMA_VERSION}. Shutting down.")
+            self.game_over = True
+            self.game_started = True  # Release run() from its start wait so it can exit.
+            return
+        if not self.received.first_time(channel, msg.seq):
+            return  # Resent for someone else who missed it.
+        if msg.send_time_ns:
+            logger.info(f"Got start message: {self.node_id} (#{msg.seq}, {(time.monotonic_ns() - msg.send_time_ns) / 1e6:.3f}ms after sending)")
+        else:
+            logger.info(f"Got start message: {self.node_id}")
         self.game_started = True
         # We do NOT set unfrozen here.
         # The node will unfreeze itself as the game starts, but it's possible a message will get dropped and we'll
@@ -112,21 +196,54 @@ class NotItNode(Node):
 
     def handle_gameover(self, channel, data):
         self.game_over = True
+        self.clock.stop()
+
+    def handle_tick(self, channel, data):
+        msg = tick_t.decode(data)
+        if msg.phase == self.clock.phase:
+            # A tick means the game is on, even if we missed BEGIN_GAME.
+            self.game_started = True
+            self.clock.handle_tick(msg.tick, msg.moves_total)
+
+    def send_tick_ack(self, tick: int):
+        msg = tick_ack_t()
+        msg.tick = tick
+        msg.phase = self.clock.phase
+        msg.moves_sent = self.moves_sent
+        msg.count = 1
+        msg.ids = [self.node_id]
+        self.publish(Channels.TICK_ACK, msg)
 
     def handle_freeze(self, channel, data):
+        received_time_ns = time.monotonic_ns()
         msg = freeze_t.decode(data)
         if msg.id == self.node_id:
+            # Every copy is acknowledged, in case our last ack was lost, but only the first is acted on.
+            self.acknowledge(channel, msg.seq, [msg.id])
+            if not self.received.first_time(channel, msg.seq, msg.id):
+                return
             self.frozen = True
-
-    def send_sync(self):
-        # Randomly broadcast status so that we can sanity check our system state.
-        now = time.time()
-        if now - self.last_node_sync > self.sync_frequency:
-            logger.info(f"Node ID {self.node_id} reporting status update.")
-            msg = report_status_t()
-            msg.id = self.node_id
-            msg.position = self.current_position
-            msg.frozen = self.frozen
-            msg.game_started = self.game_started
-            self.publish(Channels.REPORT_STATUS, msg)
-            self.last_node_sync = now
\ No newline at end of file
+            self.send_status(echo=msg, received_time_ns=received_time_ns)
+
+    def handle_digest(self, channel, data):
+        """Check the game node's view of us, and only speak up if it's wrong. See syncdigest.py."""
+        msg = read_digest(data)
+        if msg is None:
+            return
+        self.game_started = True  # Digests only go out once the game is on, so we must have missed the start.
+        if digest_has_frozen(msg, self.node_id) != self.frozen:
+            logger.info(f"Node ID {self.node_id} disagrees with sync digest #{msg.seq}. Reporting status.")
+            self.send_status()
+
+    def send_status(self, echo: freeze_t | None = None, received_time_ns: int = 0):
+        """Report our state. Given a freeze, echo its timestamps back so the game node can time the round trip."""
+        msg = report_status_t()
+        msg.id = self.node_id
+        msg.position = self.current_position
+        msg.frozen = self.frozen
+        msg.game_started = self.game_started
+        if echo is not None:
+            msg.echo_send_time_ns = echo.send_time_ns
+            msg.echo_cause_time_ns = echo.cause_time_ns
+            msg.received_time_ns = received_time_ns
+        self.publish(Channels.REPORT_STATUS, msg)
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+Pickling for objects that hold locks, events, and conditions.
+
+Under the spawn and forkserver start methods (game.py --start-method) each node is pickled into its process, along with
+its clock, latency stats, and board model. Threading primitives don't pickle. A class that holds some inherits
+RebuiltOnUnpickle and lists them in REBUILT_ON_UNPICKLE, attribute name -> factory: they are left out of the pickle and
+made afresh on the other side.
+"""
+
+
+class RebuiltOnUnpickle:
+    REBUILT_ON_UNPICKLE = dict()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self.rebuilt_attributes():
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for name, factory in self.rebuilt_attributes().items():
+            setattr(self, name, factory())
+
+    @classmethod
+    def rebuilt_attributes(cls) -> dict:
+        """REBUILT_ON_UNPICKLE merged down the class hierarchy, so a subclass only lists what it adds."""
+        merged = dict()
+        for klass in reversed(cls.__mro__):
+            merged.update(vars(klass).get("REBUILT_ON_UNPICKLE", {}))
+        return merged
@@ -0,0 +1,157 @@
+"""
+Pursuit planning for the ItNode.
+
+"greedy" is the original strategy: step toward the nearest hider along a randomly chosen axis. "intercept" uses
+InterceptPlanner:
+  - A hider takes one random step every `hider_period` 'it' moves. After k steps we haven't heard about, it is
+    somewhere in the diamond of radius k around its last report, clipped to the board.
+  - We aim at the middle of that reach set. In open ground that's the reported cell. Against a wall or in a corner
+    it shifts inward, since that's the only way the hider can have gone.
+  - The expected intercept time is the distance to that point plus the expected spread of the walk by the time we
+    get there. We chase the hider with the smallest, and keep our current target unless another is clearly sooner,
+    so two hiders wandering at about the same distance don't have us turning back and forth.
+  - We step along the axis with the bigger gap, so we never stand still while a target is left.
+
+Reach-set centres are cached by (offset from the walls, steps), and each hider's aim point is kept until it is
+reported again or takes another unreported step, so a tick only recomputes distances.
+
+With several seekers, `assign_targets` pairs each one with its own hider so they don't all chase the same one.
+Every seeker runs it on the positions it has heard, every ASSIGNMENT_PERIOD ticks or when its target is tagged. The
+answer doesn't depend on who runs it, so the seekers agree without exchanging messages.
+"""
+
+import math
+
+
+PURSUIT_STRATEGIES = ["greedy", "intercept"]
+DEFAULT_HIDER_PERIOD = 2  # 'it' moves per hider move: NOT_IT_MOVE_SPEED / IT_MOVE_SPEED.
+MAX_REACH = 8  # Cap on the unreported steps we model. An older report is no better than a guess.
+RETARGET_MARGIN = 2  # Ticks a new target must save before we drop the current one.
+ASSIGNMENT_PERIOD = 4  # Ticks between recomputing which seeker chases which hider.
+
+
+def walk_spread(steps: float) -> float:
+    """Expected Manhattan distance a 2D lattice random walk covers in `steps` steps."""
+    return math.sqrt(4.0 * steps / math.pi)
+
+
+class InterceptPlanner:
+    def __init__(self, board_shape: tuple[int, int], spatial_index, hider_period: int = DEFAULT_HIDER_PERIOD):
+        """`spatial_index` is the ItNode's BucketGrid of untagged hiders. The planner reads it but never writes it."""
+        assert hider_period > 0
+        self.board_shape = board_shape
+        self.spatial_index = spatial_index
+        self.hider_period = hider_period
+        self.tick = 0  # 'it' moves planned so far.
+        self.seen_tick = dict()  # node_id -> tick of its last report.
+        self.aims = dict()  # node_id -> (unreported steps, aim point).
+        self.target = None
+        self._centres = dict()  # (clipped offsets from the walls, steps) -> reach-set centre offset.
+
+    def observe(self, node_id: int, position: tuple[int, int]):
+        self.seen_tick[node_id] = self.tick
+        self.aims.pop(node_id, None)
+
+    def forget(self, node_id: int):
+        self.seen_tick.pop(node_id, None)
+        self.aims.pop(node_id, None)
+        if self.target == node_id:
+            self.target = None
+
+    def plan(self, position: tuple[int, int], assigned: int | None = None) -> tuple[int, int] | None:
+        """The cell to head for this tick, or None if there is nobody left to chase.
+        `assigned` is the hider this seeker was given by assign_targets, if it was given one."""
+        self.tick += 1
+        reported = self.spatial_index.get(assigned) if assigned is not None else None
+        if reported is not None:
+            self.target = assigned
+            return self._estimate(assigned, reported, position)[1]
+        nearest = self.spatial_index.nearest(position)
+        if nearest is None:
+            self.target = None
+            return None
+        best_id = nearest[0]
+        best_ticks, best_aim = self._estimate(best_id, nearest[1], position)
+        # A hider's aim point is at most MAX_REACH from its report, so anything further out can't beat the nearest.
+        for node_id, reported in self.spatial_index.within(position, math.ceil(best_ticks) + MAX_REACH):
+            ticks, aim = self._estimate(node_id, reported, position)
+            if ticks < best_ticks or (ticks == best_ticks and node_id < best_id):
+                best_id, best_ticks, best_aim = node_id, ticks, aim
+        reported = self.spatial_index.get(self.target) if self.target is not None else None
+        if reported is not None and self.target != best_id:
+            ticks, aim = self._estimate(self.target, reported, position)
+            if ticks <= best_ticks + RETARGET_MARGIN:
+                return aim
+        self.target = best_id
+        return best_aim
+
+    def _estimate(self, node_id: int, reported: tuple[int, int], position: tuple[int, int]) -> tuple[float, tuple[int, int]]:
+        steps = min(MAX_REACH, (self.tick - self.seen_tick.get(node_id, self.tick)) // self.hider_period)
+        cached = self.aims.get(node_id)
+        if cached is not None and cached[0] == steps:
+            aim = cached[1]
+        else:
+            aim = self.reach_centre(reported, steps)
+            self.aims[node_id] = (steps, aim)
+        distance = abs(aim[0] - position[0]) + abs(aim[1] - position[1])
+        # The hider keeps walking while we close in.
+        return distance + walk_spread(steps + distance / self.hider_period), aim
+
+    def reach_centre(self, reported: tuple[int, int], steps: int) -> tuple[int, int]:
+        """Middle of the cells within `steps` of `reported` on the board, rounded to a cell."""
+        if steps == 0:
+            return reported
+        # Only the distance to each wall, up to `steps`, changes the answer. That keeps the cache small.
+        x, y = reported
+        width, height = self.board_shape
+        walls = (min(x, steps), min(width - 1 - x, steps), min(y, steps), min(height - 1 - y, steps))
+        key = (walls, steps)
+        offset = self._centres.get(key)
+        if offset is None:
+            left, right, top, bottom = walls
+            total_x = total_y = count = 0
+            for dx in range(-left, right + 1):
+                remaining = steps - abs(dx)
+                y0, y1 = -min(top, remaining), min(bottom, remaining)
+                cells = y1 - y0 + 1
+                total_x += dx * cells
+                total_y += (y0 + y1) * cells / 2
+                count += cells
+            offset = self._centres[key] = (round(total_x / count), round(total_y / count))
+        return x + offset[0], y + offset[1]
+
+
+def step_toward(position: tuple[int, int], aim: tuple[int, int], rng) -> tuple[int, int]:
+    """One step closing the bigger of the two gaps to `aim`, picking at random when they're equal."""
+    dx = aim[0] - position[0]
+    dy = aim[1] - position[1]
+    if dx == 0 and dy == 0:
+        return position
+    if abs(dx) > abs(dy) or (abs(dx) == abs(dy) and rng.random() > 0.5):
+        return position[0] + (1 if dx > 0 else -1), position[1]
+    return position[0], position[1] + (1 if dy > 0 else -1)
+
+
+def assign_targets(seekers: dict[int, tuple[int, int]], hiders) -> dict[int, int]:
+    """Pair seekers with distinct hiders from the BucketGrid `hiders`, closest pairs first: a greedy min-cost matching.
+    Each seeker only weighs its len(seekers) nearest hiders. The other seekers can take at most one fewer than that,
+    so everyone gets a hider while there are enough to go round. Ties go to the lowest ids."""
+    wanted = len(seekers)
+    limit = hiders.board_shape[0] + hiders.board_shape[1]
+    pairs = list()
+    for seeker_id, position in seekers.items():
+        radius = hiders.bucket_size
+        found = hiders.within(position, radius)
+        while len(found) < wanted and radius < limit:
+            radius *= 2
+            found = hiders.within(position, radius)
+        ranked = sorted((abs(x - position[0]) + abs(y - position[1]), hider_id) for hider_id, (x, y) in found)
+        pairs.extend((distance, seeker_id, hider_id) for distance, hider_id in ranked[:wanted])
+    pairs.sort()
+    assignment = dict()
+    taken = set()
+    for _, seeker_id, hider_id in pairs:
+        if seeker_id not in assignment and hider_id not in taken:
+            assignment[seeker_id] = hider_id
+            taken.add(hider_id)
+    return assignment
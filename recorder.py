@@ -0,0 +1,55 @@
+"""
+RecorderNode
+  - Subscribes to every channel and writes each message to an LCM event log, the same format `lcm-logger` writes.
+  - Stops once the game node sends STOP_GAME.
+  - Play the log back into a fresh GameNode with `replay.py`.
+"""
+import time
+from logging import getLogger
+
+import lcm
+
+from channels import Channels
+from node import Node
+
+
+RECORDER_POLL_FREQUENCY = 0.1
+logger = getLogger()
+
+
+class RecorderNode(Node):
+    def __init__(self, path: str, subscribed=None):
+        """`subscribed` is an optional multiprocessing.Event, set once we're listening so the game can start."""
+        super().__init__()
+        self.path = path
+        self.subscribed = subscribed
+        self.events_written = 0
+        self.game_over = False
+
+    def on_start(self):
+        # The log is opened in the recording process; an open file handle doesn't belong in a pickled node.
+        self.log = lcm.EventLog(self.path, "w", overwrite=True)
+        self.subscribe(".*", self.record)
+        logger.info(f"Recording all channels to {self.path}")
+        if self.subscribed is not None:
+            self.subscribed.set()
+
+    def run(self):
+        delay = RECORDER_POLL_FREQUENCY
+        while delay is not None:
+            time.sleep(delay)
+            delay = self.step()
+
+    def step(self) -> float | None:
+        return None if self.game_over else RECORDER_POLL_FREQUENCY
+
+    def on_stop(self):
+        self.log.close()
+        logger.info(f"Recorded {self.events_written} events to {self.path}")
+
+    def record(self, channel, data):
+        # Microseconds since the epoch, like lcm-logger.
+        self.log.write_event(time.time_ns() // 1000, channel, data)
+        self.events_written += 1
+        if channel == Channels.STOP_GAME:
+            self.game_over = True
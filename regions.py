@@ -0,0 +1,94 @@
+"""
+Region-partitioned move channels, so a node can follow the part of the board it cares about instead of every move.
+
+The board is cut into square tiles of `tile_size` cells, numbered row by row. With regions on:
+  - A single move goes out on REPORT_MOVE/<tile> for the destination cell's tile. When the move crosses into another
+    tile, it also goes out on REPORT_MOVE_EXIT/<tile> for the tile it left, so whoever follows only that tile still
+    hears the agent go instead of keeping it at its last cell forever. Whoever follows both tiles passes on only the
+    copy for the new one.
+  - Nodes that need everything (the GameNode, the recorder) subscribe to a pattern that matches every tile, so they
+    are unaffected. The MovementMonitor's `register_listeners` already does.
+  - The ItNode follows the tiles around itself through `RegionSubscriptions`, updated as it moves. Game shards
+    follow the tiles their region overlaps.
+
+Batched moves from agent hosts still go out on the global REPORT_MOVE_BATCH channel, which
+everyone follows.
+"""
+
+from channels import Channels
+from fast_codec import MOVED_CODEC
+
+
+MOVE_REGION_SIZE = 16  # Default tile side in cells.
+INTEREST_RADIUS = 1  # Tiles a seeker follows on each side of its own, at the least.
+# Every move channel, global or regional. LCM channels are regexes matched against the whole name.
+ALL_MOVES = f"{Channels.REPORT_MOVE}(/[0-9]+)?"
+
+
+class MoveRegions:
+    def __init__(self, board_shape: tuple[int, int], tile_size: int = MOVE_REGION_SIZE):
+        assert tile_size > 0
+        self.board_shape = board_shape
+        self.tile_size = tile_size
+        self.columns = -(-board_shape[0] // tile_size)
+        self.rows = -(-board_shape[1] // tile_size)
+
+    def __len__(self) -> int:
+        return self.columns * self.rows
+
+    def tile_of(self, position: tuple[int, int]) -> int:
+        # Off-board positions count as the nearest edge tile, so a bad move still reaches whoever watches there.
+        column = min(max(position[0] // self.tile_size, 0), self.columns - 1)
+        row = min(max(position[1] // self.tile_size, 0), self.rows - 1)
+        return row * self.columns + column
+
+    def channel(self, tile: int) -> str:
+        return f"{Channels.REPORT_MOVE}/{tile}"
+
+    def exit_channel(self, tile: int) -> str:
+        return f"{Channels.REPORT_MOVE_EXIT}/{tile}"
+
+    def tiles_near(self, position: tuple[int, int], radius: int) -> set[int]:
+        """The tiles at most `radius` tiles away from the one holding `position`, in both directions."""
+        tile = self.tile_of(position)
+        column, row = tile % self.columns, tile // self.columns
+        return {
+            r * self.columns + c
+            for r in range(max(row - radius, 0), min(row + radius, self.rows - 1) + 1)
+            for c in range(max(column - radius, 0), min(column + radius, self.columns - 1) + 1)
+        }
+
+    def tiles_overlapping(self, x0: int, y0: int, x1: int, y1: int) -> set[int]:
+        """The tiles holding any cell of the box from (x0, y0) up to, but not including, (x1, y1)."""
+        size = self.tile_size
+        c0, c1 = max(x0 // size, 0), min((x1 - 1) // size, self.columns - 1)
+        r0, r1 = max(y0 // size, 0), min((y1 - 1) // size, self.rows - 1)
+        return {r * self.columns + c for r in range(r0, r1 + 1) for c in range(c0, c1 + 1)}
+
+
+class RegionSubscriptions:
+    """The set of tiles a node follows. `follow` subscribes to the new tiles and drops the ones no longer wanted."""
+    def __init__(self, node, regions: MoveRegions, handler):
+        """`handler(channel, data)` gets both the moves into and out of each followed tile."""
+        self.node = node
+        self.regions = regions
+        self.handler = handler
+        self.tiles = dict()  # Tile -> its two subscriptions.
+
+    def follow(self, tiles: set[int]):
+        for tile in set(self.tiles) - tiles:
+            for subscription in self.tiles.pop(tile):
+                self.node.lc.unsubscribe(subscription)
+                # Keep the node's list current, since a shared event loop drops what's left in it when we stop.
+                self.node.subscriptions.remove(subscription)
+        for tile in tiles - set(self.tiles):
+            self.tiles[tile] = (
+                self.node.subscribe(self.regions.channel(tile), self.handler),
+                self.node.subscribe(self.regions.exit_channel(tile), self.handle_exit),
+            )
+
+    def handle_exit(self, channel, data):
+        # The move also went out on its new tile's channel. If we follow that one too, we already have it.
+        _, x, y, _, _ = MOVED_CODEC.decode(data)
+        if self.regions.tile_of((x, y)) not in self.tiles:
+            self.handler(channel, data)
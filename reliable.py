@@ -0,0 +1,127 @@
+"""
+Acknowledged delivery for control messages over best-effort multicast.
+
+Moves don't need it: a lost move is superseded by the next one. A lost FREEZE is another matter. Its hider keeps
+moving until something notices, which used to be the five-second status check. So:
+  - The sender keeps each FREEZE, by its sequence number, until the hider it was for sends a `control_ack_t` back.
+    Until then it is sent again on a jittered exponential backoff (backoff.py), starting at a few round trips. After
+    MAX_RETRANSMITS it is counted lost and dropped, and the sync digest (syncdigest.py) is left to repair it.
+  - BEGIN_GAME goes to everyone, and an ack from every node would be another startup burst. It is negatively
+    acknowledged instead: a node that hasn't seen the start keeps resending its ready report, and the game node
+    answers by publishing the same start message again.
+  - Receivers acknowledge every copy, since the ack may be what was lost, but act on each sequence number only once.
+"""
+
+import threading
+from collections import deque
+
+from backoff import Backoff
+from messages import control_ack_t
+from picklestate import RebuiltOnUnpickle
+
+
+RETRANSMIT_DELAY = 0.05  # Seconds before the first retransmit.
+RETRANSMIT_MAX = 1.0  # Longest wait between retransmits.
+MAX_RETRANSMITS = 6  # Retransmits before a message is counted lost, about three seconds in all.
+DUPLICATE_WINDOW = 4096  # Control messages a receiver remembers for spotting duplicates.
+
+
+class PendingMessage:
+    def __init__(self, data: bytes, ackers: set[int], now: float):
+        self.data = data
+        self.ackers = ackers  # Ids yet to acknowledge.
+        self.retransmits = 0
+        self.backoff = Backoff(RETRANSMIT_DELAY, RETRANSMIT_MAX)
+        self.backoff.start(now)
+
+
+class ReliableSender(RebuiltOnUnpickle):
+    """Sender side. Acks land on the LCM thread while retransmits happen in the main loop, hence the lock."""
+    REBUILT_ON_UNPICKLE = {"lock": threading.Lock}
+
+    def __init__(self, publish):
+        """`publish(channel, data)` sends raw bytes, such as `lcm.LCM.publish`."""
+        self.raw_publish = publish
+        self.lock = threading.Lock()
+        self.pending = dict()  # (channel, seq) -> PendingMessage
+        self.latest = dict()  # Channel -> bytes of the last message sent on it, for negative acknowledgements.
+        self.sent = 0
+        self.acked = 0
+        self.retransmits = 0
+        self.lost = 0
+
+    def send(self, channel: str, seq: int, data: bytes, ackers, now: float):
+        """Publish, and keep resending until every id in `ackers` acknowledges. With no `ackers`, only
+        `resend_latest` sends it again."""
+        with self.lock:
+            self.sent += 1
+            self.latest[channel] = data
+            if ackers:
+                # Registered before publishing: on an in-process bus the ack arrives before publish returns.
+                self.pending[(channel, seq)] = PendingMessage(data, set(ackers), now)
+        self.raw_publish(channel, data)
+
+    def resend_latest(self, channel: str):
+        """Someone says they missed the last message on `channel`. Send it again as it was."""
+        with self.lock:
+            data = self.latest.get(channel)
+            if data is None:
+                return
+            self.retransmits += 1
+        self.raw_publish(channel, data)
+
+    def process_ack(self, channel, data):
+        msg = control_ack_t.decode(data)
+        with self.lock:
+            pending = self.pending.get((msg.channel, msg.seq))
+            if pending is None:
+                return  # Already complete, or someone else's: every sender hears every ack.
+            pending.ackers.difference_update(msg.ids)
+            if not pending.ackers:
+                del self.pending[(msg.channel, msg.seq)]
+                self.acked += 1
+
+    def resend_due(self, now: float) -> float | None:
+        """Resend whatever is due. Returns the seconds until the next resend, or None if nothing is waiting."""
+        resends = list()
+        with self.lock:
+            for key, pending in list(self.pending.items()):
+                if not pending.backoff.due(now):
+                    continue
+                if pending.retransmits == MAX_RETRANSMITS:
+                    del self.pending[key]
+                    self.lost += 1
+                    continue
+                pending.retransmits += 1
+                self.retransmits += 1
+                resends.append((key[0], pending.data))
+            next_time = min((pending.backoff.next_time for pending in self.pending.values()), default=None)
+        for channel, data in resends:
+            self.raw_publish(channel, data)
+        return None if next_time is None else max(0.0, next_time - now)
+
+    def summary(self) -> str:
+        with self.lock:
+            waiting = len(self.pending)
+        return (f"Control messages: {self.sent} sent, {self.acked} acknowledged, {self.retransmits} retransmitted, "
+                f"{self.lost} lost, {waiting} awaiting acknowledgement")
+
+
+class DuplicateFilter:
+    """Receiver side. Remembers the last DUPLICATE_WINDOW control messages seen."""
+    def __init__(self, window: int = DUPLICATE_WINDOW):
+        self.seen = set()
+        self.order = deque()
+        self.window = window
+        self.duplicates = 0
+
+    def first_time(self, *key) -> bool:
+        """True the first time `key` (channel, seq, and the target id if there is one) turns up."""
+        if key in self.seen:
+            self.duplicates += 1
+            return False
+        self.seen.add(key)
+        self.order.append(key)
+        if len(self.order) > self.window:
+            self.seen.discard(self.order.popleft())
+        return True
@@ -0,0 +1,309 @@
+"""
+Replay a recorded game (`game.py --record game.log`) into a fresh GameNode, without launching any agents.
+
+The log is memory-mapped and indexed once up front: every event's timestamp, channel, and data offset go into flat
+arrays, so seeking to a time or event number is a binary search and reading an event is a slice of the map.
+
+Seeking fast-forwards instead of replaying everything before the seek point. Ready reports are fed in as usual.
+Each agent is then placed at its last recorded position, and hiders the recorded game froze are marked tagged.
+
+Playback feeds the agent-to-game channels (ready, move, move batch, and status) into the GameNode over a LocalBus.
+It runs at the recorded pace, N times faster, or as fast as possible. The FREEZE messages the original GameNode
+sent are not fed in. They are compared against the tags the replayed GameNode makes, each freeze counted once however
+many times it was retransmitted.
+
+    python replay.py game.log                      # Real time.
+    python replay.py game.log --speed 10 --ui      # Ten times faster, drawing the board.
+    python replay.py game.log --speed 0 --start 30 # As fast as possible, from 30 seconds in.
+"""
+
+import argparse
+import bisect
+import mmap
+import struct
+import time
+from array import array
+from dataclasses import dataclass, field
+
+from channels import Channels
+from fast_codec import MOVED_CODEC, decode_moved_batch
+from gamenode import GameNode, GameState
+from localbus import LocalBus
+from messages import freeze_t, report_ready_batch_t, report_ready_t
+from movement_monitor import MOVEMENT_BACKENDS
+from reliable import DuplicateFilter
+
+
+SYNC_WORD = 0xEDA1DA01
+EVENT_HEADER = struct.Struct(">Iqqii")  # Sync word, event number, timestamp (us), channel length, data length.
+REPLAYED_CHANNELS = (Channels.REPORT_READY, Channels.REPORT_READY_BATCH, Channels.REPORT_MOVE, Channels.REPORT_MOVE_BATCH, Channels.REPORT_STATUS)
+
+
+class EventLogIndex:
+    """Random access to an LCM event log through a read-only memory map."""
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.utimes = array("q")
+        self.data_offsets = array("q")
+        self.data_lengths = array("i")
+        self.channel_ids = array("H")
+        self.channels = list()  # Channel id -> name.
+        self.truncated = False  # True if the last event was cut short, as when a recorder is killed mid-write.
+        self._by_channel = dict()
+        self._scan()
+
+    def _scan(self):
+        channel_lookup = dict()
+        buffer = self.map
+        size = len(buffer)
+        offset = 0
+        while offset + EVENT_HEADER.size <= size:
+            sync, _, utime, channel_length, data_length = EVENT_HEADER.unpack_from(buffer, offset)
+            if sync != SYNC_WORD:
+                raise ValueError(f"{self.path}: no event sync word at byte {offset}. Not an LCM log, or corrupt.")
+            channel_start = offset + EVENT_HEADER.size
+            data_start = channel_start + channel_length
+            end = data_start + data_length
+            if end > size:
+                self.truncated = True
+                return
+            name = buffer[channel_start:data_start]
+            channel_id = channel_lookup.get(name)
+            if channel_id is None:
+                channel_id = channel_lookup[name] = self._channel_id(name.decode())
+            self.utimes.append(utime)
+            self.data_offsets.append(data_start)
+            self.data_lengths.append(data_length)
+            self.channel_ids.append(channel_id)
+            offset = end
+        self.truncated = offset != size
+
+    def _channel_id(self, name: str) -> int:
+        # Moves recorded with move regions on count as plain REPORT_MOVE, so they replay the same way. The copies
+        # sent on leaving a tile keep their own name and aren't replayed.
+        if name.startswith(f"{Channels.REPORT_MOVE}/"):
+            name = Channels.REPORT_MOVE
+        if name not in self.channels:
+            self.channels.append(name)
+        return self.channels.index(name)
+
+    def __len__(self) -> int:
+        return len(self.utimes)
+
+    def channel(self, idx: int) -> str:
+        return self.channels[self.channel_ids[idx]]
+
+    def data(self, idx: int) -> bytes:
+        start = self.data_offsets[idx]
+        return self.map[start:start + self.data_lengths[idx]]
+
+    def utime(self, idx: int) -> int:
+        return self.utimes[idx]
+
+    def find_time(self, seconds: float) -> int:
+        """Index of the first event at least `seconds` after the start of the log."""
+        if not self.utimes:
+            return 0
+        return bisect.bisect_left(self.utimes, self.utimes[0] + int(seconds * 1e6))
+
+    def events_on(self, channel: str, start: int = 0, stop: int | None = None) -> list[int]:
+        """Indices of the events on `channel` within [start, stop), in log order."""
+        indices = self._by_channel.get(channel)
+        if indices is None:
+            channel_id = self.channels.index(channel) if channel in self.channels else -1
+            indices = self._by_channel[channel] = [idx for idx, cid in enumerate(self.channel_ids) if cid == channel_id]
+        stop = len(self) if stop is None else stop
+        return indices[bisect.bisect_left(indices, start):bisect.bisect_left(indices, stop)]
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+
+@dataclass
+class ReplayResult:
+    events: int  # Events played back, not counting the fast-forward.
+    wall_seconds: float
+    completed: bool
+    recorded_tags: list[int] = field(default_factory=list)  # Freezes the recorded game sent during playback.
+    replay_tags: list[int] = field(default_factory=list)  # Freezes the replayed GameNode sent.
+
+    @property
+    def events_per_second(self) -> float:
+        return self.events / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    @property
+    def mismatched_tags(self) -> set[int]:
+        """Hiders tagged in only one of the recorded game and the replay."""
+        return set(self.recorded_tags) ^ set(self.replay_tags)
+
+
+class Replayer:
+    def __init__(
+            self,
+            index: EventLogIndex,
+            board_shape: tuple[int, int] | None = None,
+            verbose: bool = False,
+            movement_backend: str = "dict",
+    ):
+        self.index = index
+        ready_ids = [node_id for node_id, _ in self._ready_reports(0, len(index))]
+        if not ready_ids:
+            raise ValueError(f"{index.path} has no ready reports to build a game from.")
+        # game.run numbers the hiders 0..n-1 and the seekers from n+1, so the first unused id splits them.
+        # Without a gap, the highest id is the one 'it'.
+        ready = set(ready_ids)
+        gap = next(node_id for node_id in range(len(ready) + 1) if node_id not in ready)
+        it_ids = sorted(node_id for node_id in ready if node_id > gap) or [max(ready)]
+        if board_shape is None:
+            board_shape = self.infer_board_shape()
+        self.bus = LocalBus()
+        self.game = GameNode(board_shape=board_shape, node_count=len(ready) - len(it_ids), it_id=it_ids[0], verbose=verbose,
+                             movement_backend=movement_backend, it_ids=it_ids)
+        self.game.lc = self.bus
+        self.game.running = True
+        self.game.on_start()
+        self.replay_tags = list()
+        self.recorded_tags = list()
+        self.replay_freezes = DuplicateFilter()
+        self.recorded_freezes = DuplicateFilter()
+        self.bus.subscribe(Channels.FREEZE, lambda channel, data: self.add_tag(self.replay_tags, self.replay_freezes, data))
+        self.position = 0  # Next event to play.
+
+    @staticmethod
+    def add_tag(tags: list[int], seen: DuplicateFilter, data: bytes):
+        # Freezes are resent until acknowledged (see reliable.py), so there may be several copies of each.
+        msg = freeze_t.decode(data)
+        if seen.first_time(msg.seq, msg.id):
+            tags.append(msg.id)
+
+    def infer_board_shape(self) -> tuple[int, int]:
+        """Smallest board holding every recorded position. Only a lower bound, but enough to replay against."""
+        width = height = 1
+        for _, (x, y) in self._ready_reports(0, len(self.index)):
+            width, height = max(width, x + 1), max(height, y + 1)
+        for node_id, (x, y) in self._moves(0, len(self.index)):
+            width, height = max(width, x + 1), max(height, y + 1)
+        return width, height
+
+    def _ready_reports(self, start: int, stop: int):
+        """(node_id, position) for every recorded ready report in [start, stop), single or batched."""
+        for idx in self.index.events_on(Channels.REPORT_READY, start, stop):
+            msg = report_ready_t.decode(self.index.data(idx))
+            yield msg.id, tuple(msg.position)
+        for idx in self.index.events_on(Channels.REPORT_READY_BATCH, start, stop):
+            msg = report_ready_batch_t.decode(self.index.data(idx))
+            yield from zip(msg.ids, (tuple(position) for position in msg.positions))
+
+    def _moves(self, start: int, stop: int):
+        """(node_id, position) for every recorded move in [start, stop), in order."""
+        moves = self.index.events_on(Channels.REPORT_MOVE, start, stop)
+        batches = self.index.events_on(Channels.REPORT_MOVE_BATCH, start, stop)
+        for idx in sorted(moves + batches) if batches else moves:
+            data = self.index.data(idx)
+            if self.index.channel(idx) == Channels.REPORT_MOVE:
+                node_id, x, y, _, _ = MOVED_CODEC.decode(data)
+                yield node_id, (x, y)
+            else:
+                node_ids, flat_positions = decode_moved_batch(data)
+                yield from zip(node_ids, zip(flat_positions[0::2], flat_positions[1::2]))
+
+    def seek(self, target: int):
+        """Jump forward to event `target` without playing every event before it."""
+        if target <= self.position:
+            return
+        for channel in (Channels.REPORT_READY, Channels.REPORT_READY_BATCH):
+            for idx in self.index.events_on(channel, self.position, target):
+                self.bus.publish(channel, self.index.data(idx))
+        last_positions = dict()
+        for node_id, position in self._moves(self.position, target):
+            last_positions[node_id] = position
+        monitor = self.game.movement_monitor
+        for node_id, position in last_positions.items():
+            monitor.set_node_position(node_id, position)
+        monitor.drain_moves()  # The recorded game already judged these moves. Tags come from its freezes.
+        for idx in self.index.events_on(Channels.FREEZE, self.position, target):
+            self.game.untagged_nodes.discard(freeze_t.decode(self.index.data(idx)).id)
+        self.position = target
+
+    def play(self, speed: float = 1.0, stop: int | None = None, step_every: int = 1) -> ReplayResult:
+        """Feed events to the GameNode up to `stop`, or until the replayed game ends.
+        `speed` is a multiple of the recorded pace. Zero or less plays as fast as possible.
+        The GameNode processes what it has been fed every `step_every` events, and whenever playback waits."""
+        stop = len(self.index) if stop is None else min(stop, len(self.index))
+        start_position = self.position
+        start_wall = time.perf_counter()
+        first_utime = self.index.utime(self.position) if self.position < stop else 0
+        since_step = 0
+        finished = False
+        while self.position < stop and not finished:
+            idx = self.position
+            if speed > 0:
+                wait = (self.index.utime(idx) - first_utime) / 1e6 / speed - (time.perf_counter() - start_wall)
+                if wait > 0:
+                    finished = self.game.step() is None
+                    since_step = 0
+                    time.sleep(wait)
+            channel = self.index.channel(idx)
+            if channel in REPLAYED_CHANNELS:
+                self.bus.publish(channel, self.index.data(idx))
+            elif channel == Channels.FREEZE:
+                self.add_tag(self.recorded_tags, self.recorded_freezes, self.index.data(idx))
+            self.position += 1
+            since_step += 1
+            if since_step >= step_every:
+                finished = self.game.step() is None
+                since_step = 0
+        if not finished and self.game.game_state == GameState.RUNNING:
+            self.game.step()
+        if finished:
+            # The recorded game's last freezes come after the move that ended the replayed game.
+            for idx in self.index.events_on(Channels.FREEZE, self.position, stop):
+                self.add_tag(self.recorded_tags, self.recorded_freezes, self.index.data(idx))
+        return ReplayResult(
+            events=self.position - start_position,
+            wall_seconds=time.perf_counter() - start_wall,
+            completed=self.game.game_state == GameState.COMPLETE,
+            recorded_tags=list(self.recorded_tags),
+            replay_tags=list(self.replay_tags),
+        )
+
+
+parser = argparse.ArgumentParser(description="Replay a game recorded with `game.py --record`.")
+parser.add_argument("log", type=str)
+parser.add_argument("--speed", type=float, default=1.0, help="Multiple of the recorded pace. 0 plays as fast as possible.")
+start = parser.add_mutually_exclusive_group()
+start.add_argument("--start", type=float, default=None, help="Seconds into the log to start playing from.")
+start.add_argument("--start-event", type=int, default=None, help="Event number to start playing from.")
+parser.add_argument("--width", type=int, default=None, help="Board width. Inferred from the recorded positions if unset.")
+parser.add_argument("--height", type=int, default=None, help="Board height. Inferred from the recorded positions if unset.")
+parser.add_argument("--ui", action="store_true", help="Draw the board while replaying.")
+parser.add_argument("--step-every", type=int, default=1, help="Events fed to the GameNode between processing passes.")
+parser.add_argument("--movement-backend", choices=MOVEMENT_BACKENDS, default="dict")
+
+
+def main():
+    args = parser.parse_args()
+    index = EventLogIndex(args.log)
+    print(f"Indexed {len(index)} events on {len(index.channels)} channels"
+          + (" (last event truncated)" if index.truncated else ""))
+    board_shape = None
+    if args.width is not None and args.height is not None:
+        board_shape = (args.width, args.height)
+    replayer = Replayer(index, board_shape=board_shape, verbose=args.ui, movement_backend=args.movement_backend)
+    if args.start is not None:
+        replayer.seek(index.find_time(args.start))
+    elif args.start_event is not None:
+        replayer.seek(args.start_event)
+    result = replayer.play(speed=args.speed, step_every=max(1, args.step_every))
+    print(f"Replayed {result.events} events in {result.wall_seconds:.3f}s ({result.events_per_second:,.0f} events/s)")
+    print(f"Recorded tags: {len(set(result.recorded_tags))}  Replay tags: {len(set(result.replay_tags))}")
+    if result.mismatched_tags:
+        print(f"Tagged in only one of the two: {sorted(result.mismatched_tags)}")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+Sharded game: the board is split into tiles, and each tile is judged by its own GameShardNode process.
+
+GameShardNode
+  - Owns one tile plus a one-cell halo around it. Moves that land outside that region are dropped unless they are a
+    resident walking out, so each shard replays and tag-checks only its own part of the board.
+  - Hands agents off at tile borders by forgetting them once they leave the region. The shard they walk into picks
+    them up from the same move report, so a handoff costs no extra messages.
+  - The halo means a hider and a seeker swapping cells across a border are both known to the shards on either side.
+    Both may send the freeze. Tags are idempotent, so that is harmless, and each shard skips hiders it hears frozen.
+  - Any non-seeker counts as untagged until someone freezes it, so a shard never needs the full roster.
+
+ShardCoordinatorNode
+  - A GameNode that doesn't judge moves. It collects ready reports, starts the game, keeps `untagged_nodes` from the
+    shards' FREEZE messages, and ends the game when none are left.
+  - It only follows moves when drawing the board or publishing world state, so both are best left off for very large
+    games.
+
+With move regions on (regions.py), each shard only subscribes to the move tiles its region overlaps. Otherwise it
+hears every move report and drops most after a bounds check.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+
+from channels import Channels
+from gamenode import GameNode, GameState
+from messages import freeze_t
+from regions import RegionSubscriptions
+from syncdigest import read_digest
+
+
+SHARD_HALO = 1  # Cells each shard also watches past its tile edges.
+
+
+@dataclass(frozen=True)
+class Region:
+    x0: int
+    y0: int
+    x1: int  # Exclusive.
+    y1: int  # Exclusive.
+
+    def contains(self, position: tuple[int, int]) -> bool:
+        return self.x0 <= position[0] < self.x1 and self.y0 <= position[1] < self.y1
+
+    def grow(self, margin: int) -> "Region":
+        return Region(self.x0 - margin, self.y0 - margin, self.x1 + margin, self.y1 + margin)
+
+
+class ShardLayout:
+    """Splits the board into `shard_count` tiles in a grid as close to square tiles as the count allows."""
+    def __init__(self, board_shape: tuple[int, int], shard_count: int):
+        assert shard_count > 0
+        self.board_shape = board_shape
+        width, height = board_shape
+        # Of the ways to write shard_count as columns x rows, take the one whose tiles are closest to square.
+        columns = min(
+            (c for c in range(1, shard_count + 1) if shard_count % c == 0),
+            key=lambda c: abs(math.log((width / c) / (height / (shard_count // c)))),
+        )
+        rows = shard_count // columns
+        assert columns <= width and rows <= height, f"Can't split a {width}x{height} board into {shard_count} tiles."
+        self.columns = columns
+        self.rows = rows
+        self.x_edges = [width * c // columns for c in range(columns + 1)]
+        self.y_edges = [height * r // rows for r in range(rows + 1)]
+
+    def __len__(self) -> int:
+        return self.columns * self.rows
+
+    def tile(self, index: int) -> Region:
+        column, row = index % self.columns, index // self.columns
+        return Region(self.x_edges[column], self.y_edges[row], self.x_edges[column + 1], self.y_edges[row + 1])
+
+
+class GameShardNode(GameNode):
+    def __init__(
+            self,
+            board_shape: tuple[int, int],
+            node_count: int,
+            it_ids: list[int],
+            tile: Region,
+            movement_backend: str = "dict",
+            subscribed=None,
+            move_regions=None,
+    ):
+        """`subscribed` is an optional multiprocessing.Event, set once we're listening so the agents can start.
+        `move_regions` is the MoveRegions the agents publish on, if any."""
+        super().__init__(board_shape=board_shape, node_count=node_count, it_id=it_ids[0], verbose=False,
+                         movement_backend=movement_backend, show_ui=False, it_ids=it_ids)
+        self.subscribed = subscribed
+        self.move_regions = move_regions
+        self.frozen_ids = set()  # Hiders tagged by us or by any other shard.
+        self.tile = tile
+        self.region = tile.grow(SHARD_HALO)
+        self.movement_monitor.move_filter = self.accept_move
+        # Runs after the journal records the move, so process_freezing still sees the walk out.
+        self.movement_monitor.add_move_listener(self.hand_off)
+
+    def on_start(self):
+        self.subscribe(Channels.REPORT_READY, self.process_ready_report)
+        self.subscribe(Channels.REPORT_READY_BATCH, self.process_ready_batch)
+        self.subscribe(Channels.BEGIN_GAME, self.handle_begin)
+        self.subscribe(Channels.FREEZE, self.handle_freeze)
+        self.subscribe(Channels.STOP_GAME, self.handle_gameover)
+        self.subscribe(Channels.SYNC_DIGEST, self.handle_digest)
+        self.enable_reliable_delivery()
+        if self.move_regions is None:
+            self.subscriptions += self.movement_monitor.register_listeners(self.lc)
+        else:
+            region = self.region
+            tiles = self.move_regions.tiles_overlapping(region.x0, region.y0, region.x1, region.y1)
+            RegionSubscriptions(self, self.move_regions, self.movement_monitor.process_move_report).follow(tiles)
+            self.subscribe(Channels.REPORT_MOVE_BATCH, self.movement_monitor.process_move_batch)
+        if self.subscribed is not None:
+            self.subscribed.set()
+
+    def on_stop(self):
+        # The coordinator ends the game, not us.
+        pass
+
+    def accept_move(self, node_id: int, position: tuple[int, int]) -> bool:
+        return self.region.contains(position) or self.movement_monitor.get_node_position(node_id) is not None
+
+    def hand_off(self, node_id: int, position: tuple[int, int]):
+        if not self.region.contains(position):
+            self.movement_monitor.remove_node(node_id)
+
+    def node_ready(self, node_id: int, position: tuple[int, int]):
+        if node_id in self.ready_ids:
+            return
+        self.ready_ids.add(node_id)
+        if self.region.contains(position):
+            self.movement_monitor.set_node_position(node_id, position, clear_previous=False)
+
+    def check_ready(self):
+        # The coordinator starts the game.
+        pass
+
+    def handle_begin(self, channel, data):
+        if self.game_state == GameState.STARTING:
+            self.game_state = GameState.RUNNING
+        self.notify()
+
+    def handle_digest(self, channel, data):
+        # Nobody resends BEGIN_GAME to a shard, but digests only go out once the game is on. See reliable.py.
+        if read_digest(data) is not None and self.game_state == GameState.STARTING:
+            self.game_state = GameState.RUNNING
+            self.notify()
+
+    def handle_freeze(self, channel, data):
+        # Ours or another shard's. Either way there's no need to tag it again.
+        self.frozen_ids.add(freeze_t.decode(data).id)
+
+    def tag(self, node_id: int, position: tuple[int, int], cause_id: int | None = None):
+        if node_id not in self.it_ids and node_id not in self.frozen_ids:
+            self.frozen_ids.add(node_id)
+            self.send_freeze(node_id)
+
+    def publish_sync_digest(self):
+        # The coordinator sends the digest. We only know the hiders that were ever in our tile.
+        pass
+
+    def handle_gameover(self, channel, data):
+        self.game_state = GameState.COMPLETE
+        self.notify()
+
+    def check_gameover(self):
+        # Only the coordinator can tell when every hider is tagged.
+        pass
+
+    def finish(self):
+        pass
+
+
+class ShardCoordinatorNode(GameNode):
+    """Runs the game around the shards: readiness, the start message, tag bookkeeping, and game over."""
+    def on_start(self):
+        self.started_at = time.monotonic()
+        self.subscribe(Channels.REPORT_READY, self.process_ready_report)
+        self.subscribe(Channels.REPORT_READY_BATCH, self.process_ready_batch)
+        self.subscribe(Channels.REPORT_STATUS, self.process_status_update)
+        self.subscribe(Channels.FREEZE, self.process_shard_freeze)
+        self.enable_reliable_delivery()
+        if self.board_model is not None or self.world_state is not None:
+            self.subscriptions += self.movement_monitor.register_listeners(self.lc)
+        self.node_reports = 0
+
+    def process_freezing(self):
+        # The shards judge the moves.
+        moves = self.movement_monitor.drain_moves()
+        if self.world_state is not None:
+            self.world_state.record_moves(moves)
+
+    def process_shard_freeze(self, channel, data):
+        msg = freeze_t.decode(data)
+        if msg.id in self.untagged_nodes:
+            self.untagged_nodes.remove(msg.id)
+            if self.world_state is not None:
+                self.world_state.record_freeze(msg.id)
+            self.report_event(f"{msg.id} was tagged")
+        self.notify()
@@ -0,0 +1,156 @@
+"""
+Headless game engine.
+Runs a whole game in one process on a discrete tick, reusing the GameNode, ItNode, and NotItNode logic.
+Nodes talk over a LocalBus instead of LCM, so there are no sockets, subprocesses, or sleeps.
+
+One tick is one 'it' move. Hiders move every `hider_period` ticks, which mirrors NOT_IT_MOVE_SPEED / IT_MOVE_SPEED.
+Pass a list of 'it' positions to play with several seekers. They move in id order, each tick.
+
+Usage:
+    result = simulate((10, 10), [(3, 3), (4, 4)], (0, 0))
+    print(result.ticks, result.tag_order)
+"""
+
+from dataclasses import dataclass, field
+
+from channels import Channels
+from gamenode import GameNode, GameState
+from itnode import ItNode
+from localbus import LocalBus
+from messages import freeze_t
+from notitnode import NotItNode
+
+
+DEFAULT_HIDER_PERIOD = 2  # Hiders move once per second, the 'it' once every half second.
+DEFAULT_MAX_TICKS = 100_000  # Guard against games that can never end, like a hider on a 1x1 board out of reach.
+
+
+@dataclass
+class SimulationResult:
+    ticks: int  # Number of ticks until the game ended, or until max_ticks if it never did.
+    completed: bool
+    tag_order: list[tuple[int, int]] = field(default_factory=list)  # (tick, node_id) in the order tags happened.
+    trajectories: dict[int, list[tuple[int, int]]] = field(default_factory=dict)  # node_id -> positions, start first.
+
+
+class HeadlessGame:
+    def __init__(
+            self,
+            board_shape: tuple[int, int],
+            not_it_positions: list[tuple[int, int]],
+            it_position: tuple[int, int] | list[tuple[int, int]],
+            hider_period: int = DEFAULT_HIDER_PERIOD,
+            record_trajectories: bool = True,
+            movement_backend: str = "dict",
+            pursuit: str = "intercept",
+            seed: int | None = None,
+    ):
+        """`seed` seeds each node's own RNG the way game.py's --seed does, so a seeded game here is the same game."""
+        assert hider_period > 0
+        self.board_shape = board_shape
+        self.hider_period = hider_period
+        self.record_trajectories = record_trajectories
+        self.bus = LocalBus()
+        self.tick_count = 0
+        self.tag_order = list()
+        self.trajectories = dict()
+
+        # Same id layout as game.run.
+        it_positions = [it_position] if isinstance(it_position, tuple) else list(it_position)
+        it_ids = [len(not_it_positions) + 1 + idx for idx in range(len(it_positions))]
+        self.game_node = GameNode(board_shape=board_shape, node_count=len(not_it_positions), it_id=it_ids[0], verbose=False,
+                                  movement_backend=movement_backend, it_ids=it_ids)
+        self.it_nodes = [
+            ItNode(node_id=it_id, start_position=position, board_shape=board_shape, move_frequency=0,
+                   movement_backend=movement_backend, pursuit=pursuit, seeker_ids=it_ids, seed=seed)
+            for it_id, position in zip(it_ids, it_positions)
+        ]
+        self.it_node = self.it_nodes[0]
+        self.hiders = [
+            NotItNode(node_id=idx, start_position=pos, board_shape=board_shape, move_frequency=0, seed=seed)
+            for idx, pos in enumerate(not_it_positions)
+        ]
+
+        self.bus.subscribe(Channels.FREEZE, self._record_freeze)
+        # Same launch order as game.run. The last ready report makes the GameNode publish BEGIN_GAME.
+        for node in [self.game_node] + self.it_nodes + self.hiders:
+            node.lc = self.bus
+            node.running = True
+            node.on_start()
+        assert self.game_node.game_state == GameState.RUNNING
+
+        if self.record_trajectories:
+            for node in self.it_nodes + self.hiders:
+                self.trajectories[node.node_id] = [node.current_position]
+
+        # A hider may have been placed on top of the 'it'.
+        self.game_node.process_freezing()
+        self.game_node.check_gameover()
+
+    @property
+    def complete(self) -> bool:
+        return self.game_node.game_state == GameState.COMPLETE
+
+    def step(self):
+        """Advance the game by a single tick.
+        Hiders go first so the 'it' always chases fresh positions, then tags are checked after every move."""
+        if self.tick_count % self.hider_period == 0:
+            for hider in self.hiders:
+                self._move(hider)
+            self.game_node.check_gameover()
+        for it_node in self.it_nodes:
+            if self.complete:
+                break
+            self._move(it_node)
+            self.game_node.check_gameover()
+        self.tick_count += 1
+
+    def run(self, max_ticks: int = DEFAULT_MAX_TICKS) -> SimulationResult:
+        while not self.complete and self.tick_count < max_ticks:
+            self.step()
+        for node in self.it_nodes + self.hiders:
+            node.game_over = True
+        return SimulationResult(
+            ticks=self.tick_count,
+            completed=self.complete,
+            tag_order=self.tag_order,
+            trajectories=self.trajectories,
+        )
+
+    def _move(self, node: NotItNode):
+        node.tick()
+        if node.frozen:
+            return
+        node.move_to(node.choose_move())
+        if self.record_trajectories:
+            self.trajectories[node.node_id].append(node.current_position)
+        self.game_node.process_freezing()
+
+    def _record_freeze(self, channel, data):
+        msg = freeze_t.decode(data)
+        self.tag_order.append((self.tick_count, msg.id))
+
+
+def simulate(
+        board_shape: tuple[int, int],
+        not_it_positions: list[tuple[int, int]],
+        it_position: tuple[int, int] | list[tuple[int, int]],
+        max_ticks: int = DEFAULT_MAX_TICKS,
+        hider_period: int = DEFAULT_HIDER_PERIOD,
+        seed: int | None = None,
+        record_trajectories: bool = True,
+        movement_backend: str = "dict",
+        pursuit: str = "intercept",
+) -> SimulationResult:
+    """Play one full game in-process and return the result."""
+    game = HeadlessGame(
+        board_shape=board_shape,
+        not_it_positions=not_it_positions,
+        it_position=it_position,
+        hider_period=hider_period,
+        record_trajectories=record_trajectories,
+        movement_backend=movement_backend,
+        pursuit=pursuit,
+        seed=seed,
+    )
+    return game.run(max_ticks=max_ticks)
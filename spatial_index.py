@@ -0,0 +1,149 @@
+"""
+Uniform bucket grid for nearest-neighbor queries under Manhattan distance.
+Used by the ItNode to find the nearest untagged node without scanning every id.
+
+Updates are O(1). Queries walk outward one ring of buckets at a time and stop as soon as no unvisited bucket can
+hold anything closer than the best hit so far. The bucket size follows the population so each bucket holds a few
+entries on average.
+"""
+
+import math
+
+
+TARGET_PER_BUCKET = 4  # Average entries per bucket we aim for.
+REBUCKET_FACTOR = 2  # Rebuild once the ideal bucket size drifts this far from the current one.
+
+
+class BucketGrid:
+    def __init__(self, board_shape: tuple[int, int], bucket_size: int | None = None):
+        assert board_shape[0] > 0 and board_shape[1] > 0
+        self.board_shape = board_shape
+        self.fixed_bucket_size = bucket_size is not None
+        self.bucket_size = bucket_size or max(board_shape)
+        self.buckets = dict()  # (bx, by) -> {node_id: position}
+        self.node_to_bucket = dict()
+
+    def __len__(self) -> int:
+        return len(self.node_to_bucket)
+
+    def __contains__(self, node_id: int) -> bool:
+        return node_id in self.node_to_bucket
+
+    def get(self, node_id: int) -> tuple[int, int] | None:
+        key = self.node_to_bucket.get(node_id)
+        return None if key is None else self.buckets[key][node_id]
+
+    def update(self, node_id: int, position: tuple[int, int]):
+        """Insert a node or move it to a new position."""
+        key = (position[0] // self.bucket_size, position[1] // self.bucket_size)
+        previous_key = self.node_to_bucket.get(node_id)
+        if previous_key is not None and previous_key != key:
+            self._discard(node_id, previous_key)
+        self.buckets.setdefault(key, dict())[node_id] = position
+        self.node_to_bucket[node_id] = key
+        if previous_key is None:
+            self._maybe_rebucket()
+
+    def remove(self, node_id: int):
+        key = self.node_to_bucket.pop(node_id, None)
+        if key is not None:
+            self._discard(node_id, key)
+            self._maybe_rebucket()
+
+    def nearest(self, position: tuple[int, int]) -> tuple[int, tuple[int, int]] | None:
+        """Return (node_id, position) of the entry nearest to `position`, or None if the grid is empty.
+        Ties go to the lowest id, so the answer doesn't depend on the order updates arrived in."""
+        if not self.node_to_bucket:
+            return None
+        size = self.bucket_size
+        qx, qy = position
+        qbx, qby = qx // size, qy // size
+        max_bx = (self.board_shape[0] - 1) // size
+        max_by = (self.board_shape[1] - 1) // size
+        max_ring = max(qbx, max_bx - qbx, qby, max_by - qby, 0)
+        best_distance = None
+        best = None
+        for ring in range(max_ring + 1):
+            # Everything in this ring is at least this far away along one axis.
+            if best_distance is not None and best_distance < (ring - 1) * size + 1:
+                break
+            for key in self._ring(qbx, qby, ring, max_bx, max_by):
+                bucket = self.buckets.get(key)
+                if not bucket:
+                    continue
+                if best_distance is not None and self._bucket_distance(key, qx, qy) > best_distance:
+                    continue
+                for node_id, (x, y) in bucket.items():
+                    distance = abs(x - qx) + abs(y - qy)
+                    if best_distance is None or distance < best_distance or (distance == best_distance and node_id < best[0]):
+                        best_distance = distance
+                        best = (node_id, (x, y))
+        return best
+
+    def within(self, position: tuple[int, int], radius: int) -> list[tuple[int, tuple[int, int]]]:
+        """Every (node_id, position) at most `radius` from `position`, in no particular order."""
+        size = self.bucket_size
+        qx, qy = position
+        qbx, qby = qx // size, qy // size
+        max_bx = (self.board_shape[0] - 1) // size
+        max_by = (self.board_shape[1] - 1) // size
+        max_ring = max(qbx, max_bx - qbx, qby, max_by - qby, 0)
+        found = list()
+        for ring in range(max_ring + 1):
+            if radius < (ring - 1) * size + 1:
+                break
+            for key in self._ring(qbx, qby, ring, max_bx, max_by):
+                bucket = self.buckets.get(key)
+                if not bucket or self._bucket_distance(key, qx, qy) > radius:
+                    continue
+                for node_id, (x, y) in bucket.items():
+                    if abs(x - qx) + abs(y - qy) <= radius:
+                        found.append((node_id, (x, y)))
+        return found
+
+    def _ring(self, cx: int, cy: int, ring: int, max_bx: int, max_by: int):
+        """Bucket keys whose Chebyshev distance to (cx, cy) is exactly `ring`, clipped to the board."""
+        if ring == 0:
+            yield cx, cy
+            return
+        x0, x1 = cx - ring, cx + ring
+        y0, y1 = cy - ring, cy + ring
+        for bx in range(max(x0, 0), min(x1, max_bx) + 1):
+            if y0 >= 0:
+                yield bx, y0
+            if y1 <= max_by:
+                yield bx, y1
+        for by in range(max(y0 + 1, 0), min(y1 - 1, max_by) + 1):
+            if x0 >= 0:
+                yield x0, by
+            if x1 <= max_bx:
+                yield x1, by
+
+    def _bucket_distance(self, key: tuple[int, int], qx: int, qy: int) -> int:
+        """Smallest Manhattan distance from the query to any cell in the bucket."""
+        size = self.bucket_size
+        left, top = key[0] * size, key[1] * size
+        dx = max(left - qx, 0, qx - (left + size - 1))
+        dy = max(top - qy, 0, qy - (top + size - 1))
+        return dx + dy
+
+    def _discard(self, node_id: int, key: tuple[int, int]):
+        bucket = self.buckets[key]
+        del bucket[node_id]
+        if not bucket:
+            del self.buckets[key]
+
+    def _maybe_rebucket(self):
+        if self.fixed_bucket_size:
+            return
+        area = self.board_shape[0] * self.board_shape[1]
+        ideal = max(1, round(math.sqrt(area * TARGET_PER_BUCKET / max(1, len(self.node_to_bucket)))))
+        if ideal * REBUCKET_FACTOR <= self.bucket_size or ideal >= self.bucket_size * REBUCKET_FACTOR:
+            entries = [item for bucket in self.buckets.values() for item in bucket.items()]
+            self.bucket_size = ideal
+            self.buckets = dict()
+            self.node_to_bucket = dict()
+            for node_id, position in entries:
+                key = (position[0] // ideal, position[1] // ideal)
+                self.buckets.setdefault(key, dict())[node_id] = position
+                self.node_to_bucket[node_id] = key
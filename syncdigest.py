@@ -0,0 +1,59 @@
+"""
+Anti-entropy for who is frozen, in place of every node reporting its status on a timer.
+
+Once the game is on, the GameNode broadcasts a `sync_digest_t` every SYNC_DIGEST_PERIOD seconds: one bit per hider,
+set if the game has it frozen, and a crc32 of those bits. Each node, or agent host for all of its agents at once,
+checks its own bits and sends a `report_status_t` only for the ones that disagree. The GameNode then repairs just
+those ids, as it always has. In the steady state that is one small message per period, whatever the agent count,
+so the period can be far shorter than the old status timer.
+
+A digest only goes out while the game is running, so receiving one also tells a node that missed the start that the
+game is on.
+"""
+
+import zlib
+
+import numpy as np
+
+from messages import sync_digest_t
+from worldstate import pack_flags
+
+
+SYNC_DIGEST_PERIOD = 1.0  # Seconds between digests.
+
+
+def make_digest(seq: int, node_count: int, frozen_ids) -> sync_digest_t:
+    """The digest for hiders 0..node_count-1, with `frozen_ids` frozen."""
+    flags = np.zeros(node_count, dtype=bool)
+    flags[np.fromiter((node_id for node_id in frozen_ids if 0 <= node_id < node_count), dtype=np.intp)] = True
+    msg = sync_digest_t()
+    msg.seq = seq
+    msg.node_count = node_count
+    msg.frozen = pack_flags(flags)
+    msg.frozen_size = len(msg.frozen)
+    msg.checksum = zlib.crc32(msg.frozen)
+    return msg
+
+
+def read_digest(data: bytes) -> sync_digest_t | None:
+    """Decode a digest, or None if its bits don't match its checksum."""
+    msg = sync_digest_t.decode(data)
+    if zlib.crc32(msg.frozen) != msg.checksum:
+        return None
+    return msg
+
+
+def digest_frozen(msg: sync_digest_t, node_ids: np.ndarray) -> np.ndarray:
+    """Whether the digest has each of `node_ids` frozen. Ids past its hiders, the seekers, are never frozen."""
+    bits = np.unpackbits(np.frombuffer(msg.frozen, dtype=np.uint8), count=msg.node_count, bitorder="little")
+    covered = node_ids < msg.node_count
+    frozen = np.zeros(len(node_ids), dtype=bool)
+    frozen[covered] = bits[node_ids[covered]].astype(bool)
+    return frozen
+
+
+def digest_has_frozen(msg: sync_digest_t, node_id: int) -> bool:
+    """`digest_frozen` for a single id, without unpacking the rest."""
+    if not 0 <= node_id < msg.node_count:
+        return False
+    return bool(msg.frozen[node_id >> 3] >> (node_id & 7) & 1)
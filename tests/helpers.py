@@ -0,0 +1,12 @@
+"""Message builders shared by the tests."""
+
+from messages import report_ready_t
+
+
+def ready_report(node_id: int, position: tuple[int, int]) -> bytes:
+    """An encoded report_ready_t on the current schema."""
+    msg = report_ready_t()
+    msg.schema_version = report_ready_t.SCHEMA_VERSION
+    msg.id = node_id
+    msg.position = position
+    return msg.encode()
@@ -0,0 +1,46 @@
+import unittest
+
+from agenthost import AgentHostNode
+from channels import Channels
+from gamenode import GameNode, GameState
+from localbus import LocalBus
+from messages import freeze_t
+from tests.helpers import ready_report
+
+class TestAgentHost(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = LocalBus()
+        self.game = GameNode(board_shape=(5, 5), node_count=3, it_id=4, verbose=False)
+        self.host = AgentHostNode(agents=[(0, (0, 0)), (1, (2, 2)), (2, (4, 4))], board_shape=(5, 5), move_frequency=1.0, seed=0)
+        for node in [self.game, self.host]:
+            node.lc = self.bus
+            node.on_start()
+
+    def test_reports_every_agent(self):
+        self.assertEqual(self.game.node_reports, 3)
+        self.assertEqual(self.game.untagged_nodes, {0, 1, 2})
+
+    def test_tick_moves_unfrozen_agents_in_one_batch(self):
+        batches = list()
+        self.bus.subscribe(Channels.REPORT_MOVE_BATCH, lambda channel, data: batches.append(data))
+        msg = freeze_t()
+        msg.id = 1
+        self.bus.publish(Channels.FREEZE, msg.encode())
+        self.host.tick()
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(self.game.movement_monitor.get_node_position(1), (2, 2))
+        for node_id, start in [(0, (0, 0)), (2, (4, 4))]:
+            x, y = self.game.movement_monitor.get_node_position(node_id)
+            self.assertEqual(abs(x - start[0]) + abs(y - start[1]), 1)
+
+    def test_game_start(self):
+        self.game.process_ready_report(Channels.REPORT_READY, self._it_ready())
+        self.assertEqual(self.game.game_state, GameState.RUNNING)
+        self.assertTrue(self.host.game_started)
+
+    def _it_ready(self):
+        return ready_report(4, (1, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import unittest
+
+import numpy as np
+
+from batch_simulator import BatchSimulator, random_steps, simulate_batch
+
+class TestBatchSimulator(unittest.TestCase):
+
+    def test_random_steps_stay_in_bounds(self):
+        rng = np.random.default_rng(0)
+        positions = np.zeros((1000, 2), dtype=np.int32)  # Corner, so only two legal moves.
+        stepped = random_steps(positions, np.array([3, 3]), rng)
+        self.assertEqual(set(map(tuple, stepped.tolist())), {(1, 0), (0, 1)})
+
+    def test_batch_completes(self):
+        hiders = np.array([[[0, 0], [4, 4]], [[2, 3], [1, 1]]])
+        its = np.array([[2, 2], [0, 4]])
+        result = simulate_batch((5, 5), hiders, its, seed=1)
+        self.assertTrue(result.completed.all())
+        self.assertTrue((result.ticks > 0).all())
+
+    def test_masked_hiders_are_ignored(self):
+        hiders = np.array([[[1, 1], [3, 3]]])
+        sim = BatchSimulator((4, 4), hiders, np.array([[1, 1]]), hider_mask=np.array([[True, False]]))
+        self.assertTrue(sim.complete.all())
+
+if __name__ == '__main__':
+    unittest.main()
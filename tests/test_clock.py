@@ -0,0 +1,113 @@
+import threading
+import unittest
+
+from channels import Channels
+from clock import HIDER_PHASE, IT_PHASE, VirtualClock
+from gamenode import GameNode
+from localbus import LocalBus
+from messages import moved_t, tick_ack_t, tick_t
+from tests.helpers import ready_report
+
+class TestVirtualClock(unittest.TestCase):
+
+    def sleep_in_thread(self, clock, seconds):
+        thread = threading.Thread(target=clock.sleep, args=(seconds,), daemon=True)
+        thread.start()
+        return thread
+
+    def test_sleep_waits_for_ticks_and_acknowledges(self):
+        clock = VirtualClock(0.5)
+        acks = list()
+        clock.on_tick_done = acks.append
+        thread = self.sleep_in_thread(clock, 1.0)
+        clock.handle_tick(1, 0)
+        thread.join(0.05)
+        self.assertTrue(thread.is_alive())
+        clock.handle_tick(2, 0)
+        thread.join(1.0)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(acks, [1])  # Tick 2 is acknowledged by the next sleep, once our move is out.
+        self.assertEqual(clock.now(), 1.0)
+        # A resend of a tick we already finished is acknowledged again.
+        clock.handle_tick(1, 0)
+        self.assertEqual(acks, [1, 1])
+
+    def test_waits_to_catch_up_on_moves(self):
+        clock = VirtualClock(0.5, IT_PHASE)
+        seen = [0]
+        clock.caught_up = lambda moves_total: seen[0] >= moves_total
+        thread = self.sleep_in_thread(clock, 0.5)
+        clock.handle_tick(1, 3)
+        thread.join(0.05)
+        self.assertTrue(thread.is_alive())
+        seen[0] = 3
+        clock.poke()
+        thread.join(1.0)
+        self.assertFalse(thread.is_alive())
+
+    def test_stop_releases_sleep(self):
+        clock = VirtualClock(0.5)
+        thread = self.sleep_in_thread(clock, 10.0)
+        clock.stop()
+        thread.join(1.0)
+        self.assertFalse(thread.is_alive())
+
+
+class TestLockstepGameNode(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = LocalBus()
+        self.game = GameNode(board_shape=(5, 5), node_count=1, it_id=1, verbose=False, lockstep=True)
+        self.game.lc = self.bus
+        self.game.on_start()
+        self.ticks = list()
+        self.bus.subscribe(Channels.TICK, lambda channel, data: self.ticks.append(self.decode_tick(data)))
+        for node_id, position in [(0, (0, 0)), (1, (4, 4))]:
+            self.bus.publish(Channels.REPORT_READY, ready_report(node_id, position))
+
+    def decode_tick(self, data):
+        msg = tick_t.decode(data)
+        return msg.tick, msg.phase, msg.moves_total
+
+    def ack(self, node_id, tick, phase, moves_sent):
+        msg = tick_ack_t()
+        msg.tick = tick
+        msg.phase = phase
+        msg.moves_sent = moves_sent
+        msg.ids = [node_id]
+        msg.count = 1
+        self.bus.publish(Channels.TICK_ACK, msg.encode())
+
+    def move(self, node_id, position):
+        msg = moved_t()
+        msg.id = node_id
+        msg.new_position = position
+        self.bus.publish(Channels.REPORT_MOVE, msg.encode())
+
+    def test_ticks_wait_for_acks_and_moves(self):
+        self.game.step()
+        self.assertEqual(self.ticks, [(1, HIDER_PHASE, 0)])
+        # The hider says it moved, but the move hasn't arrived yet.
+        self.ack(0, 1, HIDER_PHASE, moves_sent=1)
+        self.game.step()
+        self.assertEqual(len(self.ticks), 1)
+        self.move(0, (1, 0))
+        self.game.step()
+        self.assertEqual(self.ticks[-1], (1, IT_PHASE, 1))
+        # A late acknowledgement of the last phase doesn't count towards this one.
+        self.ack(0, 1, HIDER_PHASE, moves_sent=1)
+        self.game.step()
+        self.assertEqual(len(self.ticks), 2)
+        self.ack(1, 1, IT_PHASE, moves_sent=0)
+        self.game.step()
+        self.assertEqual(self.ticks[-1], (2, HIDER_PHASE, 1))
+
+    def test_resends_unacknowledged_tick(self):
+        self.game.step()
+        self.game.last_tick_sent = 0.0
+        with self.assertLogs(level="WARNING"):
+            self.game.step()
+        self.assertEqual(self.ticks, [(1, HIDER_PHASE, 0)] * 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import random
+import unittest
+
+from channels import Channels
+from eventloop import EventLoopRuntime
+from gamenode import GameNode, GameState
+from itnode import ItNode
+from localbus import LocalBus
+from messages import freeze_t
+from node import Node
+from notitnode import NotItNode
+
+class Listener(Node):
+    """Stops after seeing one freeze, handled by an async handler."""
+    def __init__(self):
+        super().__init__()
+        self.seen = list()
+        self.stopped = False
+
+    def on_start(self):
+        self.subscribe(Channels.FREEZE, self.handle_freeze)
+
+    async def handle_freeze(self, channel, data):
+        self.seen.append(freeze_t.decode(data).id)
+        self.wake_soon()
+
+    def step(self):
+        return None if self.seen else 60.0
+
+    def on_stop(self):
+        self.stopped = True
+
+class TestEventLoopRuntime(unittest.TestCase):
+
+    def test_whole_game_on_one_loop(self):
+        random.seed(0)
+        bus = LocalBus()
+        runtime = EventLoopRuntime(bus)
+        game = GameNode(board_shape=(4, 4), node_count=2, it_id=2, verbose=False)
+        nodes = [
+            game,
+            ItNode(node_id=2, start_position=(3, 3), board_shape=(4, 4), move_frequency=0.001),
+            NotItNode(node_id=0, start_position=(0, 0), board_shape=(4, 4), move_frequency=0.002),
+            NotItNode(node_id=1, start_position=(0, 3), board_shape=(4, 4), move_frequency=0.002),
+        ]
+        for node in nodes:
+            runtime.add_node(node)
+        runtime.run()
+        self.assertEqual(game.game_state, GameState.COMPLETE)
+        self.assertTrue(all(node.game_over for node in nodes[1:]))
+        self.assertEqual(bus.subscriptions, [])
+
+    def test_async_handler_and_wake(self):
+        bus = LocalBus()
+        runtime = EventLoopRuntime(bus)
+        listener = Listener()
+        sender = Listener()
+        sender.step = lambda: self._send_freeze(bus)
+        runtime.add_node(listener)
+        runtime.add_node(sender)
+        runtime.run()
+        self.assertEqual(listener.seen, [7])
+        self.assertTrue(listener.stopped)
+
+    def test_rejects_thread_only_node(self):
+        class ThreadOnly(Node):
+            def on_start(self):
+                pass
+
+            def run(self):
+                pass
+
+            def on_stop(self):
+                pass
+
+        with self.assertRaises(TypeError):
+            EventLoopRuntime(LocalBus()).add_node(ThreadOnly())
+
+    def _send_freeze(self, bus):
+        msg = freeze_t()
+        msg.id = 7
+        bus.publish(Channels.FREEZE, msg.encode())
+        return None
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from fast_codec import FastCodec, decode_moved_batch, encode_moved_batch
+from messages import freeze_t, moved_batch_t, moved_t, report_status_t
+
+class TestFastCodec(unittest.TestCase):
+
+    def test_matches_generated_encoding(self):
+        msg = report_status_t()
+        msg.id = 70_000
+        msg.position = (12, -3)
+        msg.game_started = True
+        msg.frozen = False
+        msg.received_time_ns = 2**40
+        codec = FastCodec(report_status_t)
+        self.assertEqual(codec.encode(msg), msg.encode())
+        self.assertEqual(codec.decode(msg.encode()), (70_000, 12, -3, 1, 0, 0, 0, 2**40))
+
+    def test_decode_into_reuses_instance(self):
+        msg = moved_t()
+        msg.id = 5
+        msg.new_position = (1, 2)
+        codec = FastCodec(moved_t)
+        target = moved_t()
+        self.assertIs(codec.decode_into(msg.encode(), target), target)
+        self.assertEqual((target.id, tuple(target.new_position)), (5, (1, 2)))
+
+    def test_pack_into_and_fingerprint_check(self):
+        codec = FastCodec(freeze_t)
+        buffer = bytearray(2 * codec.size)
+        msg = freeze_t()
+        msg.id = 9
+        msg.seq = 3
+        offset = codec.pack_into(buffer, 0, msg)
+        self.assertEqual(codec.decode(memoryview(buffer)[:offset]), (9, 3, 0, 0))
+        with self.assertRaises(ValueError):
+            FastCodec(moved_t).decode(bytes(buffer))
+
+    def test_moved_batch(self):
+        msg = moved_batch_t()
+        msg.count = 2
+        msg.ids = [3, 4]
+        msg.new_positions = [(1, 2), (5, 6)]
+        self.assertEqual(encode_moved_batch([3, 4], [1, 2, 5, 6]), msg.encode())
+        self.assertEqual(decode_moved_batch(msg.encode()), ((3, 4), (1, 2, 5, 6)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from gamenode import GameNode
+from latency import LatencyHistogram, LatencyStats
+from localbus import LocalBus
+from notitnode import NotItNode
+
+class TestLatency(unittest.TestCase):
+
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for latency_ns in [1_000] * 90 + [1_000_000] * 10:
+            histogram.record(latency_ns)
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.percentile(0.5), 1024)
+        self.assertEqual(histogram.percentile(0.99), 1_000_000)
+        self.assertAlmostEqual(histogram.summary()["mean_ms"], 0.1009)
+
+    def test_drops_and_reorders(self):
+        stats = LatencyStats()
+        for seq in [1, 2, 5, 4, 6]:
+            stats.record_move(7, seq, send_time_ns=seq * 1000, now_ns=seq * 1000 + 500)
+        self.assertEqual(stats.drops[7], 1)  # 3 never came, 4 came late.
+        self.assertEqual(stats.reorders[7], 1)
+        self.assertEqual(stats.last_move_time(7), 6000)
+        self.assertEqual(stats.agent_move_latency[7].max_ns, 500)
+
+    def test_tag_round_trip_through_freeze_echo(self):
+        bus = LocalBus()
+        game = GameNode(board_shape=(3, 3), node_count=1, it_id=1, verbose=False, track_latency=True)
+        hider = NotItNode(0, start_position=(0, 0), board_shape=(3, 3), move_frequency=1.0)
+        it = NotItNode(1, start_position=(2, 0), board_shape=(3, 3), move_frequency=1.0)
+        for node in [game, hider, it]:
+            node.lc = bus
+            node.on_start()
+        game.process_freezing()
+        it.move_to((1, 0))
+        it.move_to((0, 0))
+        game.process_freezing()
+        self.assertTrue(hider.frozen)
+        summary = game.latency_stats.summary()
+        self.assertEqual(summary["move"]["count"], 2)
+        self.assertEqual(summary["round_trip"]["count"], 1)
+        self.assertEqual(summary["tag"]["count"], 1)
+        self.assertEqual(summary["drops"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from channels import Channels
+from localbus import LocalBus
+from move_batcher import MoveBatcher
+from movement_monitor import MovementMonitor
+
+class TestMoveBatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = LocalBus()
+        self.monitor = MovementMonitor()
+        self.monitor.register_listeners(self.bus)
+        self.packets = list()
+        self.bus.subscribe(Channels.REPORT_MOVE_BATCH, lambda channel, data: self.packets.append(data))
+
+    def publish(self, channel, msg):
+        self.bus.publish(channel, msg.encode())
+
+    def test_batch_applies_in_order(self):
+        batcher = MoveBatcher(self.publish, window=10.0)
+        batcher.add(1, (0, 0))
+        batcher.add(2, (3, 3))
+        batcher.add(1, (0, 1))
+        self.assertEqual(self.packets, [])
+        batcher.flush()
+        self.assertEqual(len(self.packets), 1)
+        self.assertEqual(self.monitor.get_node_position(1), (0, 1))
+        self.assertEqual(self.monitor.get_nodes_at_position((0, 0)), [])
+        self.assertEqual(self.monitor.get_last_movers(), {1, 2})
+
+    def test_window_and_size_limits(self):
+        batcher = MoveBatcher(self.publish, window=1.0, max_batch_size=2)
+        batcher.add(1, (0, 0))
+        batcher.maybe_flush(now=batcher.first_buffered + 0.5)
+        self.assertEqual(len(self.packets), 0)
+        batcher.maybe_flush(now=batcher.first_buffered + 0.5, lookahead=0.5)
+        self.assertEqual(len(self.packets), 1)
+        batcher.add(1, (1, 0))
+        batcher.add(2, (2, 0))
+        self.assertEqual(len(self.packets), 2)
+        self.assertEqual(batcher.moves_sent, 3)
+
+if __name__ == '__main__':
+    unittest.main()
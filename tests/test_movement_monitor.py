@@ -2,7 +2,7 @@
 
 import unittest
 
-from movement_monitor import MovementMonitor
+from movement_monitor import GridMovementMonitor, MovementMonitor, make_movement_monitor
 
 class TestMovementMonitor(unittest.TestCase):
 
@@ -32,5 +32,68 @@ class TestMovementMonitor(unittest.TestCase):
         last_moved = mm.get_last_movers()
         self.assertEqual(last_moved, set())
 
+
+class TestGridMovementMonitor(unittest.TestCase):
+
+    def test_move(self):
+        mm = GridMovementMonitor((4, 4))
+        mm.set_node_position(1, (1, 2))
+        self.assertEqual(mm.get_node_position(1), (1, 2))
+        self.assertEqual(mm.get_nodes_at_position((1, 2)), [1])
+        mm.set_node_position(1, (2, 2))
+        self.assertEqual(len(mm.get_nodes_at_position((1, 2))), 0)
+        self.assertEqual(mm.get_nodes_at_position((2, 2)), [1])
+
+    def test_shared_cell(self):
+        mm = GridMovementMonitor((3, 3))
+        for node_id in [0, 5, 9]:
+            mm.set_node_position(node_id, (1, 1), clear_previous=False)
+        mm.set_node_position(5, (0, 0))
+        occupants = mm.get_nodes_at_position((1, 1))
+        self.assertEqual(sorted(occupants), [0, 9])
+        self.assertIn(9, occupants)
+        self.assertNotIn(5, occupants)
+
+    def test_off_board_and_unknown(self):
+        mm = GridMovementMonitor((2, 2))
+        mm.set_node_position(0, (5, 5))
+        self.assertEqual(mm.get_node_position(0), (5, 5))
+        self.assertEqual(len(mm.get_nodes_at_position((5, 5))), 0)
+        self.assertIsNone(mm.get_node_position(300))
+
+    def test_factory(self):
+        self.assertIsInstance(make_movement_monitor("grid", (2, 2)), GridMovementMonitor)
+        with self.assertRaises(ValueError):
+            make_movement_monitor("octree", (2, 2))
+
+
+class TestBatchedMoves(unittest.TestCase):
+    """A batch leaves a monitor just as the same moves applied one by one would."""
+
+    def check_backend(self, backend):
+        ids = [0, 1, 0, 2, 1, 7]
+        positions = [(1, 1), (1, 1), (2, 1), (1, 1), (0, 0), (9, 9)]
+        one_by_one = make_movement_monitor(backend, (4, 4))
+        batched = make_movement_monitor(backend, (4, 4))
+        heard = list()
+        for mm in (one_by_one, batched):
+            mm.set_node_position(2, (3, 3), clear_previous=False)
+            mm.enable_move_journal()
+            mm.add_move_listener(lambda node_id, position, mm=mm: heard.append((mm is batched, node_id, position)))
+        for node_id, position in zip(ids, positions):
+            one_by_one.set_node_position(node_id, position)
+        batched.set_node_positions(ids, iter(positions))
+        self.assertEqual(batched.drain_moves(), one_by_one.drain_moves())
+        self.assertEqual(batched.get_last_movers(), one_by_one.get_last_movers())
+        for cell in [(0, 0), (1, 1), (2, 1), (3, 3), (9, 9)]:
+            self.assertEqual(sorted(batched.get_nodes_at_position(cell)), sorted(one_by_one.get_nodes_at_position(cell)))
+        self.assertEqual([move[1:] for move in heard if move[0]], [move[1:] for move in heard if not move[0]])
+
+    def test_dict(self):
+        self.check_backend("dict")
+
+    def test_grid(self):
+        self.check_backend("grid")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,9 @@
 import unittest
 
+from channels import Channels
+from gamenode import GameNode, GameState
+from localbus import LocalBus
+from messages import begin_t, freeze_t, report_ready_t
 from notitnode import NotItNode
 
 class TestNode(unittest.TestCase):
@@ -11,5 +15,116 @@ class TestNode(unittest.TestCase):
         print(target)
         self.assertNotEqual(target, (1,1))
 
+    def test_wide_ids(self):
+        msg = freeze_t()
+        msg.id = 100_000
+        self.assertEqual(freeze_t.decode(msg.encode()).id, 100_000)
+
+    def test_game_node_rejects_other_schema_version(self):
+        game = GameNode(board_shape=(3, 3), node_count=1, it_id=2, verbose=False)
+        game.lc = LocalBus()
+        game.on_start()
+        msg = report_ready_t()
+        msg.schema_version = report_ready_t.SCHEMA_VERSION + 1
+        game.lc.publish(Channels.REPORT_READY, msg.encode())
+        self.assertEqual(game.game_state, GameState.ERROR)
+
+    def test_not_it_stops_on_other_schema_version(self):
+        n = NotItNode(1, start_position=(1, 1), board_shape=(3, 3), move_frequency=1.0)
+        n.handle_begin(Channels.BEGIN_GAME, begin_t().encode())  # schema_version left at 0.
+        self.assertTrue(n.game_over)
+
+    def test_game_node_wakes_on_move(self):
+        game = GameNode(board_shape=(3, 3), node_count=1, it_id=2, verbose=False)
+        self.assertFalse(game.wake_event.is_set())
+        game.movement_monitor.set_node_position(0, (1, 1))
+        self.assertTrue(game.wake_event.is_set())
+        game.wait_for_event(timeout=0)
+        self.assertFalse(game.wake_event.is_set())
+
+
+class TestTagging(unittest.TestCase):
+
+    def setUp(self):
+        self.game = GameNode(board_shape=(5, 5), node_count=2, it_id=3, verbose=False)
+        self.game.lc = LocalBus()
+        self.frozen = list()
+        self.game.lc.subscribe(Channels.FREEZE, lambda channel, data: self.frozen.append(freeze_t.decode(data).id))
+        monitor = self.game.movement_monitor
+        monitor.set_node_position(0, (0, 0), clear_previous=False)
+        monitor.set_node_position(1, (4, 4), clear_previous=False)
+        monitor.set_node_position(3, (2, 2), clear_previous=False)
+        self.game.untagged_nodes = {0, 1}
+        self.game.process_freezing()
+
+    def test_it_lands_on_hider(self):
+        self.game.movement_monitor.set_node_position(3, (1, 2))
+        self.game.movement_monitor.set_node_position(3, (0, 2))
+        self.game.movement_monitor.set_node_position(3, (0, 1))
+        self.game.movement_monitor.set_node_position(3, (0, 0))
+        self.game.process_freezing()
+        self.assertEqual(self.frozen, [0])
+
+    def test_swap_is_a_tag(self):
+        # The 'it' steps to (2, 3) and the hider steps from (2, 3) to (2, 2): they passed through each other.
+        self.game.movement_monitor.set_node_position(1, (2, 3))
+        self.game.process_freezing()
+        self.game.movement_monitor.set_node_position(3, (2, 3))
+        self.game.movement_monitor.set_node_position(1, (2, 2))
+        self.game.process_freezing()
+        self.assertEqual(self.frozen, [1])
+
+    def test_retracing_an_old_step_is_not_a_tag(self):
+        # The 'it' goes (2, 2) -> (2, 1) -> (2, 0). The hider then walks (3, 1) -> (2, 1) -> (2, 2), back along the
+        # 'it''s first step, but the 'it' has long moved on.
+        self.game.movement_monitor.set_node_position(1, (3, 1))
+        self.game.process_freezing()
+        for node_id, position in [(3, (2, 1)), (3, (2, 0)), (1, (2, 1)), (1, (2, 2))]:
+            self.game.movement_monitor.set_node_position(node_id, position)
+        self.game.process_freezing()
+        self.assertEqual(self.frozen, [])
+
+    def test_brief_overlap_between_checks(self):
+        # Hider steps onto the 'it' and away again before the game node looks.
+        self.game.movement_monitor.set_node_position(1, (2, 3))
+        self.game.movement_monitor.set_node_position(1, (2, 2))
+        self.game.movement_monitor.set_node_position(1, (2, 1))
+        self.game.process_freezing()
+        self.assertEqual(self.frozen, [1])
+
+    def test_no_moves_no_tags(self):
+        self.game.process_freezing()
+        self.assertEqual(self.frozen, [])
+
+    def test_tags_are_caused_by_the_seeker(self):
+        # A hider walking into the 'it' is timed from the 'it''s move, not the hider's.
+        causes = list()
+        tag = self.game.tag
+        self.game.tag = lambda node_id, position, cause_id=None: (causes.append((node_id, cause_id)), tag(node_id, position, cause_id))
+        self.game.movement_monitor.set_node_position(1, (2, 3))
+        self.game.movement_monitor.set_node_position(1, (2, 2))
+        self.game.process_freezing()
+        self.assertEqual(causes, [(1, 3)])
+
+
+class TestSeveralSeekers(unittest.TestCase):
+
+    def test_every_seeker_tags_in_one_pass(self):
+        game = GameNode(board_shape=(5, 5), node_count=3, it_id=4, verbose=False, it_ids=[4, 5])
+        game.lc = LocalBus()
+        frozen = list()
+        game.lc.subscribe(Channels.FREEZE, lambda channel, data: frozen.append(freeze_t.decode(data).id))
+        monitor = game.movement_monitor
+        for node_id, position in [(0, (0, 0)), (1, (4, 4)), (2, (2, 2)), (4, (1, 0)), (5, (4, 3))]:
+            monitor.set_node_position(node_id, position, clear_previous=False)
+        game.untagged_nodes = {0, 1, 2}
+        game.process_freezing()
+        monitor.set_node_position(4, (0, 0))  # Seeker 4 lands on hider 0.
+        monitor.set_node_position(1, (4, 3))  # Hider 1 walks into seeker 5.
+        monitor.set_node_position(5, (2, 3))
+        monitor.set_node_position(2, (2, 3))  # And hider 2 into seeker 5 again, somewhere else.
+        game.process_freezing()
+        self.assertEqual(frozen, [0, 1, 2])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,84 @@
+import random
+import unittest
+
+from pursuit import InterceptPlanner, assign_targets, step_toward
+from simulation import simulate
+from spatial_index import BucketGrid
+
+class TestInterceptPlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.grid = BucketGrid((10, 10))
+        self.planner = InterceptPlanner((10, 10), self.grid)
+
+    def report(self, node_id, position):
+        self.grid.update(node_id, position)
+        self.planner.observe(node_id, position)
+
+    def test_reach_centre_shifts_away_from_walls(self):
+        self.assertEqual(self.planner.reach_centre((5, 5), 3), (5, 5))
+        self.assertEqual(self.planner.reach_centre((5, 5), 0), (5, 5))
+        x, y = self.planner.reach_centre((0, 0), 4)
+        self.assertGreater(x, 0)
+        self.assertGreater(y, 0)
+
+    def test_keeps_target_unless_another_is_clearly_sooner(self):
+        self.report(0, (5, 0))
+        self.report(1, (0, 6))
+        self.assertEqual(self.planner.plan((0, 0)), (5, 0))
+        # Hider 1 is now one step nearer, which isn't worth turning around for.
+        self.report(1, (0, 4))
+        self.assertEqual(self.planner.plan((0, 0)), (5, 0))
+        self.report(1, (0, 1))
+        self.assertEqual(self.planner.plan((0, 0)), (0, 1))
+        self.grid.remove(1)
+        self.planner.forget(1)
+        # Hider 0 hasn't reported for two of its steps, and it's against a wall, so we aim a little inside.
+        self.assertEqual(self.planner.plan((0, 0)), (5, 1))
+        self.assertEqual(self.planner.target, 0)
+
+    def test_step_toward_closes_bigger_gap(self):
+        rng = random.Random(0)
+        self.assertEqual(step_toward((0, 0), (3, 1), rng), (1, 0))
+        self.assertEqual(step_toward((0, 0), (0, -2), rng), (0, -1))
+        self.assertEqual(step_toward((2, 2), (2, 2), rng), (2, 2))
+
+    def test_assigned_target_overrides_nearest(self):
+        self.report(0, (1, 0))
+        self.report(1, (6, 6))
+        self.assertEqual(self.planner.plan((0, 0), assigned=1), (6, 6))
+        self.assertEqual(self.planner.target, 1)
+
+    def test_assign_targets_gives_each_seeker_its_own_hider(self):
+        for node_id, position in [(0, (1, 1)), (1, (2, 1)), (2, (9, 9))]:
+            self.grid.update(node_id, position)
+        # Both seekers are nearest hider 0. The nearer one gets it, the other takes the next closest.
+        self.assertEqual(assign_targets({10: (0, 1), 11: (0, 0)}, self.grid), {10: 0, 11: 1})
+        # More seekers than hiders: the spare one gets nothing.
+        self.grid.remove(1)
+        self.grid.remove(2)
+        self.assertEqual(assign_targets({10: (0, 1), 11: (9, 9)}, self.grid), {10: 0})
+
+    def test_more_seekers_finish_sooner(self):
+        rng = random.Random(3)
+        cells = [(rng.randrange(30), rng.randrange(30)) for _ in range(14)]
+        one = simulate((30, 30), cells[:10], cells[10], seed=3, record_trajectories=False)
+        four = simulate((30, 30), cells[:10], cells[10:], seed=3, record_trajectories=False)
+        self.assertTrue(four.completed)
+        self.assertEqual(sorted(node_id for _, node_id in four.tag_order), list(range(10)))
+        self.assertLess(four.ticks, one.ticks)
+
+    def test_intercept_beats_greedy(self):
+        totals = dict()
+        for pursuit in ["greedy", "intercept"]:
+            totals[pursuit] = 0
+            for seed in range(10):
+                rng = random.Random(seed)
+                cells = [(rng.randrange(15), rng.randrange(15)) for _ in range(6)]
+                result = simulate((15, 15), cells[:-1], cells[-1], seed=seed, record_trajectories=False, pursuit=pursuit)
+                self.assertTrue(result.completed)
+                totals[pursuit] += result.ticks
+        self.assertLess(totals["intercept"], totals["greedy"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+from channels import Channels
+from itnode import ItNode
+from localbus import LocalBus
+from messages import freeze_t
+from movement_monitor import MovementMonitor
+from notitnode import NotItNode
+from regions import MoveRegions
+
+class TestMoveRegions(unittest.TestCase):
+
+    def test_tiles(self):
+        regions = MoveRegions((40, 20), tile_size=16)
+        self.assertEqual((regions.columns, regions.rows), (3, 2))
+        self.assertEqual(regions.tile_of((0, 0)), 0)
+        self.assertEqual(regions.tile_of((39, 19)), 5)
+        self.assertEqual(regions.tile_of((-3, 25)), 3)
+        self.assertEqual(regions.tiles_near((17, 3), 1), {0, 1, 2, 3, 4, 5})
+        self.assertEqual(regions.tiles_near((3, 3), 0), {0})
+        self.assertEqual(regions.tiles_overlapping(15, 0, 17, 16), {0, 1})
+
+
+class TestRegionalMoves(unittest.TestCase):
+
+    def setUp(self):
+        # Four 16x16 tiles in a row.
+        self.bus = LocalBus()
+        self.regions = MoveRegions((64, 16), tile_size=16)
+        self.everything = MovementMonitor()
+        self.everything.register_listeners(self.bus)
+
+    def test_crossing_a_border_is_sent_to_both_tiles(self):
+        heard = list()
+        self.bus.subscribe(".*", lambda channel, data: heard.append(channel))
+        hider = NotItNode(0, start_position=(14, 3), board_shape=(64, 16), move_frequency=1.0, move_regions=self.regions)
+        hider.lc = self.bus
+        hider.move_to((15, 3))
+        hider.move_to((16, 3))
+        self.assertEqual(heard, ["REPORT_MOVE/0", "REPORT_MOVE/1", "REPORT_MOVE_EXIT/0"])
+        # Whoever follows every move hears each one once.
+        self.assertEqual(self.everything.moves_received, 2)
+        self.assertEqual(self.everything.get_node_position(0), (16, 3))
+
+    def test_follower_of_both_tiles_hears_a_crossing_once(self):
+        seeker = ItNode(3, start_position=(16, 8), board_shape=(64, 16), move_frequency=1.0, move_regions=self.regions)
+        seeker.lc = self.bus
+        seeker.on_start()
+        hider = NotItNode(0, start_position=(15, 3), board_shape=(64, 16), move_frequency=1.0, move_regions=self.regions)
+        hider.lc = self.bus
+        hider.on_start()
+        seeker.tick()
+        self.assertEqual(set(seeker.region_subscriptions.tiles), {0, 1, 2})
+        hider.move_to((16, 3))
+        self.assertEqual(seeker.movement_monitor.moves_received, 1)
+        # Leaving for a tile it doesn't follow still reaches it, through the exit channel.
+        hider.move_to((48, 3))
+        self.assertEqual(seeker.movement_monitor.moves_received, 2)
+        self.assertEqual(seeker.movement_monitor.get_node_position(0), (48, 3))
+
+    def test_seeker_follows_the_tiles_around_it(self):
+        seeker = ItNode(3, start_position=(2, 2), board_shape=(64, 16), move_frequency=1.0, move_regions=self.regions)
+        seeker.lc = self.bus
+        seeker.on_start()
+        hiders = dict()
+        for node_id, position in [(0, (5, 5)), (1, (60, 5))]:
+            hiders[node_id] = NotItNode(node_id, start_position=position, board_shape=(64, 16), move_frequency=1.0,
+                                        move_regions=self.regions)
+            hiders[node_id].lc = self.bus
+            hiders[node_id].on_start()
+        seeker.tick()
+        self.assertEqual(set(seeker.region_subscriptions.tiles), {0, 1})
+        # The far hider's start is known from its ready report, but its moves aren't heard.
+        hiders[1].move_to((59, 5))
+        hiders[0].move_to((6, 5))
+        self.assertEqual(seeker.spatial_index.get(1), (60, 5))
+        self.assertEqual(seeker.spatial_index.get(0), (6, 5))
+        # With the near one tagged, the seeker reaches out to the far one.
+        msg = freeze_t()
+        msg.id = 0
+        self.bus.publish(Channels.FREEZE, msg.encode())
+        seeker.tick()
+        self.assertEqual(set(seeker.region_subscriptions.tiles), {0, 1, 2, 3})
+        hiders[1].move_to((58, 5))
+        self.assertEqual(seeker.spatial_index.get(1), (58, 5))
+        self.assertEqual(self.everything.get_node_position(1), (58, 5))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import unittest
+
+from agenthost import AgentHostNode
+from channels import Channels
+from gamenode import GameNode, GameState
+from localbus import LocalBus
+from messages import report_status_t
+from notitnode import NotItNode
+from reliable import MAX_RETRANSMITS, RETRANSMIT_MAX
+from shardnode import GameShardNode, ShardCoordinatorNode, ShardLayout
+from tests.helpers import ready_report
+
+class LossyBus(LocalBus):
+    """Drops the next message on each channel in `drop`."""
+    def __init__(self):
+        super().__init__()
+        self.drop = set()
+
+    def publish(self, channel, data):
+        if channel in self.drop:
+            self.drop.remove(channel)
+            return
+        super().publish(channel, data)
+
+    def drop_for(self, channel, handler):
+        """Have just `handler` miss the next message on `channel`."""
+        for subscription in self.subscriptions:
+            if subscription.channel == channel and subscription.handler == handler:
+                subscription.handler = lambda channel, data, subscription=subscription: setattr(subscription, "handler", handler)
+
+
+class TestReliableFreeze(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = LossyBus()
+        self.game = GameNode(board_shape=(8, 8), node_count=2, it_id=3, verbose=False)
+        self.hider = NotItNode(0, start_position=(0, 0), board_shape=(8, 8), move_frequency=1.0)
+        self.host = AgentHostNode(agents=[(1, (7, 7))], board_shape=(8, 8), move_frequency=1.0, seed=0)
+        for node in [self.game, self.hider, self.host]:
+            node.lc = self.bus
+            node.on_start()
+        self.echoes = list()
+        self.bus.subscribe(Channels.REPORT_STATUS, lambda channel, data: self.echoes.append(report_status_t.decode(data).id))
+        self.bus.publish(Channels.REPORT_READY, ready_report(3, (4, 4)))
+        self.sender = self.game.reliable
+
+    def resend(self):
+        """Run the retransmit timer as if every wait had passed."""
+        for pending in self.sender.pending.values():
+            pending.backoff.next_time = 0.0
+        self.game.retransmit_due()
+
+    def test_acknowledged_freezes_are_done(self):
+        self.game.tag(0, (0, 0))
+        self.game.tag(1, (7, 7))
+        self.assertEqual((self.sender.sent, self.sender.acked, self.sender.pending), (3, 2, {}))  # Start, two freezes.
+        self.assertTrue(self.hider.frozen)
+        self.assertEqual(self.host.frozen.tolist(), [True])
+
+    def test_lost_freeze_is_retransmitted(self):
+        self.bus.drop.add(Channels.FREEZE)
+        self.game.tag(1, (7, 7))
+        self.assertFalse(self.host.frozen[0])
+        self.assertIsNotNone(self.game.retransmit_due())  # Not yet.
+        self.assertFalse(self.host.frozen[0])
+        self.resend()
+        self.assertTrue(self.host.frozen[0])
+        self.assertEqual((self.sender.retransmits, self.sender.pending), (1, {}))
+
+    def test_lost_ack_is_not_acted_on_twice(self):
+        self.bus.drop.add(Channels.CONTROL_ACK)
+        self.game.tag(0, (0, 0))
+        self.resend()
+        self.assertEqual(self.echoes, [0])
+        self.assertEqual(self.hider.received.duplicates, 1)
+        self.assertEqual(self.sender.pending, {})
+
+    def test_gives_up_eventually(self):
+        self.hider.lc = LocalBus()  # Gone quiet.
+        self.game.tag(0, (0, 0))
+        for _ in range(MAX_RETRANSMITS):
+            self.resend()
+        self.assertEqual(len(self.sender.pending), 1)
+        self.assertLessEqual(next(iter(self.sender.pending.values())).backoff.delay, RETRANSMIT_MAX)
+        self.resend()
+        self.assertEqual((self.sender.retransmits, self.sender.lost, self.sender.pending), (MAX_RETRANSMITS, 1, {}))
+
+
+class TestStartResend(unittest.TestCase):
+
+    def test_missed_start_is_resent_as_it_was(self):
+        bus = LossyBus()
+        game = GameNode(board_shape=(8, 8), node_count=2, it_id=3, verbose=False)
+        hiders = [NotItNode(node_id, start_position=(node_id, 0), board_shape=(8, 8), move_frequency=1.0) for node_id in [0, 1]]
+        for node in [game] + hiders:
+            node.lc = bus
+            node.on_start()
+        bus.drop.add(Channels.BEGIN_GAME)
+        game.node_ready(3, (4, 4))  # The seeker's report, which makes the game start.
+        game.check_ready()
+        self.assertFalse(hiders[0].game_started or hiders[1].game_started)
+        game.last_begin_sent = 0.0
+        hiders[1].send_ready()  # Nobody answered, so it asks again.
+        self.assertTrue(hiders[0].game_started and hiders[1].game_started)
+        self.assertEqual(game.reliable.retransmits, 1)
+
+
+class TestShardMissesStart(unittest.TestCase):
+
+    def test_digest_starts_a_shard_that_missed_begin(self):
+        bus = LossyBus()
+        layout = ShardLayout((10, 4), 2)
+        coordinator = ShardCoordinatorNode(board_shape=(10, 4), node_count=1, it_id=2, verbose=False)
+        shards = [GameShardNode(board_shape=(10, 4), node_count=1, it_ids=[2], tile=layout.tile(idx)) for idx in range(2)]
+        for node in shards + [coordinator]:
+            node.lc = bus
+            node.on_start()
+        bus.drop_for(Channels.BEGIN_GAME, shards[1].handle_begin)
+        coordinator.node_ready(0, (8, 1))
+        coordinator.node_ready(2, (1, 1))
+        coordinator.check_ready()
+        self.assertEqual([shard.game_state for shard in shards], [GameState.RUNNING, GameState.STARTING])
+        coordinator.last_digest = 0.0
+        coordinator.step()
+        self.assertEqual(shards[1].game_state, GameState.RUNNING)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+import lcm
+
+from channels import Channels
+from messages import freeze_t, moved_t
+from replay import EventLogIndex, Replayer
+from tests.helpers import ready_report
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".log")
+        os.close(handle)
+        log = lcm.EventLog(self.path, "w", overwrite=True)
+        utime = 1_000_000
+        for node_id, position in [(0, (0, 0)), (1, (4, 4)), (2, (2, 0))]:
+            log.write_event(utime, Channels.REPORT_READY, self.ready(node_id, position))
+        # One second in, the 'it' walks onto hider 0. Two seconds in, onto hider 1.
+        for second, moves, tagged in [(1, [(2, (1, 0)), (2, (0, 0))], 0), (2, [(2, (4, 0)), (2, (4, 4))], 1)]:
+            utime = (second + 1) * 1_000_000
+            for node_id, position in moves:
+                log.write_event(utime, Channels.REPORT_MOVE, self.moved(node_id, position))
+            log.write_event(utime + 1, Channels.FREEZE, self.freeze(tagged))
+        log.close()
+        self.index = EventLogIndex(self.path)
+
+    def tearDown(self):
+        self.index.close()
+        os.remove(self.path)
+
+    def ready(self, node_id, position):
+        return ready_report(node_id, position)
+
+    def moved(self, node_id, position):
+        msg = moved_t()
+        msg.id = node_id
+        msg.new_position = position
+        return msg.encode()
+
+    def freeze(self, node_id):
+        msg = freeze_t()
+        msg.id = node_id
+        return msg.encode()
+
+    def test_index(self):
+        self.assertEqual(len(self.index), 9)
+        self.assertFalse(self.index.truncated)
+        self.assertEqual(self.index.channel(3), Channels.REPORT_MOVE)
+        self.assertEqual(self.index.find_time(2.0), 6)
+        self.assertEqual(self.index.events_on(Channels.FREEZE), [5, 8])
+
+    def test_replay_matches_recorded_tags(self):
+        replayer = Replayer(self.index)
+        self.assertEqual(replayer.game.board_shape, (5, 5))
+        result = replayer.play(speed=0)
+        self.assertTrue(result.completed)
+        self.assertEqual(result.replay_tags, [0, 1])
+        self.assertEqual(result.mismatched_tags, set())
+
+    def test_seek_fast_forwards(self):
+        replayer = Replayer(self.index)
+        replayer.seek(self.index.find_time(2.0))
+        self.assertEqual(replayer.game.untagged_nodes, {1})
+        self.assertEqual(replayer.game.movement_monitor.get_node_position(2), (0, 0))
+        result = replayer.play(speed=0)
+        self.assertEqual((result.events, result.replay_tags, result.recorded_tags), (2, [1], [1]))
+
+    def test_regional_moves_replay_as_moves(self):
+        handle, path = tempfile.mkstemp(suffix=".log")
+        os.close(handle)
+        log = lcm.EventLog(path, "w", overwrite=True)
+        for node_id, position in [(0, (0, 0)), (2, (1, 0))]:
+            log.write_event(1_000_000, Channels.REPORT_READY, self.ready(node_id, position))
+        log.write_event(2_000_000, "REPORT_MOVE/3", self.moved(2, (2, 0)))
+        log.write_event(2_000_000, "REPORT_MOVE/0", self.moved(2, (0, 0)))
+        log.write_event(2_000_000, "REPORT_MOVE_EXIT/3", self.moved(2, (0, 0)))
+        log.close()
+        index = EventLogIndex(path)
+        self.assertEqual(index.events_on(Channels.REPORT_MOVE), [2, 3])
+        result = Replayer(index).play(speed=0)
+        self.assertEqual(result.replay_tags, [0])
+        index.close()
+        os.remove(path)
+
+    def test_truncated_log(self):
+        with open(self.path, "ab") as fout:
+            fout.write(b"\xed\xa1\xda\x01")
+        index = EventLogIndex(self.path)
+        self.assertTrue(index.truncated)
+        self.assertEqual(len(index), 9)
+        index.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+
+from channels import Channels
+from gamenode import GameState
+from localbus import LocalBus
+from messages import freeze_t, moved_t, world_delta_t
+from regions import MoveRegions
+from shardnode import GameShardNode, ShardCoordinatorNode, ShardLayout
+from tests.helpers import ready_report
+
+class TestShardLayout(unittest.TestCase):
+
+    def test_tiles_cover_board_once(self):
+        for board, count in [((20, 10), 4), ((7, 30), 6), ((5, 5), 1), ((9, 9), 9)]:
+            layout = ShardLayout(board, count)
+            self.assertEqual(len(layout), count)
+            for x in range(board[0]):
+                for y in range(board[1]):
+                    owners = [idx for idx in range(count) if layout.tile(idx).contains((x, y))]
+                    self.assertEqual(len(owners), 1)
+
+    def test_prefers_square_tiles(self):
+        layout = ShardLayout((40, 10), 4)
+        self.assertEqual((layout.columns, layout.rows), (4, 1))
+
+
+class TestShardedGame(unittest.TestCase):
+    move_regions = None
+
+    def setUp(self):
+        # Two 5x4 tiles side by side. Hiders 0 and 1, seeker 3.
+        self.bus = LocalBus()
+        layout = ShardLayout((10, 4), 2)
+        self.coordinator = ShardCoordinatorNode(board_shape=(10, 4), node_count=2, it_id=3, verbose=False)
+        self.shards = [GameShardNode(board_shape=(10, 4), node_count=2, it_ids=[3], tile=layout.tile(idx), move_regions=self.move_regions)
+                       for idx in range(2)]
+        self.positions = {0: (5, 1), 1: (6, 1), 3: (4, 1)}
+        self.frozen = list()
+        self.bus.subscribe(Channels.FREEZE, lambda channel, data: self.frozen.append(freeze_t.decode(data).id))
+        for node in self.shards + [self.coordinator]:
+            node.lc = self.bus
+            node.on_start()
+        for node_id, position in self.positions.items():
+            self.bus.publish(Channels.REPORT_READY, ready_report(node_id, position))
+
+    def move(self, node_id, position):
+        msg = moved_t()
+        msg.id = node_id
+        msg.new_position = position
+        if self.move_regions is None:
+            self.bus.publish(Channels.REPORT_MOVE, msg.encode())
+        else:
+            tile, old_tile = self.move_regions.tile_of(position), self.move_regions.tile_of(self.positions[node_id])
+            self.bus.publish(self.move_regions.channel(tile), msg.encode())
+            if old_tile != tile:
+                self.bus.publish(self.move_regions.exit_channel(old_tile), msg.encode())
+        self.positions[node_id] = position
+
+    def step(self):
+        for node in self.shards + [self.coordinator]:
+            node.step()
+
+    def test_tags_across_a_border_and_hands_off(self):
+        self.assertTrue(all(shard.game_state == GameState.RUNNING for shard in self.shards))
+        # The seeker and hider 0 swap cells across the tile border. The halo lets a shard see both moves.
+        self.move(3, (5, 1))
+        self.move(0, (4, 1))
+        self.step()
+        self.assertEqual(set(self.frozen), {0})
+        self.assertEqual(self.coordinator.untagged_nodes, {1})
+        # The seeker walks deeper into the right tile. The left shard forgets it, and the right one tags hider 1.
+        self.move(3, (6, 1))
+        self.step()
+        self.assertIsNone(self.shards[0].movement_monitor.get_node_position(3))
+        self.assertEqual(self.shards[1].movement_monitor.get_node_position(3), (6, 1))
+        self.assertEqual(set(self.frozen), {0, 1})
+        self.assertEqual(self.coordinator.game_state, GameState.COMPLETE)
+
+
+class TestShardedWorldState(unittest.TestCase):
+
+    def test_shard_tags_reach_the_delta_stream(self):
+        bus = LocalBus()
+        coordinator = ShardCoordinatorNode(board_shape=(10, 4), node_count=2, it_id=3, verbose=False, snapshot_period=60.0)
+        coordinator.lc = bus
+        coordinator.on_start()
+        deltas = list()
+        bus.subscribe(Channels.WORLD_DELTA, lambda channel, data: deltas.append(world_delta_t.decode(data)))
+        for node_id in [0, 1, 3]:
+            coordinator.node_ready(node_id, (node_id, 0))
+        coordinator.check_ready()
+        msg = freeze_t()
+        msg.id = 1
+        bus.publish(Channels.FREEZE, msg.encode())  # From a shard.
+        coordinator.world_state.last_delta = 0.0
+        coordinator.step()
+        self.assertEqual([list(delta.frozen_ids) for delta in deltas], [[1]])
+
+
+class TestShardedGameOnMoveRegions(TestShardedGame):
+    # 2x2 move tiles, so each shard follows only some of them.
+    move_regions = MoveRegions((10, 4), tile_size=2)
+
+    def test_shards_follow_only_their_tiles(self):
+        self.assertEqual(self.shards[0].movement_monitor.moves_received, 0)
+        self.move(1, (8, 1))
+        self.assertEqual(self.shards[0].movement_monitor.moves_received, 0)
+        # Once, though it also went out on the exit channel of another of its tiles.
+        self.assertEqual(self.shards[1].movement_monitor.moves_received, 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import random
+import unittest
+
+from simulation import simulate
+
+class TestSimulation(unittest.TestCase):
+
+    def test_game_completes(self):
+        result = simulate((5, 5), [(0, 0), (4, 4)], (2, 2), seed=3)
+        self.assertTrue(result.completed)
+        self.assertEqual(sorted(node_id for _, node_id in result.tag_order), [0, 1])
+        self.assertEqual(result.trajectories[3][0], (2, 2))
+
+    def test_seeded_runs_repeat(self):
+        a = simulate((8, 8), [(1, 1), (6, 2), (3, 7)], (0, 0), seed=11)
+        b = simulate((8, 8), [(1, 1), (6, 2), (3, 7)], (0, 0), seed=11)
+        self.assertEqual(a.ticks, b.ticks)
+        self.assertEqual(a.tag_order, b.tag_order)
+
+    def test_seed_leaves_the_global_rng_alone(self):
+        # The seed goes to each node's own RNG, as with game.py --seed, rather than to the caller's `random`.
+        state = random.getstate()
+        simulate((8, 8), [(1, 1), (6, 2)], (0, 0), seed=11)
+        self.assertEqual(random.getstate(), state)
+
+    def test_start_on_it(self):
+        result = simulate((3, 3), [(1, 1)], (1, 1), seed=0)
+        self.assertEqual(result.tag_order, [(0, 0)])
+        self.assertEqual(result.ticks, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from spatial_index import BucketGrid
+
+class TestBucketGrid(unittest.TestCase):
+
+    def test_nearest(self):
+        grid = BucketGrid((10, 10))
+        grid.update(1, (9, 9))
+        grid.update(2, (2, 3))
+        self.assertEqual(grid.nearest((0, 0)), (2, (2, 3)))
+        grid.update(2, (8, 8))
+        self.assertEqual(grid.nearest((0, 0)), (2, (8, 8)))
+        grid.remove(2)
+        self.assertEqual(grid.nearest((0, 0)), (1, (9, 9)))
+        grid.remove(1)
+        self.assertIsNone(grid.nearest((0, 0)))
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(4)
+        board = (200, 120)
+        for bucket_size in [None, 1, 7]:
+            grid = BucketGrid(board, bucket_size=bucket_size)
+            positions = dict()
+            for step in range(2000):
+                node_id = rng.randrange(300)
+                if rng.random() < 0.1:
+                    grid.remove(node_id)
+                    positions.pop(node_id, None)
+                else:
+                    positions[node_id] = (rng.randrange(board[0]), rng.randrange(board[1]))
+                    grid.update(node_id, positions[node_id])
+                query = (rng.randrange(board[0]), rng.randrange(board[1]))
+                expected = min(abs(x - query[0]) + abs(y - query[1]) for x, y in positions.values())
+                _, (x, y) = grid.nearest(query)
+                self.assertEqual(abs(x - query[0]) + abs(y - query[1]), expected)
+
+    def test_within_matches_linear_scan(self):
+        rng = random.Random(5)
+        board = (60, 40)
+        for bucket_size in [None, 1, 7]:
+            grid = BucketGrid(board, bucket_size=bucket_size)
+            positions = {node_id: (rng.randrange(board[0]), rng.randrange(board[1])) for node_id in range(80)}
+            for node_id, position in positions.items():
+                grid.update(node_id, position)
+            for _ in range(50):
+                query = (rng.randrange(board[0]), rng.randrange(board[1]))
+                radius = rng.randrange(30)
+                expected = {node_id for node_id, (x, y) in positions.items() if abs(x - query[0]) + abs(y - query[1]) <= radius}
+                self.assertEqual({node_id for node_id, _ in grid.within(query, radius)}, expected)
+
+if __name__ == '__main__':
+    unittest.main()
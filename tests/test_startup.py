@@ -0,0 +1,137 @@
+import multiprocessing
+import pickle
+import signal
+import time
+import unittest
+
+from agenthost import AgentHostNode
+from backoff import Backoff
+from channels import Channels
+from clock import VirtualClock
+from game import start_helper, stop_helpers
+from gamenode import GameNode, GameState
+from itnode import ItNode
+from localbus import LocalBus
+from messages import begin_t, report_status_t
+from notitnode import NotItNode
+from tests.helpers import ready_report
+
+class TestBackoff(unittest.TestCase):
+
+    def test_waits_double_up_to_the_cap(self):
+        backoff = Backoff(1.0, 4.0, jitter=0.0)
+        self.assertFalse(backoff.due(0.0))  # Nothing sent yet.
+        backoff.start(0.0)
+        self.assertFalse(backoff.due(0.5))
+        due = [t for t in range(20) if backoff.due(float(t))]
+        self.assertEqual(due, [1, 3, 7, 11, 15, 19])
+
+
+class TestReadiness(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = LocalBus()
+        self.game = GameNode(board_shape=(5, 5), node_count=2, it_id=3, verbose=False)
+        self.game.lc = self.bus
+        self.game.on_start()
+        self.begins = list()
+        self.freezes = list()
+        self.bus.subscribe(Channels.BEGIN_GAME, lambda channel, data: self.begins.append(data))
+        self.bus.subscribe(Channels.FREEZE, lambda channel, data: self.freezes.append(data))
+
+    def ready(self, node_id, position=(1, 1)):
+        self.bus.publish(Channels.REPORT_READY, ready_report(node_id, position))
+
+    def test_resent_ready_counts_once(self):
+        self.ready(0)
+        self.ready(0)
+        self.ready(3)
+        self.assertEqual(self.game.node_reports, 2)
+        self.assertEqual(self.game.game_state, GameState.STARTING)
+
+    def test_host_batch_starts_the_game(self):
+        host = AgentHostNode(agents=[(0, (0, 0)), (1, (4, 4))], board_shape=(5, 5), move_frequency=1.0, seed=0)
+        host.lc = self.bus
+        host.on_start()
+        self.assertEqual(self.game.untagged_nodes, {0, 1})
+        self.ready(3)
+        self.assertEqual(self.game.game_state, GameState.RUNNING)
+        self.assertTrue(host.game_started)
+        self.assertIsNotNone(self.game.ready_seconds)
+
+    def test_resent_ready_after_start_resends_start(self):
+        for node_id in [0, 1, 3]:
+            self.ready(node_id)
+        self.assertEqual(len(self.begins), 1)
+        self.game.last_begin_sent = 0.0
+        self.ready(1)
+        self.assertEqual(len(self.begins), 2)
+        # A burst of them gets one answer.
+        self.ready(0)
+        self.ready(1)
+        self.assertEqual(len(self.begins), 2)
+
+    def test_status_from_unknown_id_sends_no_freeze(self):
+        self.ready(0)
+        msg = report_status_t()
+        msg.id = 1
+        msg.position = (2, 2)
+        self.bus.publish(Channels.REPORT_STATUS, msg.encode())
+        self.assertEqual(self.freezes, [])
+
+    def test_hider_resends_ready_until_the_game_starts(self):
+        hider = NotItNode(0, start_position=(1, 1), board_shape=(5, 5), move_frequency=1.0)
+        hider.lc = self.bus
+        hider.on_start()
+        hider.ready_backoff.next_time = 0.0
+        hider.step()
+        self.assertEqual(self.game.node_reports, 1)  # The resend was heard, and counted once.
+        msg = begin_t()
+        msg.schema_version = begin_t.SCHEMA_VERSION
+        hider.handle_begin(Channels.BEGIN_GAME, msg.encode())
+        reports = list()
+        self.bus.subscribe(Channels.REPORT_READY, lambda channel, data: reports.append(data))
+        hider.ready_backoff.next_time = 0.0
+        hider.step()
+        self.assertEqual(reports, [])
+
+
+def exit_at_once(node):
+    pass
+
+
+class TestHelperProcesses(unittest.TestCase):
+
+    def setUp(self):
+        self.context = multiprocessing.get_context("fork")
+
+    def test_helper_that_dies_before_listening_stops_the_game(self):
+        helpers = list()
+        with self.assertRaises(RuntimeError):
+            start_helper(self.context, exit_at_once, None, "Recorder", self.context.Event(), helpers)
+        self.assertFalse(helpers[0].is_alive())
+
+    def test_helper_that_outstays_the_game_is_terminated(self):
+        process = self.context.Process(target=time.sleep, args=(60,))
+        process.start()
+        stop_helpers([process], timeout=0.0)
+        self.assertEqual(process.exitcode, -signal.SIGTERM)
+
+
+class TestPickling(unittest.TestCase):
+    """Nodes are pickled into their processes under the spawn and forkserver start methods."""
+
+    def test_nodes_survive_a_round_trip(self):
+        nodes = [
+            GameNode(board_shape=(5, 5), node_count=1, it_id=2, verbose=True, track_latency=True),
+            ItNode(2, start_position=(0, 0), board_shape=(5, 5), move_frequency=1.0, clock=VirtualClock(0.5)),
+            NotItNode(0, start_position=(1, 1), board_shape=(5, 5), move_frequency=1.0),
+            AgentHostNode(agents=[(0, (1, 1))], board_shape=(5, 5), move_frequency=1.0, seed=0),
+        ]
+        for node in nodes:
+            with self.subTest(node=type(node).__name__):
+                copy = pickle.loads(pickle.dumps(node))
+                self.assertEqual(copy.__dict__.keys(), node.__dict__.keys())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+
+import numpy as np
+
+from agenthost import AgentHostNode
+from channels import Channels
+from gamenode import GameNode, GameState
+from localbus import LocalBus
+from messages import freeze_t, report_status_t
+from notitnode import NotItNode
+from syncdigest import digest_frozen, digest_has_frozen, make_digest, read_digest
+from tests.helpers import ready_report
+
+class TestDigest(unittest.TestCase):
+
+    def test_round_trip(self):
+        msg = read_digest(make_digest(7, 10, {1, 8, 12}).encode())
+        self.assertEqual(msg.seq, 7)
+        self.assertEqual(msg.frozen_size, 2)
+        self.assertEqual(digest_frozen(msg, np.array([0, 1, 8, 9, 12])).tolist(), [False, True, True, False, False])
+        self.assertEqual([digest_has_frozen(msg, i) for i in [0, 1, 8, 12]], [False, True, True, False])
+
+    def test_corrupt_digest_is_dropped(self):
+        msg = make_digest(1, 10, {3})
+        msg.frozen = bytes([msg.frozen[0] ^ 1]) + msg.frozen[1:]
+        self.assertIsNone(read_digest(msg.encode()))
+
+
+class TestDigestSync(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = LocalBus()
+        self.game = GameNode(board_shape=(8, 8), node_count=3, it_id=4, verbose=False)
+        self.game.lc = self.bus
+        self.game.on_start()
+        self.statuses = list()
+        self.freezes = list()
+        self.bus.subscribe(Channels.REPORT_STATUS, lambda channel, data: self.statuses.append(report_status_t.decode(data).id))
+        self.bus.subscribe(Channels.FREEZE, lambda channel, data: self.freezes.append(freeze_t.decode(data).id))
+        self.hider = NotItNode(0, start_position=(0, 0), board_shape=(8, 8), move_frequency=1.0)
+        self.host = AgentHostNode(agents=[(1, (7, 7)), (2, (3, 3))], board_shape=(8, 8), move_frequency=1.0, seed=0)
+        for node in [self.hider, self.host]:
+            node.lc = self.bus
+            node.on_start()
+        self.bus.publish(Channels.REPORT_READY, ready_report(4, (5, 5)))
+        self.assertEqual(self.game.game_state, GameState.RUNNING)
+
+    def send_digest(self):
+        self.game.last_digest = 0.0
+        self.game.publish_sync_digest()
+
+    def test_agreement_is_silent(self):
+        self.game.tag(2, (3, 3))
+        self.send_digest()
+        self.assertEqual(self.statuses, [2])  # Only the freeze echo.
+
+    def test_lost_freezes_are_repaired(self):
+        self.game.untagged_nodes -= {0, 2}  # Tagged, but the freezes never arrived.
+        self.send_digest()
+        self.assertEqual(set(self.statuses), {0, 2})  # The reports, then the freeze echoes.
+        self.assertEqual(sorted(self.freezes), [0, 2])
+        self.assertTrue(self.hider.frozen)
+        self.assertEqual(self.host.frozen.tolist(), [False, True])
+        self.statuses.clear()
+        self.send_digest()
+        self.assertEqual(self.statuses, [])
+
+    def test_missed_start(self):
+        self.hider.game_started = False
+        self.host.game_started = False
+        self.send_digest()
+        self.assertTrue(self.hider.game_started)
+        self.assertTrue(self.host.game_started)
+
+if __name__ == '__main__':
+    unittest.main()
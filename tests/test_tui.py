@@ -0,0 +1,109 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from tui import BoardModel, FrameSnapshot, RenderThread, TuiRenderer, merge_snapshots, screen_scale
+
+class TestTui(unittest.TestCase):
+
+    def setUp(self):
+        self.output = tempfile.TemporaryFile("w+")
+
+    def tearDown(self):
+        self.output.close()
+
+    def written(self) -> str:
+        self.output.seek(0)
+        text = self.output.read()
+        self.output.seek(0)
+        self.output.truncate()
+        return text
+
+    def test_scale(self):
+        self.assertEqual(screen_scale((10, 10), os.terminal_size((80, 24))), 1)
+        self.assertEqual(screen_scale((400, 100), os.terminal_size((80, 24))), 10)
+
+    def test_crowded_cells(self):
+        counts = TuiRenderer((4, 4), stream=self.output, ansi=False)
+        density = TuiRenderer((4, 4), scale=5, stream=self.output, ansi=False)
+        for renderer in (counts, density):
+            renderer.counts = {(0, 0): 5, (1, 0): 10}
+        self.assertEqual((counts.glyph((0, 0)), counts.glyph((1, 0))), ("5", "+"))
+        # Density 5 is already '+', so an overflowing block has to look different.
+        self.assertEqual((density.glyph((0, 0)), density.glyph((1, 0))), ("+", "@"))
+
+    def test_model_tracks_counts(self):
+        model = BoardModel((10, 10), it_id=9, scale=5)
+        model.track_move(1, (0, 0))
+        model.track_move(2, (4, 4))
+        model.track_move(9, (9, 9))
+        snapshot = model.take_snapshot("", full=True)
+        self.assertEqual(dict(snapshot.cells), {(0, 0): 2})
+        self.assertEqual(snapshot.it_cells, ((1, 1),))
+        model.track_move(2, (5, 0))
+        self.assertEqual(set(model.take_snapshot("").cells), {((0, 0), 1), ((1, 0), 1)})
+
+    def test_ansi_frames_only_touch_changed_cells(self):
+        model = BoardModel((50, 20), it_id=0)
+        renderer = TuiRenderer(model.screen_shape, stream=self.output, ansi=True)
+        model.track_move(0, (0, 0))
+        model.track_move(1, (3, 3))
+        renderer.paint(model.take_snapshot("first", full=renderer.needs_full_snapshot))
+        self.assertIn("\x1b[2J", self.written())
+        model.track_move(1, (4, 3))
+        renderer.paint(model.take_snapshot("second"))
+        frame = self.written()
+        self.assertNotIn("\x1b[2J", frame)
+        self.assertIn("\x1b[5;7H_", frame)
+        self.assertIn("\x1b[5;9H1", frame)
+        self.assertLess(len(frame), 100)
+
+    def test_plain_frame(self):
+        model = BoardModel((3, 2), it_id=0)
+        renderer = TuiRenderer(model.screen_shape, stream=self.output, ansi=False)
+        model.track_move(0, (1, 1))
+        model.track_move(1, (2, 0))
+        renderer.paint(model.take_snapshot("status", full=True))
+        self.assertEqual(self.written(), "------\n_ _ 1 \n_ X _ \n------\nstatus\n")
+
+    def test_merged_snapshots_keep_skipped_changes(self):
+        first = FrameSnapshot(cells=(((0, 0), 1), ((1, 0), 2)), it_cells=((2, 2),), status="a", full=True)
+        second = FrameSnapshot(cells=(((0, 0), 0), ((3, 3), 1)), it_cells=((1, 1),), status="b", full=False)
+        merged = merge_snapshots(first, second)
+        self.assertTrue(merged.full)
+        self.assertEqual(dict(merged.cells), {(1, 0): 2, (3, 3): 1})
+        self.assertEqual((merged.it_cells, merged.status), (((1, 1),), "b"))
+
+    def test_render_thread_drops_frames_but_not_changes(self):
+        model = BoardModel((3, 2), it_id=0)
+        renderer = TuiRenderer(model.screen_shape, stream=self.output, ansi=False)
+        render_thread = RenderThread(renderer, fps=1.0)
+        model.track_move(0, (1, 1))
+        model.track_move(1, (2, 0))
+        render_thread.submit(model.take_snapshot("first", full=True))
+        model.track_move(1, (0, 0))
+        render_thread.submit(model.take_snapshot("second"))
+        model.track_move(2, (2, 1))
+        render_thread.submit(model.take_snapshot("third"))
+        self.assertEqual(render_thread.frames_dropped, 2)
+        # Never started, so stop paints the one merged frame.
+        render_thread.stop()
+        self.assertEqual(self.written(), "------\n1 _ _ \n_ X 1 \n------\nthird\n")
+
+    def test_stop_gives_up_on_a_wedged_terminal(self):
+        painting, unblock = threading.Event(), threading.Event()
+        renderer = TuiRenderer((3, 2), stream=self.output, ansi=False)
+        renderer.paint = lambda snapshot: (painting.set(), unblock.wait())
+        render_thread = RenderThread(renderer, fps=100.0)
+        render_thread.start()
+        render_thread.submit(FrameSnapshot(cells=(), it_cells=(), status="", full=True))
+        painting.wait()
+        with self.assertLogs(level="WARNING"):
+            render_thread.stop(timeout=0.05)
+        self.assertTrue(render_thread.thread.is_alive())
+        unblock.set()
+        render_thread.thread.join()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+from channels import Channels
+from gamenode import GameNode
+from localbus import LocalBus
+from messages import moved_t, world_snapshot_t
+from movement_monitor import make_movement_monitor
+from worldstate import WorldStatePublisher, pack_cells, pack_flags, unpack_cells, unpack_flags
+from tests.helpers import ready_report
+
+class TestPacking(unittest.TestCase):
+
+    def test_round_trip(self):
+        flags = [True, False, False, True, True, False, True, False, True, True]
+        packed = pack_flags(flags)
+        self.assertEqual(len(packed), 2)
+        self.assertEqual(unpack_flags(packed, len(flags)), flags)
+        positions = [(0, 0), (6, 0), (3, 4)]
+        self.assertEqual(unpack_cells(pack_cells(positions, 7), 7), positions)
+
+    def test_cells_past_int32(self):
+        # 70000 * 70000 cells is more than an int32 can number.
+        publisher = WorldStatePublisher((70000, 70000))
+        corner = (69999, 69999)
+        msg = world_snapshot_t.decode(publisher.take_snapshot(0.0, {0: corner}, set()).encode())
+        self.assertEqual(unpack_cells(msg.cells, 70000), [corner])
+
+
+class TestWorldStateStream(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = LocalBus()
+        self.game = GameNode(board_shape=(8, 8), node_count=2, it_id=3, verbose=False, snapshot_period=60.0)
+        self.game.lc = self.bus
+        self.game.on_start()
+        for node_id, position in [(0, (0, 0)), (1, (7, 7)), (3, (4, 4))]:
+            self.bus.publish(Channels.REPORT_READY, ready_report(node_id, position))
+        self.game.step()  # The first snapshot goes out straight away, before anyone is listening.
+
+    def move(self, node_id, position):
+        msg = moved_t()
+        msg.id = node_id
+        msg.new_position = position
+        self.bus.publish(Channels.REPORT_MOVE, msg.encode())
+
+    def flush(self, snapshot=False):
+        self.game.world_state.last_delta = 0.0
+        if snapshot:
+            self.game.world_state.last_snapshot = None
+        self.game.step()
+
+    def test_late_observer_bootstraps_from_snapshot(self):
+        for backend in ["dict", "grid"]:
+            with self.subTest(backend=backend):
+                self.setUp()
+                self.move(0, (1, 0))
+                self.flush()
+                observer = make_movement_monitor(backend, (8, 8))
+                observer.register_world_listeners(self.bus)
+                # Deltas before the first snapshot are held, not applied.
+                self.move(3, (4, 5))
+                self.flush()
+                self.assertIsNone(observer.get_node_position(0))
+                self.move(3, (4, 6))
+                self.move(1, (6, 7))
+                self.flush(snapshot=True)
+                self.assertEqual(observer.world_seq, self.game.world_state.seq)
+                self.assertEqual(observer.known_nodes(), {0, 1, 3})
+                self.assertEqual(observer.get_node_position(3), (4, 6))
+                self.assertEqual(observer.get_node_position(1), (6, 7))
+                # The 'it' catches hider 1, and the delta carries the tag.
+                self.move(3, (5, 6))
+                self.move(3, (6, 6))
+                self.move(3, (6, 7))
+                self.flush()
+                self.assertEqual(observer.get_node_position(3), (6, 7))
+                self.assertEqual(observer.frozen_ids, {1})
+
+    def test_gap_waits_for_next_snapshot(self):
+        observer = make_movement_monitor("dict")
+        publisher = WorldStatePublisher((8, 8))
+        observer.apply_snapshot(publisher.take_snapshot(0.0, {0: (0, 0), 3: (4, 4)}, {0}))
+        self.assertEqual(observer.frozen_ids, {0})
+        publisher.record_moves([(3, (4, 4), (4, 3))])
+        publisher.take_delta(1.0)  # Lost.
+        publisher.record_moves([(3, (4, 3), (4, 2))])
+        observer.apply_delta(publisher.take_delta(2.0))
+        self.assertIsNone(observer.world_seq)
+        self.assertEqual(observer.world_resyncs, 1)
+        self.assertEqual(observer.get_node_position(3), (4, 4))
+        observer.apply_snapshot(publisher.take_snapshot(2.5, {0: (0, 0), 3: (4, 2)}, {0}))
+        publisher.record_moves([(3, (4, 2), (4, 1))])
+        observer.apply_delta(publisher.take_delta(3.0))
+        self.assertEqual(observer.world_seq, 3)
+        self.assertEqual(observer.get_node_position(3), (4, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,280 @@
+"""
+Terminal UI for the GameNode.
+
+BoardModel keeps per-screen-cell hider counts up to date from move events and remembers which cells changed.
+TuiRenderer paints FrameSnapshots taken from the model. On a terminal it only redraws the cells that changed, using
+ANSI cursor addressing, and writes each frame from one reusable buffer in a single write. Frame cost therefore
+follows the number of moves rather than the board area.
+
+Boards too big for the terminal are downsampled: each screen cell covers a square block of board cells and shows a
+density glyph instead of a count.
+
+RenderThread moves painting off the game loop, dropping frames when the terminal can't keep up.
+"""
+
+import math
+import os
+import shutil
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from logging import getLogger
+
+from picklestate import RebuiltOnUnpickle
+
+
+CELL_WIDTH = 2  # Glyph plus a space, same spacing as the original print-based board.
+RESERVED_ROWS = 3  # Header rule, status line, and a spare row so the prompt doesn't scroll the frame.
+COUNT_GLYPHS = "_123456789"  # Full resolution: empty or the hider count.
+COUNT_OVERFLOW_GLYPH = "+"  # More than nine hiders in one cell.
+DENSITY_GLYPHS = "_.:-=+*#%@"  # Downsampled: denser blocks get heavier glyphs, and anything denser still stays at '@'.
+IT_GLYPH = "X"
+INITIAL_BUFFER_SIZE = 64 * 1024
+RENDER_STOP_TIMEOUT = 1.0  # Seconds stop() waits for a frame still being painted.
+logger = getLogger()
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    cells: tuple[tuple[tuple[int, int], int], ...]  # (screen cell, hider count) for every cell that changed.
+    it_cells: tuple[tuple[int, int], ...]  # Every seeker's screen cell.
+    status: str
+    full: bool  # True if `cells` holds every occupied cell and the painter should start from a blank board.
+
+
+def screen_scale(board_shape: tuple[int, int], terminal_size: os.terminal_size | None = None) -> int:
+    """How many board cells per side each screen cell has to cover so the board fits the terminal."""
+    if terminal_size is None:
+        terminal_size = shutil.get_terminal_size()
+    columns = max(terminal_size.columns // CELL_WIDTH, 1)
+    rows = max(terminal_size.lines - RESERVED_ROWS, 1)
+    return max(1, math.ceil(board_shape[0] / columns), math.ceil(board_shape[1] / rows))
+
+
+class BoardModel(RebuiltOnUnpickle):
+    """Screen-resolution hider counts, fed by MovementMonitor move events from the LCM thread."""
+    REBUILT_ON_UNPICKLE = {"lock": threading.Lock}
+
+    def __init__(self, board_shape: tuple[int, int], it_id: int, scale: int = 1, it_ids: set[int] | None = None):
+        """`it_ids` lists every seeker when there is more than one."""
+        self.scale = scale
+        self.screen_shape = (math.ceil(board_shape[0] / scale), math.ceil(board_shape[1] / scale))
+        self.it_ids = set(it_ids) if it_ids else {it_id}
+        self.counts = dict()  # Screen cell -> hiders in it. Empty cells are dropped.
+        self.node_cells = dict()  # node_id -> screen cell.
+        self.it_cells = dict()  # Seeker id -> screen cell.
+        self.dirty = set()
+        self.lock = threading.Lock()
+
+    def track_move(self, node_id: int, position: tuple[int, int]):
+        cell = (position[0] // self.scale, position[1] // self.scale)
+        with self.lock:
+            if node_id in self.it_ids:
+                previous = self.it_cells.get(node_id)
+                if previous is not None:
+                    self.dirty.add(previous)
+                self.it_cells[node_id] = cell
+                self.dirty.add(cell)
+                return
+            previous = self.node_cells.get(node_id)
+            if previous == cell:
+                return
+            if previous is not None:
+                remaining = self.counts[previous] - 1
+                if remaining:
+                    self.counts[previous] = remaining
+                else:
+                    del self.counts[previous]
+                self.dirty.add(previous)
+            self.node_cells[node_id] = cell
+            self.counts[cell] = self.counts.get(cell, 0) + 1
+            self.dirty.add(cell)
+
+    def has_changes(self) -> bool:
+        return bool(self.dirty)
+
+    def take_snapshot(self, status: str, full: bool = False) -> FrameSnapshot:
+        """Hand back what changed since the last snapshot and start collecting afresh."""
+        with self.lock:
+            if full:
+                cells = tuple(self.counts.items())
+            else:
+                cells = tuple((cell, self.counts.get(cell, 0)) for cell in self.dirty)
+            self.dirty = set()
+            return FrameSnapshot(cells=cells, it_cells=tuple(set(self.it_cells.values())), status=status, full=full)
+
+
+class FrameBuffer:
+    """A reusable byte buffer. Frames are assembled here and handed to the OS in one write."""
+    def __init__(self, size: int = INITIAL_BUFFER_SIZE):
+        self.data = bytearray(size)
+        self.length = 0
+
+    def write(self, chunk: bytes):
+        end = self.length + len(chunk)
+        if end > len(self.data):
+            self.data.extend(bytes(max(end - len(self.data), len(self.data))))
+        self.data[self.length:end] = chunk
+        self.length = end
+
+    def flush_to(self, fd: int):
+        view = memoryview(self.data)[:self.length]
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        self.length = 0
+
+
+class TuiRenderer:
+    def __init__(self, screen_shape: tuple[int, int], scale: int = 1, stream=None, ansi: bool | None = None):
+        self.screen_shape = screen_shape
+        self.scale = scale
+        self.glyphs = COUNT_GLYPHS if scale == 1 else DENSITY_GLYPHS
+        self.overflow_glyph = COUNT_OVERFLOW_GLYPH if scale == 1 else DENSITY_GLYPHS[-1]
+        self.stream = stream or sys.stdout
+        self.fd = self.stream.fileno()
+        # Cursor addressing only makes sense on a terminal. Pipes and files get whole plain-text frames.
+        self.ansi = self.stream.isatty() if ansi is None else ansi
+        self.buffer = FrameBuffer()
+        self.painted_once = False
+        self.it_cells = frozenset()
+        self.counts = dict()  # What is on screen, so cells can be repainted without asking the model.
+
+    @property
+    def needs_full_snapshot(self) -> bool:
+        return not self.painted_once
+
+    def paint(self, snapshot: FrameSnapshot):
+        if snapshot.full:
+            self.counts = dict(snapshot.cells)
+        else:
+            for cell, count in snapshot.cells:
+                if count:
+                    self.counts[cell] = count
+                else:
+                    self.counts.pop(cell, None)
+        if self.ansi:
+            self._paint_ansi(snapshot)
+        else:
+            self._paint_plain(snapshot)
+        self.it_cells = frozenset(snapshot.it_cells)
+        self.painted_once = True
+        # Anything print()ed before this frame must land first.
+        self.stream.flush()
+        self.buffer.flush_to(self.fd)
+
+    def finish(self):
+        """Park the cursor under the frame so later output doesn't draw over it."""
+        if self.ansi and self.painted_once:
+            self.stream.flush()
+            self.buffer.write(f"\x1b[{self.screen_shape[1] + 3};1H".encode())
+            self.buffer.flush_to(self.fd)
+
+    def glyph(self, cell: tuple[int, int]) -> str:
+        if cell in self.it_cells:
+            return IT_GLYPH
+        count = self.counts.get(cell, 0)
+        return self.glyphs[count] if count < len(self.glyphs) else self.overflow_glyph
+
+    def _paint_ansi(self, snapshot: FrameSnapshot):
+        write = self.buffer.write
+        width, height = self.screen_shape
+        if snapshot.full or not self.painted_once:
+            # Blank board, then fall through to draw the occupied cells on top.
+            write(b"\x1b[2J\x1b[H")
+            write(b"-" * (width * CELL_WIDTH) + b"\n")
+            empty_row = (self.glyphs[0] + " ") * width
+            for _ in range(height):
+                write(empty_row.encode() + b"\n")
+        self.it_cells = frozenset(snapshot.it_cells)
+        changed = {cell for cell, _ in snapshot.cells}
+        changed.update(snapshot.it_cells)
+        for cell in changed:
+            if 0 <= cell[0] < width and 0 <= cell[1] < height:
+                # Rows and columns are 1-based and the header rule takes row 1.
+                write(f"\x1b[{cell[1] + 2};{cell[0] * CELL_WIDTH + 1}H{self.glyph(cell)}".encode())
+        write(f"\x1b[{height + 2};1H\x1b[2K{snapshot.status}".encode())
+
+    def _paint_plain(self, snapshot: FrameSnapshot):
+        self.it_cells = frozenset(snapshot.it_cells)
+        width, height = self.screen_shape
+        rule = "-" * (width * CELL_WIDTH)
+        lines = [rule]
+        for y in range(height):
+            lines.append(" ".join(self.glyph((x, y)) for x in range(width)) + " ")
+        lines.append(rule)
+        lines.append(snapshot.status)
+        self.buffer.write(("\n".join(lines) + "\n").encode())
+
+
+def merge_snapshots(older: FrameSnapshot, newer: FrameSnapshot) -> FrameSnapshot:
+    """Fold two snapshots into one so a skipped frame's changes still reach the screen."""
+    if newer.full:
+        return newer
+    cells = dict(older.cells)
+    cells.update(newer.cells)
+    if older.full:
+        # A full snapshot only lists occupied cells.
+        cells = {cell: count for cell, count in cells.items() if count}
+    return FrameSnapshot(cells=tuple(cells.items()), it_cells=newer.it_cells, status=newer.status, full=older.full)
+
+
+class RenderThread:
+    """Paints snapshots on its own thread so a slow terminal never holds up the game loop.
+    Holds at most one pending frame. If painting falls behind, newer snapshots are merged into it and the
+    intermediate frames are never drawn."""
+    def __init__(self, renderer: TuiRenderer, fps: float):
+        assert fps > 0
+        self.renderer = renderer
+        self.min_frame_time = 1.0 / fps
+        self.pending = None
+        self.condition = threading.Condition()
+        self.running = False
+        self.frames_painted = 0
+        self.frames_dropped = 0
+        self.thread = threading.Thread(target=self._paint_loop, name="Renderer", daemon=True)
+
+    def start(self):
+        self.running = True
+        self.thread.start()
+
+    def submit(self, snapshot: FrameSnapshot):
+        """Queue a frame. Never waits on the terminal."""
+        with self.condition:
+            if self.pending is not None:
+                self.pending = merge_snapshots(self.pending, snapshot)
+                self.frames_dropped += 1
+            else:
+                self.pending = snapshot
+            self.condition.notify()
+
+    def stop(self, timeout: float = RENDER_STOP_TIMEOUT):
+        """Paint whatever is still pending, then park the cursor under the frame. If the frame being painted takes
+        longer than `timeout`, the terminal is wedged: give up on it rather than hang the game node's exit."""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread.is_alive():
+            self.thread.join(timeout)
+            if self.thread.is_alive():
+                logger.warning(f"Renderer still painting after {timeout}s; leaving the final frame undrawn.")
+                return
+        if self.pending is not None:
+            self.renderer.paint(self.pending)
+            self.pending = None
+        self.renderer.finish()
+
+    def _paint_loop(self):
+        while True:
+            with self.condition:
+                while self.pending is None and self.running:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                snapshot, self.pending = self.pending, None
+            started = time.monotonic()
+            self.renderer.paint(snapshot)
+            self.frames_painted += 1
+            # Hold off to the frame rate. Anything submitted meanwhile merges into one pending frame.
+            time.sleep(max(0.0, self.min_frame_time - (time.monotonic() - started)))
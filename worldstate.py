@@ -0,0 +1,102 @@
+"""
+Compact world-state snapshots and the delta stream between them.
+
+The GameNode already follows every move. With a snapshot period set, it also publishes:
+  - WORLD_DELTA every DELTA_PERIOD seconds: the latest cell of each agent that moved and the hiders tagged since the
+    last delta. An agent that moved ten times costs one entry. Deltas carry consecutive sequence numbers.
+  - WORLD_SNAPSHOT every snapshot period: every agent's cell and a bit per agent for frozen, stamped with the last
+    delta folded in.
+
+A MovementMonitor that registers with `register_world_listeners` instead of `register_listeners` bootstraps from the
+next snapshot and then applies the deltas after it. Recovery after a late start or a lost delta is bounded by the
+snapshot period, and the observer never sees the move firehose.
+
+Deltas hold absolute positions, not steps, so applying one twice or on top of a snapshot that already has some of its
+moves is harmless. That lets the GameNode read positions for a snapshot straight from its monitor without pausing the
+LCM thread.
+"""
+
+import numpy as np
+
+from messages import world_delta_t, world_snapshot_t
+
+
+SNAPSHOT_PERIOD = 1.0  # Default seconds between snapshots.
+DELTA_PERIOD = 0.05  # Seconds between deltas. Moves in between are coalesced.
+MAX_HELD_DELTAS = 256  # Deltas an unsynced monitor keeps while it waits for a snapshot.
+
+
+def pack_cells(positions, width: int) -> list[int]:
+    return [y * width + x for x, y in positions]
+
+
+def unpack_cells(cells, width: int) -> list[tuple[int, int]]:
+    return [(cell % width, cell // width) for cell in cells]
+
+
+def pack_flags(flags) -> bytes:
+    """One bit per flag, least significant bit first."""
+    return np.packbits(np.asarray(flags, dtype=bool), bitorder="little").tobytes()
+
+
+def unpack_flags(data: bytes, count: int) -> list[bool]:
+    return np.unpackbits(np.frombuffer(data, dtype=np.uint8), count=count, bitorder="little").astype(bool).tolist()
+
+
+class WorldStatePublisher:
+    """Builds the snapshot and delta messages for a GameNode. Only touched from the game's main loop."""
+    def __init__(self, board_shape: tuple[int, int], snapshot_period: float = SNAPSHOT_PERIOD,
+                 delta_period: float = DELTA_PERIOD):
+        assert snapshot_period > 0 and delta_period > 0
+        self.board_shape = board_shape
+        self.snapshot_period = snapshot_period
+        self.delta_period = delta_period
+        self.seq = 0  # Last delta sent.
+        self.moved = dict()  # node_id -> latest position since the last delta.
+        self.frozen = list()  # Hiders tagged since the last delta.
+        self.last_delta = 0.0
+        self.last_snapshot = None
+
+    def record_moves(self, moves):
+        """Fold in (node_id, old, new) moves drained from the game's journal."""
+        for node_id, _, new in moves:
+            self.moved[node_id] = new
+
+    def record_freeze(self, node_id: int):
+        self.frozen.append(node_id)
+
+    def snapshot_due(self, now: float) -> bool:
+        return self.last_snapshot is None or now - self.last_snapshot >= self.snapshot_period
+
+    def take_delta(self, now: float, force: bool = False) -> world_delta_t | None:
+        """The delta since the last one, if it's time and anything changed. `force` skips the wait."""
+        if not force and now - self.last_delta < self.delta_period:
+            return None
+        if not self.moved and not self.frozen:
+            return None
+        self.last_delta = now
+        self.seq += 1
+        msg = world_delta_t()
+        msg.seq = self.seq
+        msg.count = len(self.moved)
+        msg.ids = list(self.moved)
+        msg.cells = pack_cells(self.moved.values(), self.board_shape[0])
+        msg.frozen_count = len(self.frozen)
+        msg.frozen_ids = self.frozen
+        self.moved = dict()
+        self.frozen = list()
+        return msg
+
+    def take_snapshot(self, now: float, positions: dict[int, tuple[int, int]], frozen_ids) -> world_snapshot_t:
+        """A snapshot of `positions` (node_id -> position). Send any pending delta first, so `seq` covers it."""
+        self.last_snapshot = now
+        ids = sorted(positions)
+        msg = world_snapshot_t()
+        msg.seq = self.seq
+        msg.board = list(self.board_shape)
+        msg.count = len(ids)
+        msg.ids = ids
+        msg.cells = pack_cells((positions[node_id] for node_id in ids), self.board_shape[0])
+        msg.frozen = pack_flags([node_id in frozen_ids for node_id in ids])
+        msg.frozen_size = len(msg.frozen)
+        return msg